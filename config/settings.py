@@ -111,6 +111,26 @@ DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": os.path.join(BASE_DIR, "db.sqlite3"),
+        # Tests run in memory unless TEST_DATABASE_NAME names a file, which
+        # the parallel submission test needs so threads wait for write locks
+        "TEST": {"NAME": config("TEST_DATABASE_NAME", default=None)},
+    }
+}
+
+# Cache
+# The cache must be shared by every process serving the site: compiled
+# grading tables, assessment schemes and quiz answer keys are kept in each
+# process and reloaded when a version token in this cache changes, so a
+# per-process backend such as LocMemCache leaves other workers stale. The
+# default file cache is shared by the processes of one host; use Redis or
+# Memcached when the site is served from several hosts.
+CACHES = {
+    "default": {
+        "BACKEND": config(
+            "CACHE_BACKEND",
+            default="django.core.cache.backends.filebased.FileBasedCache",
+        ),
+        "LOCATION": config("CACHE_LOCATION", default=os.path.join(BASE_DIR, "cache")),
     }
 }
 
@@ -186,6 +206,55 @@ STATICFILES_FINDERS = [
 MEDIA_URL = "/media/"
 MEDIA_ROOT = os.path.join(BASE_DIR, "media")
 
+# Generated result sheets, keyed by a fingerprint of their content
+RESULT_SHEET_CACHE_DIR = os.path.join(MEDIA_ROOT, "result_sheet", "cache")
+RESULT_SHEET_CACHE_MAX_SIZE = config(
+    "RESULT_SHEET_CACHE_MAX_SIZE", default=100 * 1024 * 1024, cast=int
+)  # bytes
+RESULT_SHEET_CACHE_MAX_AGE = config(
+    "RESULT_SHEET_CACHE_MAX_AGE", default=7 * 24 * 60 * 60, cast=int
+)  # seconds
+
+# Background PDF rendering (see the run_pdf_workers command)
+PDF_JOB_WORKERS = config("PDF_JOB_WORKERS", default=2, cast=int)
+PDF_JOB_POLL_INTERVAL = config(
+    "PDF_JOB_POLL_INTERVAL", default=2, cast=float
+)  # seconds
+PDF_JOB_TTL = config("PDF_JOB_TTL", default=24 * 60 * 60, cast=int)  # seconds
+# Workers refresh the heartbeat of the job they are rendering this often; a
+# running job without a heartbeat for PDF_JOB_TIMEOUT is assumed orphaned by a
+# crashed worker and is requeued, or failed after PDF_JOB_MAX_ATTEMPTS claims
+PDF_JOB_HEARTBEAT_INTERVAL = config(
+    "PDF_JOB_HEARTBEAT_INTERVAL", default=60, cast=float
+)  # seconds
+PDF_JOB_TIMEOUT = config("PDF_JOB_TIMEOUT", default=30 * 60, cast=int)  # seconds
+PDF_JOB_MAX_ATTEMPTS = config("PDF_JOB_MAX_ATTEMPTS", default=3, cast=int)
+
+# Per-course class statistics, also invalidated whenever scores change
+COURSE_STATISTICS_CACHE_TIMEOUT = config(
+    "COURSE_STATISTICS_CACHE_TIMEOUT", default=60 * 60, cast=int
+)  # seconds
+
+# Class ranks per program and level, invalidated whenever results change
+RANKINGS_CACHE_TIMEOUT = config(
+    "RANKINGS_CACHE_TIMEOUT", default=24 * 60 * 60, cast=int
+)  # seconds
+DEANS_LIST_SIZE = config("DEANS_LIST_SIZE", default=10, cast=int)
+
+# Compiled quiz question ids and answer keys, invalidated whenever questions
+# or choices change
+QUIZ_ANSWER_KEY_CACHE_TIMEOUT = config(
+    "QUIZ_ANSWER_KEY_CACHE_TIMEOUT", default=24 * 60 * 60, cast=int
+)  # seconds
+
+# Academic standing: probation below this CGPA, warning below this semester
+# GPA or with at least this many failed courses in the semester
+ACADEMIC_PROBATION_CGPA = config("ACADEMIC_PROBATION_CGPA", default=2.0, cast=float)
+ACADEMIC_WARNING_GPA = config("ACADEMIC_WARNING_GPA", default=2.0, cast=float)
+ACADEMIC_WARNING_FAILED_COURSES = config(
+    "ACADEMIC_WARNING_FAILED_COURSES", default=2, cast=int
+)
+
 # -----------------------------------
 # E-mail configuration
 
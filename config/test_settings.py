@@ -0,0 +1,15 @@
+"""
+Settings for running the test suite: ``manage.py test`` selects this module,
+and so does pytest through pytest.ini.
+"""
+
+from .settings import *  # noqa: F401,F403
+
+# Tests get a cache of their own: entries built from test data must never be
+# served to (or cleared from) the site running on the same checkout.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "tests",
+    }
+}
@@ -1,5 +1,6 @@
-from django.contrib import admin
+from django.contrib import admin, messages
 from modeltranslation.admin import TranslationAdmin
+from result.utils import finalize_semester
 from .models import Session, Semester, NewsAndEvents
 
 
@@ -7,6 +8,28 @@ class NewsAndEventsAdmin(TranslationAdmin):
     pass
 
 
-admin.site.register(Semester)
+class SemesterAdmin(admin.ModelAdmin):
+    list_display = ["semester", "session", "is_current_semester"]
+    actions = ["finalize"]
+
+    @admin.action(description="Finalize results of the selected semesters")
+    def finalize(self, request, queryset):
+        for semester in queryset.select_related("session"):
+            if semester.session is None:
+                self.message_user(
+                    request,
+                    f"{semester} semester has no session and was skipped.",
+                    level=messages.WARNING,
+                )
+                continue
+            finalization = finalize_semester(semester, user=request.user)
+            self.message_user(
+                request,
+                f"Finalized {finalization}: {finalization.students} student(s), "
+                f"{finalization.courses} course(s).",
+            )
+
+
+admin.site.register(Semester, SemesterAdmin)
 admin.site.register(Session)
 admin.site.register(NewsAndEvents, NewsAndEventsAdmin)
@@ -1,11 +1,33 @@
 from django.contrib import admin
 from django.contrib.auth.models import Group
 
+from core.models import Semester, Session
+from result.models import PDFJob
 from .models import Program, Course, CourseAllocation, Upload
 from modeltranslation.admin import TranslationAdmin
 
 class ProgramAdmin(TranslationAdmin):
-    pass
+    actions = ["generate_pdf_bundle"]
+
+    @admin.action(description="Generate result sheets and registration forms (zip)")
+    def generate_pdf_bundle(self, request, queryset):
+        semester = Semester.objects.get(is_current_semester=True)
+        session = Session.objects.get(is_current_session=True)
+        for program in queryset:
+            job = PDFJob.objects.create(
+                kind=PDFJob.PROGRAM_BUNDLE,
+                owner=request.user,
+                params={
+                    "program": program.pk,
+                    "semester": semester.pk,
+                    "session": session.pk,
+                },
+            )
+            self.message_user(
+                request,
+                f"Queued PDF bundle for {program} (job #{job.pk}); "
+                f"follow its progress at {job.get_absolute_url()}",
+            )
 class CourseAdmin(TranslationAdmin):
     pass
 class UploadAdmin(TranslationAdmin):
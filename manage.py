@@ -5,6 +5,9 @@ import sys
 
 
 def main():
+    # The test suite runs with a cache of its own, see config/test_settings.py.
+    if sys.argv[1:2] == ["test"]:
+        os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.test_settings")
     os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
     try:
         from django.core.management import execute_from_command_line
@@ -12,7 +12,9 @@ from .models import (
     MCQuestion,
     Choice,
     EssayQuestion,
+    QuestionPool,
     Sitting,
+    SittingAnswer,
 )
 
 
@@ -20,6 +22,17 @@ class ChoiceInline(admin.TabularInline):
     model = Choice
 
 
+class QuestionPoolInline(admin.TabularInline):
+    model = QuestionPool
+    extra = 0
+
+
+class SittingAnswerInline(admin.TabularInline):
+    model = SittingAnswer
+    extra = 0
+    raw_id_fields = ("question",)
+
+
 class QuizAdminForm(TranslationModelForm):
     questions = forms.ModelMultipleChoiceField(
         queryset=Question.objects.all().select_subclasses(),
@@ -48,7 +61,7 @@ class QuizAdminForm(TranslationModelForm):
 
 
 class QuizAdmin(TranslationAdmin):
-    pass
+    inlines = [QuestionPoolInline]
     # form = QuizAdminForm
     # fields = (
     #     "title",
@@ -66,8 +79,10 @@ class MCQuestionAdmin(TranslationAdmin):
     list_display = ("content",)
     # list_filter = ('category',)
     fieldsets = [
-        ("figure" "quiz" "choice_order", {"fields": ("content", "explanation")})
+        ("figure" "quiz" "choice_order", {"fields": ("content", "explanation")}),
+        (_("Tags"), {"fields": ("topic", "difficulty")}),
     ]
+    list_filter = ("topic", "difficulty")
 
     search_fields = ("content", "explanation")
     filter_horizontal = ("quiz",)
@@ -89,13 +104,22 @@ class EssayQuestionAdmin(admin.ModelAdmin):
         "content",
         "quiz",
         "explanation",
+        "topic",
+        "difficulty",
     )
     search_fields = ("content", "explanation")
     filter_horizontal = ("quiz",)
 
 
+class SittingAdmin(admin.ModelAdmin):
+    list_display = ("user", "quiz", "course", "cursor", "current_score", "complete")
+    list_filter = ("complete",)
+    search_fields = ("user__username", "quiz__title")
+    inlines = [SittingAnswerInline]
+
+
 admin.site.register(Quiz, QuizAdmin)
 admin.site.register(MCQuestion, MCQuestionAdmin)
 admin.site.register(Progress, ProgressAdmin)
 admin.site.register(EssayQuestion, EssayQuestionAdmin)
-admin.site.register(Sitting)
+admin.site.register(Sitting, SittingAdmin)
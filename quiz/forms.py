@@ -3,7 +3,7 @@ from django.forms.widgets import RadioSelect, Textarea
 from django.contrib.admin.widgets import FilteredSelectMultiple
 from django.utils.translation import gettext_lazy as _
 from django.forms.models import inlineformset_factory
-from .models import Question, Quiz, MCQuestion, Choice
+from .models import Question, Quiz, MCQuestion, Choice, EssayQuestion
 
 
 class QuestionForm(forms.Form):
@@ -23,6 +23,37 @@ class EssayForm(forms.Form):
         )
 
 
+class QuizSubmitForm(forms.Form):
+    """All the questions of a sitting as one form, for submit-all quizzes."""
+
+    def __init__(self, questions, *args, **kwargs):
+        super(QuizSubmitForm, self).__init__(*args, **kwargs)
+        self.questions = questions
+        for question in questions:
+            if isinstance(question, EssayQuestion):
+                field = forms.CharField(
+                    required=False,
+                    widget=Textarea(attrs={"style": "width:100%"}),
+                )
+            else:
+                field = forms.ChoiceField(
+                    choices=question.get_choices_list(),
+                    required=False,
+                    widget=RadioSelect,
+                )
+            self.fields[f"question_{question.id}"] = field
+
+    def question_fields(self):
+        for question in self.questions:
+            yield question, self[f"question_{question.id}"]
+
+    def answers(self):
+        return {
+            question.id: self.cleaned_data.get(f"question_{question.id}")
+            for question in self.questions
+        }
+
+
 class QuizAddForm(forms.ModelForm):
     class Meta:
         model = Quiz
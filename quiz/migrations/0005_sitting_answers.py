@@ -0,0 +1,174 @@
+# Generated by Django 4.0.8 on 2026-10-16 20:51
+
+import json
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def _ids(value):
+    return [int(q) for q in (value or "").split(",") if q.strip()]
+
+
+def convert_sittings(apps, schema_editor):
+    """
+    Move the comma-separated question lists and the JSON answer blob of
+    existing sittings into the id array, the cursor and one answer row per
+    answered (or incorrect) question.
+    """
+    Question = apps.get_model("quiz", "Question")
+    Sitting = apps.get_model("quiz", "Sitting")
+    SittingAnswer = apps.get_model("quiz", "SittingAnswer")
+
+    existing = set(Question.objects.values_list("id", flat=True))
+    rows = []
+    for sitting in Sitting.objects.iterator():
+        order = _ids(sitting.question_order)
+        remaining = _ids(sitting.question_list)
+        incorrect = set(_ids(sitting.incorrect_questions))
+        try:
+            user_answers = json.loads(sitting.user_answers or "{}")
+        except ValueError:
+            user_answers = {}
+
+        answers = {
+            int(question_id): answer
+            for question_id, answer in user_answers.items()
+            if str(question_id).isdigit()
+        }
+        for question_id in incorrect - answers.keys():
+            answers[question_id] = ""
+
+        sitting.question_ids = order
+        sitting.cursor = max(len(order) - len(remaining), 0)
+        sitting.save(update_fields=["question_ids", "cursor"])
+        rows.extend(
+            SittingAnswer(
+                sitting_id=sitting.pk,
+                question_id=question_id,
+                answer="" if answer is None else str(answer),
+                correct=question_id not in incorrect,
+            )
+            for question_id, answer in answers.items()
+            if question_id in existing
+        )
+    SittingAnswer.objects.bulk_create(rows, batch_size=1000)
+
+
+def restore_sittings(apps, schema_editor):
+    Sitting = apps.get_model("quiz", "Sitting")
+    SittingAnswer = apps.get_model("quiz", "SittingAnswer")
+
+    for sitting in Sitting.objects.iterator():
+        order = sitting.question_ids or []
+        answers = SittingAnswer.objects.filter(sitting_id=sitting.pk)
+        sitting.question_order = "".join(f"{q}," for q in order)
+        sitting.question_list = "".join(f"{q}," for q in order[sitting.cursor :])
+        sitting.incorrect_questions = "".join(
+            f"{a.question_id}," for a in answers if not a.correct
+        )
+        sitting.user_answers = json.dumps(
+            {str(a.question_id): a.answer for a in answers}
+        )
+        sitting.save()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("quiz", "0004_alter_essayquestion_options_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="sitting",
+            name="question_ids",
+            field=models.JSONField(default=list),
+        ),
+        migrations.AddField(
+            model_name="sitting",
+            name="cursor",
+            field=models.PositiveIntegerField(
+                default=0,
+                help_text="Position of the next question to answer.",
+                verbose_name="Cursor",
+            ),
+        ),
+        migrations.CreateModel(
+            name="SittingAnswer",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("answer", models.TextField(blank=True, verbose_name="Answer")),
+                (
+                    "correct",
+                    models.BooleanField(default=False, verbose_name="Correct"),
+                ),
+                (
+                    "question",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="quiz.question",
+                        verbose_name="Question",
+                    ),
+                ),
+                (
+                    "sitting",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="answers",
+                        to="quiz.sitting",
+                        verbose_name="Sitting",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Sitting answer",
+                "verbose_name_plural": "Sitting answers",
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="sittinganswer",
+            constraint=models.UniqueConstraint(
+                fields=("sitting", "question"), name="unique_sitting_answer"
+            ),
+        ),
+        migrations.RunPython(convert_sittings, restore_sittings),
+        migrations.RemoveField(
+            model_name="sitting",
+            name="incorrect_questions",
+        ),
+        migrations.RemoveField(
+            model_name="sitting",
+            name="question_list",
+        ),
+        migrations.RemoveField(
+            model_name="sitting",
+            name="user_answers",
+        ),
+        migrations.RemoveField(
+            model_name="sitting",
+            name="question_order",
+        ),
+        migrations.RenameField(
+            model_name="sitting",
+            old_name="question_ids",
+            new_name="question_order",
+        ),
+        migrations.AlterField(
+            model_name="sitting",
+            name="question_order",
+            field=models.JSONField(
+                default=list,
+                help_text="Ids of the questions in the order they are asked.",
+                verbose_name="Question Order",
+            ),
+        ),
+    ]
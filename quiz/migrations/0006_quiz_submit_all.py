@@ -0,0 +1,22 @@
+# Generated by Django 4.0.8 on 2026-10-16 20:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("quiz", "0005_sitting_answers"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="quiz",
+            name="submit_all",
+            field=models.BooleanField(
+                default=False,
+                help_text="If yes, all questions are shown on one page and answered in a single submission.",
+                verbose_name="Submit all at once",
+            ),
+        ),
+    ]
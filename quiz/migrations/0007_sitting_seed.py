@@ -0,0 +1,39 @@
+# Generated by Django 4.0.8 on 2026-10-16 21:01
+
+import random
+
+from django.db import migrations, models
+import quiz.models
+
+
+def seed_sittings(apps, schema_editor):
+    """
+    AddField evaluates the default once, which left every existing sitting
+    with the same seed; give each one a seed of its own.
+    """
+    Sitting = apps.get_model("quiz", "Sitting")
+    sittings = []
+    for sitting in Sitting.objects.only("pk").iterator():
+        sitting.seed = random.randrange(1 << 31)
+        sittings.append(sitting)
+    Sitting.objects.bulk_update(sittings, ["seed"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("quiz", "0006_quiz_submit_all"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="sitting",
+            name="seed",
+            field=models.PositiveIntegerField(
+                default=quiz.models.new_seed,
+                help_text="Seeds the random order of the questions and choices.",
+                verbose_name="Seed",
+            ),
+        ),
+        migrations.RunPython(seed_sittings, migrations.RunPython.noop),
+    ]
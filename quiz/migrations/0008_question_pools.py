@@ -0,0 +1,93 @@
+# Generated by Django 4.0.8 on 2026-10-16 21:04
+
+import django.core.validators
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("quiz", "0007_sitting_seed"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="question",
+            name="difficulty",
+            field=models.CharField(
+                blank=True,
+                choices=[("easy", "Easy"), ("medium", "Medium"), ("hard", "Hard")],
+                help_text="Used by question pools to draw questions of a difficulty.",
+                max_length=10,
+                verbose_name="Difficulty",
+            ),
+        ),
+        migrations.AddField(
+            model_name="question",
+            name="topic",
+            field=models.CharField(
+                blank=True,
+                help_text="Used by question pools to draw questions of a topic.",
+                max_length=100,
+                verbose_name="Topic",
+            ),
+        ),
+        migrations.CreateModel(
+            name="QuestionPool",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "size",
+                    models.PositiveIntegerField(
+                        validators=[django.core.validators.MinValueValidator(1)],
+                        verbose_name="Questions per sitting",
+                    ),
+                ),
+                (
+                    "topic",
+                    models.CharField(
+                        blank=True,
+                        help_text="Leave empty to draw from every topic.",
+                        max_length=100,
+                        verbose_name="Topic",
+                    ),
+                ),
+                (
+                    "difficulty",
+                    models.CharField(
+                        blank=True,
+                        choices=[
+                            ("easy", "Easy"),
+                            ("medium", "Medium"),
+                            ("hard", "Hard"),
+                        ],
+                        help_text="Leave empty to draw from every difficulty.",
+                        max_length=10,
+                        verbose_name="Difficulty",
+                    ),
+                ),
+                (
+                    "quiz",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="pools",
+                        to="quiz.quiz",
+                        verbose_name="Quiz",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Question pool",
+                "verbose_name_plural": "Question pools",
+            },
+        ),
+    ]
@@ -1,15 +1,25 @@
-import json
+import hashlib
+import random
 import re
+import uuid
 
 from django.conf import settings
+from django.core.cache import cache
 from django.core.exceptions import ImproperlyConfigured, ValidationError
 from django.core.validators import (
     MaxValueValidator,
+    MinValueValidator,
     validate_comma_separated_integer_list,
 )
-from django.db import models
+from django.db import connections, models, transaction
 from django.db.models import Q
-from django.db.models.signals import pre_save
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
 from django.urls import reverse
 from django.utils.timezone import now
 from django.utils.translation import gettext_lazy as _
@@ -25,6 +35,12 @@ CHOICE_ORDER_OPTIONS = (
     ("none", _("None")),
 )
 
+DIFFICULTY_OPTIONS = (
+    ("easy", _("Easy")),
+    ("medium", _("Medium")),
+    ("hard", _("Hard")),
+)
+
 CATEGORY_OPTIONS = (
     ("assignment", _("Assignment")),
     ("exam", _("Exam")),
@@ -32,7 +48,86 @@ CATEGORY_OPTIONS = (
 )
 
 
+_compiled_quizzes = {}
+
+
+def new_seed():
+    return random.randrange(1 << 31)
+
+
 class QuizManager(models.Manager):
+    def compiled_version_key(self, quiz_id):
+        # Keyed by database as well, so a cache shared by sites (or test
+        # runs) on different databases never hands one the other's quiz.
+        database = connections[self.db].settings_dict["NAME"]
+        digest = hashlib.md5(str(database).encode()).hexdigest()[:12]
+        return f"quiz:compiled_version:{digest}:{quiz_id}"
+
+    def compiled(self, quiz_id):
+        """
+        What taking a quiz needs to know about its questions: their ids in
+        id order, the size and question ids of each of its pools, and the
+        answer key giving, for each multiple-choice
+        question id, its choices in id order and the ids of the correct
+        ones. Kept in this process and in the shared cache (see CACHES) until
+        the quiz's questions or choices change; without a version token in
+        the cache it is rebuilt from the database.
+        """
+        version_key = self.compiled_version_key(quiz_id)
+        version = cache.get(version_key)
+        if version is None:
+            cache.add(version_key, uuid.uuid4().hex, None)
+            version = cache.get(version_key)
+        cached = _compiled_quizzes.get(quiz_id)
+        if version is not None and cached is not None and cached[0] == version:
+            return cached[1]
+
+        key = f"quiz:compiled:{version_key}:{version}"
+        compiled = None if version is None else cache.get(key)
+        if compiled is None:
+            answer_key = {
+                question_id: {"choices": [], "correct": set()}
+                for question_id in MCQuestion.objects.filter(quiz=quiz_id).values_list(
+                    "pk", flat=True
+                )
+            }
+            for choice in Choice.objects.filter(question__quiz=quiz_id).order_by("pk"):
+                entry = answer_key[choice.question_id]
+                entry["choices"].append(choice)
+                if choice.correct:
+                    entry["correct"].add(choice.pk)
+            questions = list(
+                Question.objects.filter(quiz=quiz_id)
+                .order_by("pk")
+                .values_list("pk", "topic", "difficulty")
+            )
+            compiled = {
+                "question_ids": [pk for pk, _topic, _difficulty in questions],
+                "pools": [
+                    (pool.size, [pk for pk, *tags in questions if pool.matches(*tags)])
+                    for pool in QuestionPool.objects.filter(quiz=quiz_id).order_by("pk")
+                ],
+                "answer_key": answer_key,
+            }
+            cache.set(key, compiled, settings.QUIZ_ANSWER_KEY_CACHE_TIMEOUT)
+        _compiled_quizzes[quiz_id] = (version, compiled)
+        return compiled
+
+    def question_ids(self, quiz_id):
+        return self.compiled(quiz_id)["question_ids"]
+
+    def answer_key(self, quiz_id):
+        return self.compiled(quiz_id)["answer_key"]
+
+    def invalidate_compiled(self, quiz_ids):
+        quiz_ids = set(quiz_ids)
+        for quiz_id in quiz_ids:
+            _compiled_quizzes.pop(quiz_id, None)
+        cache.set_many(
+            {self.compiled_version_key(pk): uuid.uuid4().hex for pk in quiz_ids},
+            None,
+        )
+
     def search(self, query=None):
         queryset = self.get_queryset()
         if query:
@@ -68,6 +163,13 @@ class Quiz(models.Model):
             "Correct answer is NOT shown after question. Answers displayed at the end."
         ),
     )
+    submit_all = models.BooleanField(
+        default=False,
+        verbose_name=_("Submit all at once"),
+        help_text=_(
+            "If yes, all questions are shown on one page and answered in a single submission."
+        ),
+    )
     exam_paper = models.BooleanField(
         default=False,
         verbose_name=_("Exam Paper"),
@@ -118,7 +220,12 @@ class Quiz(models.Model):
 
     @property
     def get_max_score(self):
-        return self.get_questions().count()
+        """The number of questions in a sitting of this quiz."""
+        compiled = Quiz.objects.compiled(self.pk)
+        if not compiled["pools"]:
+            return len(compiled["question_ids"])
+        drawn = sum(min(size, len(ids)) for size, ids in compiled["pools"])
+        return min(drawn, len(compiled["question_ids"]))
 
     def get_absolute_url(self):
         return reverse("quiz_index", kwargs={"slug": self.course.slug})
@@ -130,6 +237,66 @@ def quiz_pre_save_receiver(sender, instance, **kwargs):
         instance.slug = unique_slug_generator(instance)
 
 
+class QuestionPool(models.Model):
+    """
+    A number of questions drawn at random for each sitting from the quiz's
+    questions, optionally only those of a topic and/or difficulty. A quiz
+    with pools gives each sitting the questions drawn from all its pools
+    instead of its whole question set.
+    """
+
+    quiz = models.ForeignKey(
+        Quiz,
+        related_name="pools",
+        verbose_name=_("Quiz"),
+        on_delete=models.CASCADE,
+    )
+    size = models.PositiveIntegerField(
+        validators=[MinValueValidator(1)],
+        verbose_name=_("Questions per sitting"),
+    )
+    topic = models.CharField(
+        max_length=100,
+        blank=True,
+        verbose_name=_("Topic"),
+        help_text=_("Leave empty to draw from every topic."),
+    )
+    difficulty = models.CharField(
+        max_length=10,
+        choices=DIFFICULTY_OPTIONS,
+        blank=True,
+        verbose_name=_("Difficulty"),
+        help_text=_("Leave empty to draw from every difficulty."),
+    )
+
+    class Meta:
+        verbose_name = _("Question pool")
+        verbose_name_plural = _("Question pools")
+
+    def __str__(self):
+        return f"{self.quiz}: {self.size}"
+
+    def matches(self, topic, difficulty):
+        return (not self.topic or self.topic == topic) and (
+            not self.difficulty or self.difficulty == difficulty
+        )
+
+    def clean(self):
+        # A pool nothing can be drawn from would leave sittings without
+        # questions. Questions can only be added to a quiz once it exists.
+        if self.quiz_id is None:
+            return
+        questions = Question.objects.filter(quiz=self.quiz_id)
+        if self.topic:
+            questions = questions.filter(topic=self.topic)
+        if self.difficulty:
+            questions = questions.filter(difficulty=self.difficulty)
+        if not questions.exists():
+            raise ValidationError(
+                _("No question of this quiz matches the pool's topic and difficulty.")
+            )
+
+
 class ProgressManager(models.Manager):
     def new_progress(self, user):
         new_progress = self.create(user=user, score="")
@@ -169,12 +336,12 @@ class Progress(models.Model):
                 [str(question.quiz), str(updated_score), str(updated_possible), ""]
             )
             self.score = self.score.replace(match.group(), new_score)
-            self.save()
+            self.save(update_fields=["score"])
         else:
             self.score += ",".join(
                 [str(question.quiz), str(score_to_add), str(possible_to_add), ""]
             )
-            self.save()
+            self.save(update_fields=["score"])
 
     def show_exams(self):
         if self.user.is_superuser:
@@ -186,13 +353,27 @@ class Progress(models.Model):
 
 
 class SittingManager(models.Manager):
-    def new_sitting(self, user, quiz, course):
-        if quiz.random_order:
-            question_set = quiz.question_set.all().select_subclasses().order_by("?")
-        else:
-            question_set = quiz.question_set.all().select_subclasses()
+    @staticmethod
+    def draw_questions(compiled, rng):
+        """
+        The question ids of a new sitting: the quiz's whole question set or,
+        when it has pools, a sample of each pool's size from its questions
+        without repeats across pools. The cost depends on the pool sizes,
+        not on the number of questions in the bank.
+        """
+        if not compiled["pools"]:
+            return list(compiled["question_ids"])
+        drawn = set()
+        for size, ids in compiled["pools"]:
+            # Draw extra questions to make up for those an earlier pool took.
+            sample = rng.sample(ids, min(size + len(drawn), len(ids)))
+            drawn.update([pk for pk in sample if pk not in drawn][:size])
+        return sorted(drawn)
 
-        question_ids = [item.id for item in question_set]
+    def new_sitting(self, user, quiz, course):
+        seed = new_seed()
+        rng = random.Random(seed)
+        question_ids = self.draw_questions(Quiz.objects.compiled(quiz.pk), rng)
         if not question_ids:
             raise ImproperlyConfigured(
                 _(
@@ -200,18 +381,18 @@ class SittingManager(models.Manager):
                 )
             )
 
-        questions = ",".join(map(str, question_ids)) + ","
+        if quiz.random_order:
+            question_ids = rng.sample(question_ids, len(question_ids))
 
         new_sitting = self.create(
             user=user,
             quiz=quiz,
             course=course,
-            question_order=questions,
-            question_list=questions,
-            incorrect_questions="",
+            question_order=question_ids,
+            seed=seed,
+            cursor=0,
             current_score=0,
             complete=False,
-            user_answers="{}",
         )
         return new_sitting
 
@@ -240,27 +421,23 @@ class Sitting(models.Model):
     course = models.ForeignKey(
         Course, verbose_name=_("Course"), on_delete=models.CASCADE
     )
-    question_order = models.CharField(
-        max_length=1024,
+    question_order = models.JSONField(
+        default=list,
         verbose_name=_("Question Order"),
-        validators=[validate_comma_separated_integer_list],
+        help_text=_("Ids of the questions in the order they are asked."),
     )
-    question_list = models.CharField(
-        max_length=1024,
-        verbose_name=_("Question List"),
-        validators=[validate_comma_separated_integer_list],
+    cursor = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_("Cursor"),
+        help_text=_("Position of the next question to answer."),
     )
-    incorrect_questions = models.CharField(
-        max_length=1024,
-        blank=True,
-        verbose_name=_("Incorrect questions"),
-        validators=[validate_comma_separated_integer_list],
+    seed = models.PositiveIntegerField(
+        default=new_seed,
+        verbose_name=_("Seed"),
+        help_text=_("Seeds the random order of the questions and choices."),
     )
     current_score = models.IntegerField(verbose_name=_("Current Score"))
     complete = models.BooleanField(default=False, verbose_name=_("Complete"))
-    user_answers = models.TextField(
-        blank=True, default="{}", verbose_name=_("User Answers")
-    )
     start = models.DateTimeField(auto_now_add=True, verbose_name=_("Start"))
     end = models.DateTimeField(null=True, blank=True, verbose_name=_("End"))
 
@@ -269,62 +446,166 @@ class Sitting(models.Model):
     class Meta:
         permissions = (("view_sittings", _("Can see completed exams.")),)
 
+    def refresh_from_db(self, *args, **kwargs):
+        super().refresh_from_db(*args, **kwargs)
+        self._answers = None
+
     def get_first_question(self):
-        if not self.question_list:
+        if self.cursor >= len(self.question_order):
             return False
-        first_question_id = int(self.question_list.split(",", 1)[0])
-        return Question.objects.get_subclass(id=first_question_id)
-
-    def remove_first_question(self):
-        if not self.question_list:
-            return
-        _, remaining_questions = self.question_list.split(",", 1)
-        self.question_list = remaining_questions
-        self.save()
+        question = Question.objects.get_subclass(id=self.question_order[self.cursor])
+        self._prepare_question(question, Quiz.objects.answer_key(self.quiz_id))
+        return question
+
+    def _prepare_question(self, question, answer_key):
+        # Grade and render from the cached answer key, with the choices in
+        # the same order on every page of this sitting.
+        question.answer_key = answer_key.get(question.id)
+        question.choice_seed = self.seed
+
+    def answer_question(self, question, guess, is_correct):
+        """
+        Store the answer to the current question and move the cursor past
+        it. The sitting is advanced with one UPDATE conditioned on the
+        cursor still pointing at ``question``, and the answer row is
+        inserted in the same transaction, so of two parallel submissions
+        for the same question only the first is recorded. Returns whether
+        this answer was recorded; raises Sitting.DoesNotExist when the
+        sitting has meanwhile been completed and discarded.
+        """
+        cursor = self.cursor
+        if cursor >= len(self.question_order) or (
+            self.question_order[cursor] != question.id
+        ):
+            return False
+        with transaction.atomic():
+            advanced = Sitting.objects.filter(
+                pk=self.pk, cursor=cursor, complete=False
+            ).update(
+                cursor=models.F("cursor") + 1,
+                current_score=models.F("current_score") + int(is_correct),
+            )
+            if advanced:
+                SittingAnswer.objects.create(
+                    sitting=self,
+                    question=question,
+                    answer=str(guess),
+                    correct=is_correct,
+                )
+        self._answers = None
+        if not advanced:
+            self.refresh_from_db(fields=["cursor", "current_score", "complete"])
+            return False
+        self.cursor = cursor + 1
+        self.current_score += int(is_correct)
+        return True
+
+    def submit_answers(self, answers):
+        """
+        Grade ``{question id: guess}`` for every unanswered question against
+        the quiz's answer key and complete the sitting: one bulk insert and
+        one UPDATE in a single transaction, with the sitting row locked so a
+        repeated submission finds it complete and records nothing. Questions
+        missing from ``answers`` are recorded blank and incorrect; essay
+        questions are left incorrect for manual marking. Returns the answer
+        rows recorded.
+        """
+        answer_key = Quiz.objects.answer_key(self.quiz_id)
+        with transaction.atomic():
+            locked = (
+                Sitting.objects.select_for_update()
+                .only("cursor", "current_score", "complete")
+                .get(pk=self.pk)
+            )
+            rows = []
+            if not locked.complete:
+                for question_id in self.question_order[locked.cursor :]:
+                    guess = answers.get(question_id)
+                    guess = "" if guess is None else str(guess)
+                    entry = answer_key.get(question_id)
+                    rows.append(
+                        SittingAnswer(
+                            sitting=self,
+                            question_id=question_id,
+                            answer=guess,
+                            correct=entry is not None
+                            and guess in {str(pk) for pk in entry["correct"]},
+                        )
+                    )
+                SittingAnswer.objects.bulk_create(rows)
+                self.cursor = len(self.question_order)
+                self.current_score = locked.current_score + sum(
+                    row.correct for row in rows
+                )
+                self.complete = True
+                self.end = now()
+                self.save(update_fields=["cursor", "current_score", "complete", "end"])
+            else:
+                self.refresh_from_db(fields=["cursor", "current_score", "complete"])
+        self._answers = None
+        return rows
 
     def add_to_score(self, points):
-        self.current_score += int(points)
-        self.save()
+        Sitting.objects.filter(pk=self.pk).update(
+            current_score=models.F("current_score") + int(points)
+        )
+        self.refresh_from_db(fields=["current_score"])
 
     @property
     def get_current_score(self):
         return self.current_score
 
-    def _question_ids(self):
-        return [int(q) for q in self.question_order.split(",") if q]
-
     @property
     def get_percent_correct(self):
-        total_questions = len(self._question_ids())
+        total_questions = len(self.question_order)
         if total_questions == 0:
             return 0
         percent = (self.current_score / total_questions) * 100
         return min(max(int(round(percent)), 0), 100)
 
     def mark_quiz_complete(self):
-        self.complete = True
         self.end = now()
-        self.save()
+        Sitting.objects.filter(pk=self.pk, complete=False).update(
+            complete=True, end=self.end
+        )
+        self.complete = True
+
+    def _answer_rows(self):
+        # Templates look answers up once per question; load them once.
+        if getattr(self, "_answers", None) is None:
+            self._answers = {
+                answer.question_id: answer for answer in self.answers.all()
+            }
+        return self._answers
 
     def add_incorrect_question(self, question):
-        incorrect_ids = self.get_incorrect_questions
-        incorrect_ids.append(question.id)
-        self.incorrect_questions = ",".join(map(str, incorrect_ids)) + ","
-        if self.complete:
-            self.add_to_score(-1)
-        self.save()
+        with transaction.atomic():
+            changed = SittingAnswer.objects.filter(
+                sitting=self, question=question, correct=True
+            ).update(correct=False)
+            if not changed:
+                changed = SittingAnswer.objects.get_or_create(
+                    sitting=self, question=question, defaults={"correct": False}
+                )[1]
+            if changed and self.complete:
+                self.add_to_score(-1)
+        self._answers = None
 
     @property
     def get_incorrect_questions(self):
-        return [int(q) for q in self.incorrect_questions.split(",") if q]
+        return [
+            question_id
+            for question_id, answer in self._answer_rows().items()
+            if not answer.correct
+        ]
 
     def remove_incorrect_question(self, question):
-        incorrect_ids = self.get_incorrect_questions
-        if question.id in incorrect_ids:
-            incorrect_ids.remove(question.id)
-            self.incorrect_questions = ",".join(map(str, incorrect_ids)) + ","
-            self.add_to_score(1)
-            self.save()
+        with transaction.atomic():
+            if SittingAnswer.objects.filter(
+                sitting=self, question=question, correct=False
+            ).update(correct=True):
+                self.add_to_score(1)
+        self._answers = None
 
     @property
     def check_if_passed(self):
@@ -337,22 +618,27 @@ class Sitting(models.Model):
         else:
             return _("You failed this quiz, try again.")
 
-    def add_user_answer(self, question, guess):
-        user_answers = json.loads(self.user_answers)
-        user_answers[str(question.id)] = guess
-        self.user_answers = json.dumps(user_answers)
-        self.save()
+    @property
+    def user_answers(self):
+        return {
+            str(question_id): answer.answer
+            for question_id, answer in self._answer_rows().items()
+        }
 
     def get_questions(self, with_answers=False):
-        question_ids = self._question_ids()
+        question_ids = self.question_order
         questions = sorted(
             self.quiz.question_set.filter(id__in=question_ids).select_subclasses(),
             key=lambda q: question_ids.index(q.id),
         )
+        answer_key = Quiz.objects.answer_key(self.quiz_id)
+        for question in questions:
+            self._prepare_question(question, answer_key)
         if with_answers:
-            user_answers = json.loads(self.user_answers)
+            answers = self._answer_rows()
             for question in questions:
-                question.user_answer = user_answers.get(str(question.id))
+                answer = answers.get(question.id)
+                question.user_answer = answer.answer if answer else None
         return questions
 
     @property
@@ -361,12 +647,36 @@ class Sitting(models.Model):
 
     @property
     def get_max_score(self):
-        return len(self._question_ids())
+        return len(self.question_order)
 
     def progress(self):
-        answered = len(json.loads(self.user_answers))
-        total = self.get_max_score
-        return answered, total
+        return self.cursor, self.get_max_score
+
+
+class SittingAnswer(models.Model):
+    sitting = models.ForeignKey(
+        Sitting,
+        related_name="answers",
+        verbose_name=_("Sitting"),
+        on_delete=models.CASCADE,
+    )
+    question = models.ForeignKey(
+        "Question", verbose_name=_("Question"), on_delete=models.CASCADE
+    )
+    answer = models.TextField(blank=True, verbose_name=_("Answer"))
+    correct = models.BooleanField(default=False, verbose_name=_("Correct"))
+
+    class Meta:
+        verbose_name = _("Sitting answer")
+        verbose_name_plural = _("Sitting answers")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["sitting", "question"], name="unique_sitting_answer"
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.sitting_id}: {self.question_id}"
 
 
 class Question(models.Model):
@@ -388,6 +698,19 @@ class Question(models.Model):
         help_text=_("Explanation to be shown after the question has been answered."),
         verbose_name=_("Explanation"),
     )
+    topic = models.CharField(
+        max_length=100,
+        blank=True,
+        verbose_name=_("Topic"),
+        help_text=_("Used by question pools to draw questions of a topic."),
+    )
+    difficulty = models.CharField(
+        max_length=10,
+        choices=DIFFICULTY_OPTIONS,
+        blank=True,
+        verbose_name=_("Difficulty"),
+        help_text=_("Used by question pools to draw questions of a difficulty."),
+    )
 
     objects = InheritanceManager()
 
@@ -414,28 +737,49 @@ class MCQuestion(Question):
         verbose_name = _("Multiple Choice Question")
         verbose_name_plural = _("Multiple Choice Questions")
 
+    # Set by the sitting showing the question: its entry in the quiz's
+    # answer key, read instead of querying the choices, and the seed of the
+    # sitting's random choice order.
+    answer_key = None
+    choice_seed = None
+
     def check_if_correct(self, guess):
+        if self.answer_key is not None:
+            try:
+                return int(guess) in self.answer_key["correct"]
+            except (TypeError, ValueError):
+                return False
         try:
             answer = Choice.objects.get(id=int(guess))
             return answer.correct
         except (Choice.DoesNotExist, ValueError):
             return False
 
-    def order_choices(self, queryset):
+    def order_choices(self, choices):
+        choices = list(choices)
         if self.choice_order == "content":
-            return queryset.order_by("choice_text")
+            choices.sort(key=lambda choice: choice.choice_text)
         elif self.choice_order == "random":
-            return queryset.order_by("?")
-        else:
-            return queryset
+            if self.choice_seed is None:
+                random.shuffle(choices)
+            else:
+                random.Random(f"{self.choice_seed}:{self.id}").shuffle(choices)
+        return choices
 
     def get_choices(self):
-        return self.order_choices(Choice.objects.filter(question=self))
+        if self.answer_key is not None:
+            return self.order_choices(self.answer_key["choices"])
+        return self.order_choices(Choice.objects.filter(question=self).order_by("pk"))
 
     def get_choices_list(self):
         return [(choice.id, choice.choice_text) for choice in self.get_choices()]
 
     def answer_choice_to_string(self, guess):
+        if self.answer_key is not None:
+            for choice in self.answer_key["choices"]:
+                if str(choice.id) == str(guess):
+                    return choice.choice_text
+            return ""
         try:
             return Choice.objects.get(id=int(guess)).choice_text
         except (Choice.DoesNotExist, ValueError):
@@ -481,3 +825,54 @@ class EssayQuestion(Question):
 
     def answer_choice_to_string(self, guess):
         return str(guess)
+
+
+def invalidate_compiled_quizzes(quiz_ids):
+    # Once now for this process and again after commit, so other processes
+    # cannot reload and keep the compiled quiz from before the change.
+    quiz_ids = list(quiz_ids)
+    if quiz_ids:
+        Quiz.objects.invalidate_compiled(quiz_ids)
+        transaction.on_commit(lambda: Quiz.objects.invalidate_compiled(quiz_ids))
+
+
+def question_quiz_ids(question_id):
+    return Quiz.objects.filter(question=question_id).values_list("pk", flat=True)
+
+
+@receiver(post_save, sender=MCQuestion)
+@receiver(post_save, sender=EssayQuestion)
+def question_saved_compiled_quiz_receiver(sender, instance, **kwargs):
+    invalidate_compiled_quizzes(question_quiz_ids(instance.pk))
+
+
+@receiver(pre_delete, sender=Question)
+def question_compiled_quiz_receiver(sender, instance, **kwargs):
+    # Sent for every kind of question, as their Question row goes with them.
+    invalidate_compiled_quizzes(question_quiz_ids(instance.pk))
+
+
+@receiver(post_save, sender=QuestionPool)
+@receiver(post_delete, sender=QuestionPool)
+def pool_compiled_quiz_receiver(sender, instance, **kwargs):
+    invalidate_compiled_quizzes([instance.quiz_id])
+
+
+@receiver(post_save, sender=Choice)
+@receiver(pre_delete, sender=Choice)
+def choice_compiled_quiz_receiver(sender, instance, **kwargs):
+    invalidate_compiled_quizzes(question_quiz_ids(instance.question_id))
+
+
+@receiver(m2m_changed, sender=Question.quiz.through)
+def question_quiz_compiled_quiz_receiver(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+    if reverse:
+        invalidate_compiled_quizzes([instance.pk])
+    elif pk_set is not None:
+        invalidate_compiled_quizzes(pk_set)
+    else:
+        invalidate_compiled_quizzes(question_quiz_ids(instance.pk))
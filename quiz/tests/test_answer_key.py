@@ -0,0 +1,143 @@
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+
+from accounts.models import Student
+from course.models import Course, Program
+from quiz import models
+from quiz.models import Choice, MCQuestion, Quiz, Sitting
+
+User = get_user_model()
+
+
+def choice_queries(ctx):
+    return [q["sql"] for q in ctx.captured_queries if '"quiz_choice"' in q["sql"]]
+
+
+@override_settings(
+    STATICFILES_STORAGE="django.contrib.staticfiles.storage.StaticFilesStorage",
+    MIDDLEWARE=[
+        m
+        for m in settings.MIDDLEWARE
+        if m
+        not in [
+            "django.middleware.locale.LocaleMiddleware",
+            "whitenoise.middleware.WhiteNoiseMiddleware",
+        ]
+    ],
+    LANGUAGE_CODE="en-us",
+)
+class AnswerKeyTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.addCleanup(models._compiled_quizzes.clear)
+        program = Program.objects.create(title="Computer Science")
+        self.course = Course.objects.create(
+            title="Algorithms",
+            code="CS201",
+            credit=3,
+            semester="First",
+            level="Bachelor",
+            program=program,
+        )
+        self.quiz = Quiz.objects.create(
+            course=self.course, title="Quiz", category="practice"
+        )
+        self.questions = []
+        for i in range(3):
+            question = MCQuestion.objects.create(
+                content=f"Q{i}", choice_order="content"
+            )
+            question.quiz.add(self.quiz)
+            Choice.objects.create(question=question, choice_text="b", correct=True)
+            Choice.objects.create(question=question, choice_text="a")
+            self.questions.append(question)
+        self.user = User.objects.create_user(username="student", is_student=True)
+        Student.objects.create(student=self.user, program=program, level="Bachelor")
+
+    def correct_choice(self, question):
+        return Choice.objects.get(question=question, correct=True)
+
+    def test_key_lists_choices_and_correct_ids(self):
+        answer_key = Quiz.objects.answer_key(self.quiz.pk)
+        question = self.questions[0]
+        correct = self.correct_choice(question)
+        self.assertEqual(set(answer_key), {q.pk for q in self.questions})
+        self.assertEqual(answer_key[question.pk]["correct"], {correct.pk})
+
+        question.answer_key = answer_key[question.pk]
+        with self.assertNumQueries(0):
+            self.assertTrue(question.check_if_correct(str(correct.pk)))
+            self.assertFalse(question.check_if_correct("x"))
+            self.assertEqual(
+                [text for _, text in question.get_choices_list()], ["a", "b"]
+            )
+            self.assertEqual(question.answer_choice_to_string(correct.pk), "b")
+
+    def test_key_is_shared_between_processes(self):
+        Quiz.objects.answer_key(self.quiz.pk)
+        models._compiled_quizzes.clear()
+        with CaptureQueriesContext(connection) as ctx:
+            Quiz.objects.answer_key(self.quiz.pk)
+        self.assertEqual(ctx.captured_queries, [])
+
+    def test_key_is_not_shared_between_databases(self):
+        Quiz.objects.answer_key(self.quiz.pk)
+        models._compiled_quizzes.clear()
+        with mock.patch.dict(connection.settings_dict, {"NAME": "other.sqlite3"}):
+            with CaptureQueriesContext(connection) as ctx:
+                Quiz.objects.answer_key(self.quiz.pk)
+        self.assertTrue(choice_queries(ctx))
+
+    def test_key_is_rebuilt_without_a_version(self):
+        question = self.questions[0]
+        wrong = Choice.objects.get(question=question, correct=False)
+        dummy = {"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}}
+        with override_settings(CACHES=dummy):
+            Quiz.objects.answer_key(self.quiz.pk)
+            Choice.objects.filter(pk=wrong.pk).update(correct=True)
+            answer_key = Quiz.objects.answer_key(self.quiz.pk)
+        self.assertIn(wrong.pk, answer_key[question.pk]["correct"])
+
+    def test_key_is_invalidated_by_changes(self):
+        question = self.questions[0]
+        Quiz.objects.answer_key(self.quiz.pk)
+
+        wrong = Choice.objects.get(question=question, correct=False)
+        wrong.correct = True
+        wrong.save()
+        answer_key = Quiz.objects.answer_key(self.quiz.pk)
+        self.assertIn(wrong.pk, answer_key[question.pk]["correct"])
+
+        extra = MCQuestion.objects.create(content="Q9", choice_order="none")
+        extra.quiz.add(self.quiz)
+        self.assertIn(extra.pk, Quiz.objects.answer_key(self.quiz.pk))
+
+        self.quiz.question_set.remove(extra)
+        self.assertNotIn(extra.pk, Quiz.objects.answer_key(self.quiz.pk))
+
+        question.delete()
+        self.assertNotIn(question.pk, Quiz.objects.answer_key(self.quiz.pk))
+
+    def test_taking_a_quiz_makes_no_choice_queries(self):
+        client = Client()
+        client.force_login(self.user)
+        url = reverse("quiz_take", args=[self.course.pk, self.quiz.slug])
+        client.get(url)
+        correct = self.correct_choice(self.questions[0])
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = client.post(url, {"answers": correct.pk})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(choice_queries(ctx), [])
+        self.assertTrue(response.context["previous"]["previous_outcome"])
+
+        sitting = Sitting.objects.get(user=self.user)
+        self.assertEqual(sitting.current_score, 1)
@@ -0,0 +1,79 @@
+import threading
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client, TransactionTestCase
+from django.test.utils import override_settings
+from django.urls import reverse
+
+from accounts.models import Student
+from quiz.models import Progress, Sitting, SittingAnswer
+
+from .test_sitting import make_quiz
+
+User = get_user_model()
+
+
+@override_settings(
+    STATICFILES_STORAGE="django.contrib.staticfiles.storage.StaticFilesStorage",
+    MIDDLEWARE=[
+        m
+        for m in settings.MIDDLEWARE
+        if m
+        not in [
+            "django.middleware.locale.LocaleMiddleware",
+            "whitenoise.middleware.WhiteNoiseMiddleware",
+        ]
+    ],
+    LANGUAGE_CODE="en-us",
+)
+class ParallelAnswersTest(TransactionTestCase):
+    """Answers posted at the same time to one sitting, as by a double click."""
+
+    submissions = 6
+
+    def setUp(self):
+        if connection.vendor == "sqlite" and connection.is_in_memory_db():
+            # Threads share an in-memory SQLite database through its shared
+            # cache, where a write lock is refused at once instead of waited
+            # for; set TEST_DATABASE_NAME to run the suite on a file instead.
+            self.skipTest("needs a database that lets writers wait for locks")
+        self.course, self.quiz, self.choices = make_quiz()
+        self.user = User.objects.create_user(username="student", is_student=True)
+        Student.objects.create(
+            student=self.user, program=self.course.program, level="Bachelor"
+        )
+        self.sitting = Sitting.objects.new_sitting(self.user, self.quiz, self.course)
+        self.url = reverse("quiz_take", args=[self.course.pk, self.quiz.slug])
+
+    def submit(self, barrier, statuses):
+        client = Client()
+        client.force_login(self.user)
+        try:
+            barrier.wait()
+            response = client.post(self.url, {"answers": self.choices[0][0].pk})
+            statuses.append(response.status_code)
+        finally:
+            connection.close()
+
+    def test_parallel_submissions_record_one_answer(self):
+        barrier = threading.Barrier(self.submissions)
+        statuses = []
+        threads = [
+            threading.Thread(target=self.submit, args=(barrier, statuses))
+            for _ in range(self.submissions)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(statuses, [200] * self.submissions)
+        sitting = Sitting.objects.get(pk=self.sitting.pk)
+        self.assertEqual(sitting.cursor, 1)
+        self.assertEqual(sitting.current_score, 1)
+        self.assertEqual(SittingAnswer.objects.filter(sitting=sitting).count(), 1)
+        self.assertEqual(
+            Progress.objects.get(user=self.user).score, "quiz.Quiz.None,1,1,"
+        )
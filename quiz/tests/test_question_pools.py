@@ -0,0 +1,160 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+
+from course.models import Course, Program
+from quiz import models
+from quiz.models import EssayQuestion, MCQuestion, QuestionPool, Quiz, Sitting
+
+User = get_user_model()
+
+
+@override_settings(
+    STATICFILES_STORAGE="django.contrib.staticfiles.storage.StaticFilesStorage",
+    MIDDLEWARE=[
+        m
+        for m in settings.MIDDLEWARE
+        if m
+        not in [
+            "django.middleware.locale.LocaleMiddleware",
+            "whitenoise.middleware.WhiteNoiseMiddleware",
+        ]
+    ],
+    LANGUAGE_CODE="en-us",
+)
+class QuestionPoolTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.addCleanup(models._compiled_quizzes.clear)
+        program = Program.objects.create(title="Computer Science")
+        self.course = Course.objects.create(
+            title="Algorithms",
+            code="CS201",
+            credit=3,
+            semester="First",
+            level="Bachelor",
+            program=program,
+        )
+        self.quiz = Quiz.objects.create(
+            course=self.course, title="Exam", category="exam"
+        )
+        self.user = User.objects.create_user(username="student")
+        self.bank = {}
+        for topic, difficulty, count in [
+            ("graphs", "easy", 10),
+            ("graphs", "hard", 10),
+            ("sorting", "easy", 10),
+        ]:
+            self.add_questions(topic, difficulty, count)
+
+    def add_questions(self, topic, difficulty, count):
+        for i in range(count):
+            question = MCQuestion.objects.create(
+                content=f"{topic} {i}",
+                topic=topic,
+                difficulty=difficulty,
+                choice_order="none",
+            )
+            question.quiz.add(self.quiz)
+            self.bank[question.pk] = (topic, difficulty)
+
+    def sit(self):
+        return Sitting.objects.new_sitting(self.user, self.quiz, self.course)
+
+    def test_without_pools_every_question_is_asked(self):
+        self.assertEqual(len(self.sit().question_order), 30)
+        self.assertEqual(self.quiz.get_max_score, 30)
+
+    def test_sitting_draws_from_each_pool(self):
+        QuestionPool.objects.create(quiz=self.quiz, size=3, topic="graphs")
+        QuestionPool.objects.create(
+            quiz=self.quiz, size=2, topic="sorting", difficulty="easy"
+        )
+        QuestionPool.objects.create(quiz=self.quiz, size=4, difficulty="hard")
+        self.assertEqual(self.quiz.get_max_score, 9)
+
+        draws = set()
+        for _ in range(5):
+            sitting = self.sit()
+            ids = sitting.question_order
+            self.assertEqual(len(ids), len(set(ids)), "no question twice")
+            self.assertEqual(len(ids), 9)
+            tags = [self.bank[pk] for pk in ids]
+            self.assertEqual(sum(1 for t in tags if t == ("sorting", "easy")), 2)
+            self.assertGreaterEqual(sum(1 for t in tags if t[1] == "hard"), 4)
+            self.assertEqual(sitting.get_max_score, 9)
+            draws.add(tuple(ids))
+        self.assertGreater(len(draws), 1)
+
+    def test_pool_larger_than_its_questions_takes_them_all(self):
+        essay = EssayQuestion.objects.create(content="Explain", topic="proofs")
+        essay.quiz.add(self.quiz)
+        QuestionPool.objects.create(quiz=self.quiz, size=5, topic="proofs")
+        self.assertEqual(self.sit().question_order, [essay.pk])
+
+    def test_starting_a_sitting_does_not_grow_with_the_bank(self):
+        QuestionPool.objects.create(quiz=self.quiz, size=5)
+        Quiz.objects.compiled(self.quiz.pk)
+        with CaptureQueriesContext(connection) as small:
+            self.sit()
+        self.add_questions("graphs", "medium", 200)
+        Quiz.objects.compiled(self.quiz.pk)
+        with CaptureQueriesContext(connection) as large:
+            sitting = self.sit()
+        self.assertEqual(len(small), 1)
+        self.assertEqual(len(large), 1)
+        self.assertEqual(len(sitting.question_order), 5)
+
+    def test_pool_changes_invalidate_the_compiled_quiz(self):
+        pool = QuestionPool.objects.create(quiz=self.quiz, size=3)
+        self.assertEqual(len(self.sit().question_order), 3)
+        pool.size = 6
+        pool.save()
+        self.assertEqual(len(self.sit().question_order), 6)
+
+        question = MCQuestion.objects.filter(topic="sorting").first()
+        pool.topic = "sorting"
+        pool.save()
+        question.topic = "graphs"
+        question.save()
+        self.assertNotIn(question.pk, self.sit().question_order)
+
+        pool.delete()
+        self.assertEqual(len(self.sit().question_order), 30)
+
+    def test_pools_must_match_a_question(self):
+        with self.assertRaises(ValidationError):
+            QuestionPool(quiz=self.quiz, size=2, topic="trees").full_clean()
+        with self.assertRaises(ValidationError):
+            QuestionPool(
+                quiz=self.quiz, size=2, topic="sorting", difficulty="hard"
+            ).full_clean()
+        QuestionPool(
+            quiz=self.quiz, size=2, topic="graphs", difficulty="hard"
+        ).full_clean()
+
+    def test_empty_draw_redirects_to_the_quiz_list(self):
+        # Saved without validation, as when its questions are retagged later.
+        QuestionPool.objects.create(quiz=self.quiz, size=2, topic="trees")
+        self.client.force_login(self.user)
+        index = reverse("quiz_index", args=[self.course.slug])
+
+        response = self.client.get(
+            reverse("quiz_take", args=[self.course.pk, self.quiz.slug])
+        )
+        self.assertRedirects(response, index, fetch_redirect_response=False)
+
+        self.quiz.submit_all = True
+        self.quiz.save()
+        response = self.client.get(
+            reverse("quiz_submit_all", args=[self.course.pk, self.quiz.slug]),
+            {"format": "json"},
+        )
+        self.assertEqual(response.status_code, 409)
+        self.assertFalse(Sitting.objects.exists())
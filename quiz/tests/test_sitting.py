@@ -0,0 +1,216 @@
+import random
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+
+from course.models import Course, Program
+from quiz.models import Choice, MCQuestion, Quiz, Sitting, SittingAnswer
+
+User = get_user_model()
+
+
+def make_quiz(questions=3):
+    program = Program.objects.create(title="Computer Science")
+    course = Course.objects.create(
+        title="Algorithms",
+        code="CS201",
+        credit=3,
+        semester="First",
+        level="Bachelor",
+        program=program,
+    )
+    quiz = Quiz.objects.create(course=course, title="Quiz", category="practice")
+    choices = []
+    for i in range(questions):
+        question = MCQuestion.objects.create(content=f"Q{i}", choice_order="none")
+        question.quiz.add(quiz)
+        choices.append(
+            (
+                Choice.objects.create(
+                    question=question, choice_text="yes", correct=True
+                ),
+                Choice.objects.create(question=question, choice_text="no"),
+            )
+        )
+    return course, quiz, choices
+
+
+class SittingAnswerTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="student")
+        self.course, self.quiz, self.choices = make_quiz()
+        self.sitting = Sitting.objects.new_sitting(self.user, self.quiz, self.course)
+
+    def answer(self, correct):
+        question = self.sitting.get_first_question()
+        right, wrong = Choice.objects.filter(question=question).order_by("-correct")
+        guess = (right if correct else wrong).pk
+        self.sitting.answer_question(question, guess, correct)
+        return question
+
+    def test_answer_is_one_update_and_one_insert(self):
+        question = self.sitting.get_first_question()
+        with CaptureQueriesContext(connection) as ctx:
+            self.sitting.answer_question(question, self.choices[0][0].pk, True)
+        statements = [
+            q["sql"].split()[0]
+            for q in ctx.captured_queries
+            if "SAVEPOINT" not in q["sql"]
+        ]
+        self.assertEqual(statements, ["UPDATE", "INSERT"])
+        sitting = Sitting.objects.get(pk=self.sitting.pk)
+        self.assertEqual(sitting.progress(), (1, 3))
+        self.assertEqual(sitting.current_score, 1)
+        self.assertEqual(
+            sitting.user_answers, {str(question.pk): str(self.choices[0][0].pk)}
+        )
+
+    def test_stale_answer_is_not_recorded(self):
+        stale = Sitting.objects.get(pk=self.sitting.pk)
+        question = self.sitting.get_first_question()
+        self.assertTrue(self.sitting.answer_question(question, "1", True))
+        self.assertFalse(stale.answer_question(question, "2", True))
+        self.assertEqual(stale.cursor, 1)
+        self.assertEqual(stale.current_score, 1)
+        self.assertEqual(SittingAnswer.objects.count(), 1)
+
+    def test_repeated_submission_is_not_recorded(self):
+        stale = Sitting.objects.get(pk=self.sitting.pk)
+        answers = {right.question_id: right.pk for right, _ in self.choices}
+        self.assertEqual(len(self.sitting.submit_answers(answers)), 3)
+        self.assertEqual(stale.submit_answers(answers), [])
+        self.assertEqual(stale.current_score, 3)
+        self.assertEqual(SittingAnswer.objects.count(), 3)
+
+    def test_progress_and_incorrect_questions(self):
+        self.answer(True)
+        wrong = self.answer(False)
+        self.answer(True)
+        self.assertFalse(self.sitting.get_first_question())
+        self.assertEqual(self.sitting.progress(), (3, 3))
+        self.assertEqual(self.sitting.current_score, 2)
+        self.assertEqual(self.sitting.get_incorrect_questions, [wrong.pk])
+        answers = [q.user_answer for q in self.sitting.get_questions(with_answers=True)]
+        self.assertEqual(
+            answers,
+            [
+                str(self.choices[0][0].pk),
+                str(self.choices[1][1].pk),
+                str(self.choices[2][0].pk),
+            ],
+        )
+
+    def test_marking_toggles_answer_rows(self):
+        first = self.answer(True)
+        wrong = self.answer(False)
+        self.answer(True)
+        self.sitting.mark_quiz_complete()
+
+        self.sitting.remove_incorrect_question(wrong)
+        self.sitting.remove_incorrect_question(wrong)
+        self.assertEqual(self.sitting.current_score, 3)
+        self.sitting.add_incorrect_question(first)
+        self.sitting.add_incorrect_question(first)
+        self.assertEqual(self.sitting.current_score, 2)
+        self.assertEqual(self.sitting.get_incorrect_questions, [first.pk])
+        self.assertEqual(SittingAnswer.objects.filter(sitting=self.sitting).count(), 3)
+
+
+class SittingShuffleTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="student")
+        self.course, self.quiz, self.choices = make_quiz(questions=8)
+        self.quiz.random_order = True
+        self.quiz.save()
+        MCQuestion.objects.update(choice_order="random")
+        for right, _ in self.choices:
+            for i in range(4):
+                Choice.objects.create(question_id=right.question_id, choice_text=i)
+
+    def test_question_order_follows_the_seed(self):
+        Quiz.objects.question_ids(self.quiz.pk)
+        with CaptureQueriesContext(connection) as ctx:
+            sitting = Sitting.objects.new_sitting(self.user, self.quiz, self.course)
+        self.assertEqual(len(ctx.captured_queries), 1)
+        self.assertNotIn("RANDOM", ctx.captured_queries[0]["sql"])
+
+        ids = sorted(right.question_id for right, _ in self.choices)
+        self.assertEqual(
+            sitting.question_order, random.Random(sitting.seed).sample(ids, len(ids))
+        )
+
+    def test_choice_order_is_stable_within_a_sitting(self):
+        sitting = Sitting.objects.new_sitting(self.user, self.quiz, self.course)
+        first = sitting.get_first_question().get_choices_list()
+        reloaded = Sitting.objects.get(pk=sitting.pk)
+        self.assertEqual(reloaded.get_first_question().get_choices_list(), first)
+        self.assertEqual(sitting.get_questions()[0].get_choices_list(), first)
+
+        orders = {
+            tuple(text for _, text in question.get_choices_list())
+            for question in sitting.get_questions()
+        }
+        self.assertGreater(len(orders), 1)
+
+
+class SittingMigrationTest(TransactionTestCase):
+    migrate_from = ("quiz", "0004_alter_essayquestion_options_and_more")
+
+    def test_existing_sittings_are_converted(self):
+        user = User.objects.create_user(username="student")
+        course, quiz, choices = make_quiz()
+        q1, q2, q3 = (right.question_id for right, _ in choices)
+
+        executor = MigrationExecutor(connection)
+        executor.migrate([self.migrate_from])
+        old_apps = executor.loader.project_state([self.migrate_from]).apps
+        OldSitting = old_apps.get_model("quiz", "Sitting")
+        old = OldSitting.objects.create(
+            user_id=user.pk,
+            quiz_id=quiz.pk,
+            course_id=course.pk,
+            question_order=f"{q2},{q1},{q3},",
+            question_list=f"{q3},",
+            incorrect_questions=f"{q1},",
+            current_score=1,
+            user_answers=f'{{"{q2}": "{choices[1][0].pk}", "{q1}": "x"}}',
+        )
+
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+        sitting = Sitting.objects.get(pk=old.pk)
+        self.assertEqual(sitting.question_order, [q2, q1, q3])
+        self.assertEqual(sitting.cursor, 2)
+        self.assertEqual(sitting.get_first_question().pk, q3)
+        self.assertEqual(sitting.get_incorrect_questions, [q1])
+        self.assertEqual(
+            sitting.user_answers, {str(q2): str(choices[1][0].pk), str(q1): "x"}
+        )
+
+    def test_existing_sittings_get_their_own_seed(self):
+        user = User.objects.create_user(username="student")
+        course, quiz, _choices = make_quiz()
+        before_seed = ("quiz", "0006_quiz_submit_all")
+
+        executor = MigrationExecutor(connection)
+        executor.migrate([before_seed])
+        old_apps = executor.loader.project_state([before_seed]).apps
+        OldSitting = old_apps.get_model("quiz", "Sitting")
+        pks = [
+            OldSitting.objects.create(
+                user_id=user.pk, quiz_id=quiz.pk, course_id=course.pk, current_score=0
+            ).pk
+            for _ in range(3)
+        ]
+
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+        seeds = Sitting.objects.filter(pk__in=pks).values_list("seed", flat=True)
+        self.assertEqual(len(set(seeds)), 3)
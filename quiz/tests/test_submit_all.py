@@ -0,0 +1,157 @@
+import json
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+
+from accounts.models import Student
+from course.models import Course, Program
+from quiz import models
+from quiz.models import Choice, EssayQuestion, MCQuestion, Progress, Quiz, Sitting
+
+User = get_user_model()
+
+
+@override_settings(
+    STATICFILES_STORAGE="django.contrib.staticfiles.storage.StaticFilesStorage",
+    MIDDLEWARE=[
+        m
+        for m in settings.MIDDLEWARE
+        if m
+        not in [
+            "django.middleware.locale.LocaleMiddleware",
+            "whitenoise.middleware.WhiteNoiseMiddleware",
+        ]
+    ],
+    LANGUAGE_CODE="en-us",
+)
+class SubmitAllTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.addCleanup(models._compiled_quizzes.clear)
+        program = Program.objects.create(title="Computer Science")
+        self.course = Course.objects.create(
+            title="Algorithms",
+            code="CS201",
+            credit=3,
+            semester="First",
+            level="Bachelor",
+            program=program,
+        )
+        self.quiz = Quiz.objects.create(
+            course=self.course,
+            title="Exam",
+            category="exam",
+            submit_all=True,
+            exam_paper=True,
+        )
+        self.correct = {}
+        for i in range(3):
+            self.add_question(i)
+        self.user = User.objects.create_user(username="student", is_student=True)
+        Student.objects.create(student=self.user, program=program, level="Bachelor")
+        self.client = Client()
+        self.client.force_login(self.user)
+        self.url = reverse("quiz_submit_all", args=[self.course.pk, self.quiz.slug])
+
+    def add_question(self, i):
+        question = MCQuestion.objects.create(content=f"Q{i}", choice_order="none")
+        question.quiz.add(self.quiz)
+        self.correct[question] = Choice.objects.create(
+            question=question, choice_text="yes", correct=True
+        )
+        Choice.objects.create(question=question, choice_text="no")
+        return question
+
+    def post_json(self, answers):
+        return self.client.post(
+            self.url,
+            json.dumps({"answers": answers}),
+            content_type="application/json",
+        )
+
+    def test_take_redirects_to_single_page(self):
+        response = self.client.get(
+            reverse("quiz_take", args=[self.course.pk, self.quiz.slug])
+        )
+        self.assertRedirects(response, self.url)
+
+    def test_page_shows_every_question(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, "quiz/question_set.html")
+        for question in self.correct:
+            self.assertContains(response, question.content)
+
+    def test_json_question_set(self):
+        essay = EssayQuestion.objects.create(content="Explain")
+        essay.quiz.add(self.quiz)
+        data = self.client.get(self.url, {"format": "json"}).json()
+        self.assertEqual(len(data["questions"]), 4)
+        first = data["questions"][0]
+        self.assertEqual(first["type"], "MCQuestion")
+        self.assertEqual([c["text"] for c in first["choices"]], ["yes", "no"])
+        self.assertEqual(data["questions"][3]["choices"], [])
+
+    def test_form_submission_grades_everything(self):
+        questions = list(self.correct)
+        response = self.client.post(
+            self.url,
+            {
+                f"question_{questions[0].pk}": self.correct[questions[0]].pk,
+                f"question_{questions[1].pk}": self.correct[questions[1]].pk,
+            },
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, "quiz/result.html")
+        self.assertEqual(response.context["score"], 2)
+
+        sitting = Sitting.objects.get(user=self.user)
+        self.assertTrue(sitting.complete)
+        self.assertEqual(sitting.progress(), (3, 3))
+        self.assertEqual(sitting.get_incorrect_questions, [questions[2].pk])
+        self.assertEqual(sitting.user_answers[str(questions[2].pk)], "")
+        self.assertEqual(
+            Progress.objects.get(user=self.user).score, f"quiz.Quiz.None,2,3,"
+        )
+
+    def test_json_submission(self):
+        answers = {question.pk: choice.pk for question, choice in self.correct.items()}
+        response = self.post_json(answers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["score"], 3)
+        self.assertEqual(response.json()["percent"], 100)
+        self.assertTrue(response.json()["passed"])
+
+        for body in ("[]", '{"answers": {"x": 1}}', "nope"):
+            with self.subTest(body=body):
+                Sitting.objects.all().delete()
+                response = self.client.post(
+                    self.url, body, content_type="application/json"
+                )
+                self.assertEqual(response.status_code, 400)
+
+    def test_submission_after_questions_were_removed(self):
+        self.client.get(self.url)
+        self.quiz.question_set.clear()
+        response = self.post_json({})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["score"], 0)
+        self.assertTrue(Sitting.objects.get(user=self.user).complete)
+
+    def test_query_count_does_not_grow_with_questions(self):
+        self.client.get(self.url)
+        with CaptureQueriesContext(connection) as few:
+            self.post_json({})
+        Sitting.objects.all().delete()
+        for i in range(3, 13):
+            self.add_question(i)
+        self.client.get(self.url)
+        with CaptureQueriesContext(connection) as many:
+            self.post_json({})
+        self.assertEqual(len(few), len(many))
@@ -1,3 +1,5 @@
+from unittest import mock
+
 from django.test import TestCase, Client
 from django.urls import reverse
 from django.contrib.auth import get_user_model
@@ -8,7 +10,6 @@ from course.models import Course, Program
 from core.models import Semester, Session
 from result.models import TakenCourse, Student
 from django.utils import timezone
-import json
 
 User = get_user_model()
 
@@ -158,8 +159,8 @@ class QuizTakeViewTest(TestCase):
             user=self.student_user,
             quiz=single_quiz,
             course=self.course,
-            question_order=f"{self.question1.id},",
-            question_list="",
+            question_order=[self.question1.id],
+            cursor=1,
             current_score=1,
             complete=True,
             end=timezone.now()
@@ -181,9 +182,9 @@ class QuizTakeViewTest(TestCase):
             sitting.refresh_from_db()
             self.assertEqual(sitting.current_score, 1, 
                             "Sitting score should be 1 for one correct answer.")
-            self.assertEqual(sitting.incorrect_questions, "", 
+            self.assertEqual(sitting.get_incorrect_questions, [],
                             "No questions should be marked as incorrect.")
-            self.assertEqual(json.loads(sitting.user_answers), 
+            self.assertEqual(sitting.user_answers,
                             {str(self.question1.id): str(self.correct_choice1.id)},
                             "Correct answer should be stored in user_answers.")
         
@@ -209,9 +210,9 @@ class QuizTakeViewTest(TestCase):
             sitting.refresh_from_db()
             self.assertEqual(sitting.current_score, 0,
                             "Sitting score should be 0 for an incorrect answer.")
-            self.assertEqual(sitting.incorrect_questions, f"{self.question1.id},",
+            self.assertEqual(sitting.get_incorrect_questions, [self.question1.id],
                             "Question 1 should be marked as incorrect.")
-            self.assertEqual(json.loads(sitting.user_answers),
+            self.assertEqual(sitting.user_answers,
                             {str(self.question1.id): str(self.incorrect_choice1.id)},
                             "Incorrect answer should be stored in user_answers.")
         
@@ -258,7 +259,7 @@ class QuizTakeViewTest(TestCase):
         sitting_exists = Sitting.objects.filter(id=sitting.id).exists()
         if sitting_exists:
             sitting.refresh_from_db()
-            self.assertEqual(sitting.incorrect_questions, "")
+            self.assertEqual(sitting.get_incorrect_questions, [])
 
     def test_TC008_invalid_answer_submission(self):
         """Test invalid answer submission for MCQuestion"""
@@ -276,4 +277,20 @@ class QuizTakeViewTest(TestCase):
         if sitting_exists:
             sitting.refresh_from_db()
             self.assertEqual(sitting.current_score, 0)
-            self.assertEqual(sitting.user_answers, "{}")
\ No newline at end of file
+            self.assertEqual(sitting.user_answers, {})
+    def test_TC009_last_question_answered_twice(self):
+        """Test a double submission of the last question of a practice quiz"""
+        url = reverse('quiz_take', args=[self.course.pk, self.quiz.slug])
+        self.client.post(url, {'answers': str(self.correct_choice1.id)})
+        stale = Sitting.objects.get(user=self.student_user, quiz=self.quiz)
+        response = self.client.post(url, {'answers': str(self.correct_choice2.id)})
+        self.assertTemplateUsed(response, 'quiz/result.html')
+        self.assertFalse(Sitting.objects.filter(id=stale.id).exists())
+
+        # The second request loaded the sitting before the first discarded it
+        with mock.patch.object(Sitting.objects, 'user_sitting', return_value=stale):
+            response = self.client.post(url, {
+                'answers': str(self.correct_choice2.id)
+            }, follow=True)
+        self.assertRedirects(response, reverse('quiz_index', kwargs={'slug': self.course.slug}))
+        self.assertContains(response, "You have already completed this quiz.")
@@ -12,6 +12,11 @@ urlpatterns = [
         name="quiz_marking_detail",
     ),
     path("<int:pk>/<slug>/take/", view=views.QuizTake.as_view(), name="quiz_take"),
+    path(
+        "<int:pk>/<slug>/take/all/",
+        views.quiz_submit_all,
+        name="quiz_submit_all",
+    ),
     path("<slug>/quiz_add/", views.QuizCreateView.as_view(), name="quiz_create"),
     path("<slug>/<int:pk>/add/", views.QuizUpdateView.as_view(), name="quiz_update"),
     path("<slug>/<int:pk>/delete/", views.quiz_delete, name="quiz_delete"),
@@ -1,6 +1,10 @@
+import json
+
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
+from django.core.exceptions import ImproperlyConfigured
 from django.db import transaction
+from django.http import HttpResponseBadRequest, JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.utils.decorators import method_decorator
 from django.views.generic import (
@@ -19,6 +23,7 @@ from .forms import (
     MCQuestionFormSet,
     QuestionForm,
     QuizAddForm,
+    QuizSubmitForm,
 )
 from .models import (
     Course,
@@ -232,14 +237,21 @@ class QuizTake(FormView):
 
     def dispatch(self, request, *args, **kwargs):
         self.quiz = get_object_or_404(Quiz, slug=self.kwargs["slug"])
+        if self.quiz.submit_all:
+            return redirect("quiz_submit_all", **self.kwargs)
         self.course = get_object_or_404(Course, pk=self.kwargs["pk"])
         if not Question.objects.filter(quiz=self.quiz).exists():
             messages.warning(request, "This quiz has no questions available.")
             return redirect("quiz_index", slug=self.course.slug)
 
-        self.sitting = Sitting.objects.user_sitting(
-            request.user, self.quiz, self.course
-        )
+        try:
+            self.sitting = Sitting.objects.user_sitting(
+                request.user, self.quiz, self.course
+            )
+        except ImproperlyConfigured:
+            # The question pools of the quiz matched no question.
+            messages.warning(request, "This quiz has no questions available.")
+            return redirect("quiz_index", slug=self.course.slug)
         if not self.sitting:
             messages.info(
                 request,
@@ -264,22 +276,29 @@ class QuizTake(FormView):
         return self.form_class
 
     def form_valid(self, form):
-        self.form_valid_user(form)
+        try:
+            self.form_valid_user(form)
+        except Sitting.DoesNotExist:
+            # A parallel submission of the last question finished this
+            # practice sitting first, and its result page discarded it.
+            messages.info(self.request, "You have already completed this quiz.")
+            return redirect("quiz_index", slug=self.course.slug)
         if not self.sitting.get_first_question():
             return self.final_result_user()
         return super().get(self.request)
 
     def form_valid_user(self, form):
-        progress, _ = Progress.objects.get_or_create(user=self.request.user)
         guess = form.cleaned_data["answers"]
         is_correct = self.question.check_if_correct(guess)
 
-        if is_correct:
-            self.sitting.add_to_score(1)
-            progress.update_score(self.question, 1, 1)
-        else:
-            self.sitting.add_incorrect_question(self.question)
-            progress.update_score(self.question, 0, 1)
+        with transaction.atomic():
+            # A double click or a second tab answering the same question is
+            # recorded, and counted in the progress, only once.
+            if self.sitting.answer_question(self.question, guess, is_correct):
+                progress, _ = Progress.objects.select_for_update().get_or_create(
+                    user=self.request.user
+                )
+                progress.update_score(self.question, int(is_correct), 1)
 
         if not self.quiz.answers_at_end:
             self.previous = {
@@ -292,9 +311,6 @@ class QuizTake(FormView):
         else:
             self.previous = {}
 
-        self.sitting.add_user_answer(self.question, guess)
-        self.sitting.remove_first_question()
-
         # Update self.question and self.progress for the next question
         self.question = self.sitting.get_first_question()
         self.progress = self.sitting.progress()
@@ -312,25 +328,142 @@ class QuizTake(FormView):
 
     def final_result_user(self):
         self.sitting.mark_quiz_complete()
-        results = {
-            "course": self.course,
-            "quiz": self.quiz,
-            "score": self.sitting.get_current_score,
-            "max_score": self.sitting.get_max_score,
-            "percent": self.sitting.get_percent_correct,
-            "sitting": self.sitting,
-            "previous": getattr(self, "previous", {}),
-        }
-
-        if self.quiz.answers_at_end:
-            results["questions"] = self.sitting.get_questions(with_answers=True)
-            results["incorrect_questions"] = self.sitting.get_incorrect_questions
-
-        if (
-            not self.quiz.exam_paper
-            or self.request.user.is_superuser
-            or self.request.user.is_lecturer
-        ):
-            self.sitting.delete()
-
-        return render(self.request, self.result_template_name, results)
+        return quiz_result(
+            self.request,
+            self.sitting,
+            self.course,
+            previous=getattr(self, "previous", {}),
+        )
+
+
+def quiz_result(request, sitting, course, previous=None):
+    """Render the result page of a completed sitting."""
+    quiz = sitting.quiz
+    results = {
+        "course": course,
+        "quiz": quiz,
+        "score": sitting.get_current_score,
+        "max_score": sitting.get_max_score,
+        "percent": sitting.get_percent_correct,
+        "sitting": sitting,
+        "previous": previous or {},
+    }
+
+    if quiz.answers_at_end:
+        results["questions"] = sitting.get_questions(with_answers=True)
+        results["incorrect_questions"] = sitting.get_incorrect_questions
+
+    discard_practice_sitting(request, sitting)
+    return render(request, "quiz/result.html", results)
+
+
+def discard_practice_sitting(request, sitting):
+    """Only exam papers taken by students are kept for marking."""
+    if (
+        not sitting.quiz.exam_paper
+        or request.user.is_superuser
+        or request.user.is_lecturer
+    ):
+        sitting.delete()
+
+
+def _question_payload(question):
+    return {
+        "id": question.id,
+        "content": question.content,
+        "figure": question.figure.url if question.figure else None,
+        "type": question.__class__.__name__,
+        "choices": [
+            {"id": pk, "text": text}
+            for pk, text in (
+                question.get_choices_list() if isinstance(question, MCQuestion) else []
+            )
+        ],
+    }
+
+
+@login_required
+def quiz_submit_all(request, pk, slug):
+    """
+    Take a submit-all quiz in one round trip: GET returns every remaining
+    question of the sitting (as a page, or as JSON with ``?format=json``)
+    and one POST of all the answers grades and completes the sitting. A
+    JSON POST takes ``{"answers": {question_id: answer}}`` and returns the
+    score.
+    """
+    quiz = get_object_or_404(Quiz, slug=slug, submit_all=True)
+    course = get_object_or_404(Course, pk=pk)
+    json_body = request.content_type == "application/json"
+    as_json = json_body or request.GET.get("format") == "json"
+
+    try:
+        sitting = Sitting.objects.user_sitting(request.user, quiz, course)
+    except ImproperlyConfigured:
+        message = "This quiz has no questions available."
+        if as_json:
+            return JsonResponse({"error": message}, status=409)
+        messages.warning(request, message)
+        return redirect("quiz_index", slug=course.slug)
+    if not sitting:
+        message = "You have already completed this quiz. Only one attempt is permitted."
+        if as_json:
+            return JsonResponse({"error": message}, status=403)
+        messages.info(request, message)
+        return redirect("quiz_index", slug=course.slug)
+
+    remaining = set(sitting.question_order[sitting.cursor :])
+    questions = [q for q in sitting.get_questions() if q.id in remaining]
+
+    if request.method == "POST":
+        if json_body:
+            try:
+                posted = json.loads(request.body)["answers"]
+                answers = {int(qid): answer for qid, answer in posted.items()}
+            except (ValueError, KeyError, TypeError, AttributeError):
+                return HttpResponseBadRequest("expected a JSON object with 'answers'")
+        else:
+            form = QuizSubmitForm(questions, request.POST)
+            if not form.is_valid():
+                return render(
+                    request,
+                    "quiz/question_set.html",
+                    {"quiz": quiz, "course": course, "form": form},
+                )
+            answers = form.answers()
+
+        with transaction.atomic():
+            rows = sitting.submit_answers(answers)
+            # Questions removed from the quiz still leave their answer rows.
+            if rows and questions:
+                progress, _ = Progress.objects.select_for_update().get_or_create(
+                    user=request.user
+                )
+                progress.update_score(
+                    questions[0], sum(row.correct for row in rows), len(rows)
+                )
+
+        if as_json:
+            response = {
+                "score": sitting.get_current_score,
+                "max_score": sitting.get_max_score,
+                "percent": sitting.get_percent_correct,
+                "passed": sitting.check_if_passed,
+            }
+            if quiz.answers_at_end:
+                response["incorrect_questions"] = sitting.get_incorrect_questions
+            discard_practice_sitting(request, sitting)
+            return JsonResponse(response)
+        return quiz_result(request, sitting, course)
+
+    if as_json:
+        return JsonResponse(
+            {
+                "quiz": {"id": quiz.id, "title": quiz.title, "slug": quiz.slug},
+                "questions": [_question_payload(question) for question in questions],
+            }
+        )
+    return render(
+        request,
+        "quiz/question_set.html",
+        {"quiz": quiz, "course": course, "form": QuizSubmitForm(questions)},
+    )
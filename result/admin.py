@@ -1,7 +1,18 @@
 from django.contrib import admin
 from django.contrib.auth.models import Group
 
-from .models import TakenCourse, Result
+from .models import (
+    AcademicStanding,
+    AssessmentComponent,
+    AssessmentScheme,
+    GradeAggregate,
+    GradeBoundary,
+    GradingScheme,
+    PDFJob,
+    SemesterFinalization,
+    TakenCourse,
+    Result,
+)
 
 
 class ScoreAdmin(admin.ModelAdmin):
@@ -19,5 +30,64 @@ class ScoreAdmin(admin.ModelAdmin):
     ]
 
 
+class GradeAggregateAdmin(admin.ModelAdmin):
+    list_display = ["student", "level", "semester", "total_points", "total_credits"]
+    list_filter = ["level", "semester"]
+
+
+class GradeBoundaryInline(admin.TabularInline):
+    model = GradeBoundary
+    extra = 0
+
+
+class GradingSchemeAdmin(admin.ModelAdmin):
+    list_display = ["name", "program", "level"]
+    list_filter = ["level"]
+    inlines = [GradeBoundaryInline]
+
+
+class AssessmentComponentInline(admin.TabularInline):
+    model = AssessmentComponent
+    extra = 0
+
+
+class AssessmentSchemeAdmin(admin.ModelAdmin):
+    list_display = ["course"]
+    search_fields = ["course__code", "course__title"]
+    inlines = [AssessmentComponentInline]
+
+
+class PDFJobAdmin(admin.ModelAdmin):
+    list_display = ["id", "kind", "owner", "status", "created_at", "expires_at"]
+    list_filter = ["kind", "status"]
+
+
+class ResultAdmin(admin.ModelAdmin):
+    list_display = ["student", "level", "semester", "session", "gpa", "cgpa"]
+    list_filter = ["level", "semester", "session"]
+
+
+class SemesterFinalizationAdmin(admin.ModelAdmin):
+    list_display = [
+        "semester",
+        "session",
+        "students",
+        "courses",
+        "finalized_by",
+        "finalized_at",
+    ]
+
+
+class AcademicStandingAdmin(admin.ModelAdmin):
+    list_display = ["student", "semester", "session", "standing", "gpa", "cgpa"]
+    list_filter = ["standing", "semester", "session"]
+
+
 admin.site.register(TakenCourse, ScoreAdmin)
-admin.site.register(Result)
+admin.site.register(Result, ResultAdmin)
+admin.site.register(GradeAggregate, GradeAggregateAdmin)
+admin.site.register(PDFJob, PDFJobAdmin)
+admin.site.register(GradingScheme, GradingSchemeAdmin)
+admin.site.register(SemesterFinalization, SemesterFinalizationAdmin)
+admin.site.register(AcademicStanding, AcademicStandingAdmin)
+admin.site.register(AssessmentScheme, AssessmentSchemeAdmin)
@@ -0,0 +1,144 @@
+import csv
+import io
+import tempfile
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+
+from django.db import connections
+
+from accounts.models import Student
+from core.models import Semester, Session
+from course.models import Course, CourseAllocation
+from .models import TakenCourse
+from .pdf import render_pdf
+from .views import (
+    REGISTRATION_FORM_LAYOUT,
+    RESULT_SHEET_LAYOUT,
+    registration_form_story,
+    result_sheet_story,
+)
+
+RESULT_SHEET = "result_sheet"
+REGISTRATION_FORM = "registration_form"
+
+
+def _render_result_sheet(course_id, semester_id, session_id):
+    course = Course.objects.get(pk=course_id)
+    semester = Semester.objects.get(pk=semester_id)
+    session = Session.objects.get(pk=session_id)
+    rows = list(course.taken_courses.select_related("student__student").order_by("pk"))
+    allocation = (
+        CourseAllocation.objects.filter(courses=course)
+        .select_related("lecturer")
+        .first()
+    )
+    lecturer_name = allocation.lecturer.get_full_name if allocation else ""
+    story = result_sheet_story(course, rows, semester, session, lecturer_name)
+    filename = f"result_sheets/{course.code.replace('/', '-')}_resultSheet.pdf"
+    return filename, render_pdf(story, **RESULT_SHEET_LAYOUT)
+
+
+def _render_registration_form(student_id, semester_id, session_id):
+    student = Student.objects.select_related("student").get(pk=student_id)
+    session = Session.objects.get(pk=session_id)
+    courses = TakenCourse.objects.filter(student=student).select_related("course")
+    story = registration_form_story(student.student, courses, session)
+    username = student.student.username.replace("/", "-")
+    filename = f"registration_forms/{username}.pdf"
+    return filename, render_pdf(story, **REGISTRATION_FORM_LAYOUT)
+
+
+RENDERERS = {
+    RESULT_SHEET: _render_result_sheet,
+    REGISTRATION_FORM: _render_registration_form,
+}
+
+
+def render_item(item):
+    """
+    Render one ``(kind, object id, semester id, session id)`` item.
+
+    Runs inside a pool worker, so it only takes and returns picklable
+    values: ``(item, filename, content, seconds, error)``.
+    """
+    kind, pk, semester_id, session_id = item
+    start = time.perf_counter()
+    try:
+        filename, pdf = RENDERERS[kind](pk, semester_id, session_id)
+        with pdf:
+            content = pdf.read()
+    except Exception as e:
+        filename, content, error = None, None, f"{type(e).__name__}: {e}"
+    else:
+        error = ""
+    return item, filename, content, time.perf_counter() - start, error
+
+
+def program_items(program, semester, session, kinds=None):
+    kinds = kinds or RENDERERS
+    items = []
+    if RESULT_SHEET in kinds:
+        courses = Course.objects.filter(
+            program=program, semester=semester.semester
+        ).order_by("code")
+        items += [
+            (RESULT_SHEET, pk, semester.pk, session.pk)
+            for pk in courses.values_list("pk", flat=True)
+        ]
+    if REGISTRATION_FORM in kinds:
+        students = Student.objects.filter(program=program).order_by("pk")
+        items += [
+            (REGISTRATION_FORM, pk, semester.pk, session.pk)
+            for pk in students.values_list("pk", flat=True)
+        ]
+    return items
+
+
+def build_program_bundle(program, semester, session, workers=1, kinds=None, out=None):
+    """
+    Render every result sheet and registration form of a program into one
+    zip archive, fanning the rendering out over ``workers`` processes.
+
+    The archive is written to ``out`` (a temporary file by default) together
+    with a ``report.csv`` of per-item timings and errors. Returns
+    ``(out, report)`` where ``report`` lists ``(kind, id, filename,
+    seconds, error)`` tuples in item order.
+    """
+    items = program_items(program, semester, session, kinds)
+    if out is None:
+        # Not a SpooledTemporaryFile: zipfile needs seekable(), which that
+        # class only gained in Python 3.11.
+        out = tempfile.TemporaryFile()
+
+    if workers > 1 and len(items) > 1:
+        # Forked workers must open their own database connections.
+        connections.close_all()
+        executor = ProcessPoolExecutor(max_workers=workers)
+        results = executor.map(render_item, items, chunksize=4)
+    else:
+        executor = None
+        results = map(render_item, items)
+
+    report = []
+    try:
+        with zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED) as archive:
+            for (kind, pk, _, _), filename, content, seconds, error in results:
+                if content is not None:
+                    archive.writestr(filename, content)
+                report.append((kind, pk, filename or "", seconds, error))
+            archive.writestr("report.csv", _report_csv(report))
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    out.seek(0)
+    return out, report
+
+
+def _report_csv(report):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(["kind", "id", "file", "seconds", "error"])
+    for kind, pk, filename, seconds, error in report:
+        writer.writerow([kind, pk, filename, f"{seconds:.3f}", error])
+    return buffer.getvalue()
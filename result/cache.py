@@ -0,0 +1,198 @@
+import hashlib
+import os
+import tempfile
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+
+class PDFCache:
+    """
+    A directory of rendered PDFs addressed by a hash of their inputs.
+
+    Entries are grouped by a namespace (e.g. one per course) so all the
+    variants of a document can be dropped at once. The directory is kept
+    under ``max_size`` bytes and entries older than ``max_age`` seconds are
+    discarded, least recently used first.
+    """
+
+    suffix = ".pdf"
+
+    def __init__(self, directory, max_size, max_age):
+        self.directory = directory
+        self.max_size = max_size
+        self.max_age = max_age
+
+    @staticmethod
+    def make_key(*parts):
+        digest = hashlib.sha256()
+        for part in parts:
+            digest.update(str(part).encode())
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def _path(self, namespace, key):
+        return os.path.join(self.directory, f"{namespace}-{key}{self.suffix}")
+
+    def get(self, namespace, key):
+        path = self._path(namespace, key)
+        try:
+            if time.time() - os.path.getmtime(path) > self.max_age:
+                os.remove(path)
+                return None
+            with open(path, "rb") as f:
+                content = f.read()
+        except FileNotFoundError:
+            return None
+        os.utime(path)  # mark as recently used for eviction
+        return content
+
+    def set(self, namespace, key, content):
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(content)
+        os.replace(tmp_path, self._path(namespace, key))
+        self.evict()
+
+    def invalidate(self, namespace):
+        prefix = f"{namespace}-"
+        for entry in self._entries():
+            if entry.name.startswith(prefix):
+                self._remove(entry.path)
+
+    def evict(self):
+        now = time.time()
+        entries = []
+        for entry in self._entries():
+            stat = entry.stat()
+            if now - stat.st_mtime > self.max_age:
+                self._remove(entry.path)
+            else:
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _mtime, size, _path in entries)
+        for _mtime, size, path in sorted(entries):
+            if total <= self.max_size:
+                break
+            self._remove(path)
+            total -= size
+
+    def _entries(self):
+        try:
+            with os.scandir(self.directory) as it:
+                return [e for e in it if e.name.endswith(self.suffix)]
+        except FileNotFoundError:
+            return []
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def result_sheet_cache():
+    return PDFCache(
+        settings.RESULT_SHEET_CACHE_DIR,
+        settings.RESULT_SHEET_CACHE_MAX_SIZE,
+        settings.RESULT_SHEET_CACHE_MAX_AGE,
+    )
+
+
+def result_sheet_namespace(course_id):
+    return f"result_sheet-{course_id}"
+
+
+def invalidate_result_sheets(course_ids=None):
+    """Drop the cached result sheets of the given courses (or all of them)."""
+    cache = result_sheet_cache()
+    if course_ids is None:
+        cache.invalidate("result_sheet")
+        return
+    for course_id in set(course_ids):
+        cache.invalidate(result_sheet_namespace(course_id))
+
+
+def cache_version(key):
+    """
+    The version token stored under ``key`` in the shared cache. A missing
+    token (never set, or evicted) is replaced by a fresh one, so processes
+    holding data compiled at an older token reload it. Returns None only
+    when the cache cannot store anything.
+    """
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, uuid.uuid4().hex, None)
+        version = cache.get(key)
+    return version
+
+
+COURSE_STATISTICS_GENERATION_KEY = "result:course_statistics_generation"
+
+
+def course_statistics_keys(course_ids):
+    """Map the cache key of each course's statistics to the course id."""
+    generation = cache.get(COURSE_STATISTICS_GENERATION_KEY, "")
+    return {f"result:course_statistics:{generation}:{pk}": pk for pk in course_ids}
+
+
+def invalidate_course_statistics(course_ids=None):
+    """Drop the cached statistics of the given courses (or all of them)."""
+    if course_ids is None:
+        cache.set(COURSE_STATISTICS_GENERATION_KEY, uuid.uuid4().hex, None)
+        return
+    cache.delete_many(list(course_statistics_keys(set(course_ids))))
+
+
+RANKINGS_GENERATION_KEY = "result:rankings_generation"
+
+
+def rankings_keys(periods):
+    """Map the cache key of each ``(semester, session)`` ranking to the period."""
+    generation = cache.get(RANKINGS_GENERATION_KEY, "")
+    return {
+        f"result:rankings:{generation}:{semester}:{session}": (semester, session)
+        for semester, session in periods
+    }
+
+
+def invalidate_rankings(periods=None):
+    """Drop the cached rankings of the given periods (or all of them)."""
+    if periods is None:
+        cache.set(RANKINGS_GENERATION_KEY, uuid.uuid4().hex, None)
+        return
+    cache.delete_many(list(rankings_keys(set(periods))))
+
+
+# Courses whose score changes await the commit of this thread's transaction.
+_changed_courses = threading.local()
+
+
+def invalidate_course_caches_on_commit(course_ids):
+    """
+    Drop the cached result sheets and statistics of ``course_ids`` once the
+    current transaction commits (at once outside a transaction), so no
+    reader can cache the data from before the change again. However many
+    rows of a course change, each course is invalidated once per commit.
+    """
+    pending = getattr(_changed_courses, "ids", None)
+    if pending is None:
+        pending = _changed_courses.ids = set()
+    pending.update(course_ids)
+    # Registered every time: a rolled back transaction drops its callback,
+    # and the courses it left pending are picked up by the next commit.
+    transaction.on_commit(_invalidate_changed_courses)
+
+
+def _invalidate_changed_courses():
+    course_ids = getattr(_changed_courses, "ids", None)
+    if not course_ids:
+        return
+    _changed_courses.ids = set()
+    invalidate_result_sheets(course_ids)
+    invalidate_course_statistics(course_ids)
@@ -0,0 +1,105 @@
+import csv
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .models import Result, TakenCourse
+from .utils import GRADED_FIELDS, SCORE_FIELDS
+
+# (column name, field) pairs of each dataset
+TAKEN_COURSE_COLUMNS = (
+    ("student", "student__student__username"),
+    ("course", "course__code"),
+    ("program", "course__program__title"),
+    ("level", "course__level"),
+    ("semester", "course__semester"),
+    ("credit", "course__credit"),
+    *((field, field) for field in SCORE_FIELDS + GRADED_FIELDS),
+)
+RESULT_COLUMNS = (
+    ("student", "student__student__username"),
+    ("program", "student__program__title"),
+    ("level", "level"),
+    ("semester", "semester"),
+    ("session", "session"),
+    ("gpa", "gpa"),
+    ("cgpa", "cgpa"),
+)
+
+CHUNK_SIZE = 2000
+ROWS_PER_WRITE = 500
+
+
+def taken_course_rows(course=None, program=None, level=None, semester=None):
+    queryset = TakenCourse.objects.all()
+    if course:
+        queryset = queryset.filter(course_id=course)
+    if program:
+        queryset = queryset.filter(course__program_id=program)
+    if level:
+        queryset = queryset.filter(course__level=level)
+    if semester:
+        queryset = queryset.filter(course__semester=semester)
+    return _rows(queryset, TAKEN_COURSE_COLUMNS)
+
+
+def result_rows(course=None, program=None, level=None, semester=None, session=None):
+    queryset = Result.objects.all()
+    if course:
+        queryset = queryset.filter(
+            student__in=TakenCourse.objects.filter(course_id=course).values("student")
+        )
+    if program:
+        queryset = queryset.filter(student__program_id=program)
+    if level:
+        queryset = queryset.filter(level=level)
+    if semester:
+        queryset = queryset.filter(semester=semester)
+    if session:
+        queryset = queryset.filter(session=session)
+    return _rows(queryset, RESULT_COLUMNS)
+
+
+def _rows(queryset, columns):
+    """
+    Return the header and a lazy iterator over the rows of ``queryset``,
+    fetched from the database ``CHUNK_SIZE`` rows at a time.
+    """
+    header = [name for name, _field in columns]
+    rows = (
+        queryset.order_by("pk")
+        .values_list(*[field for _name, field in columns])
+        .iterator(chunk_size=CHUNK_SIZE)
+    )
+    return header, rows
+
+
+class _Echo:
+    """A file-like object that hands back what csv.writer writes to it."""
+
+    def write(self, value):
+        return value
+
+
+def _batched(lines):
+    # One chunk per line would make the server flush tiny writes.
+    batch = []
+    for line in lines:
+        batch.append(line)
+        if len(batch) == ROWS_PER_WRITE:
+            yield "".join(batch)
+            batch = []
+    if batch:
+        yield "".join(batch)
+
+
+def stream_csv(header, rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(header)
+    yield from _batched(writer.writerow(row) for row in rows)
+
+
+def stream_ndjson(header, rows):
+    yield from _batched(
+        json.dumps(dict(zip(header, row)), cls=DjangoJSONEncoder) + "\n" for row in rows
+    )
@@ -0,0 +1,23 @@
+import os
+
+from django import forms
+
+from .imports import SUPPORTED_EXTENSIONS
+
+
+class ScoreImportForm(forms.Form):
+    file = forms.FileField(
+        help_text="A CSV or XLSX file with a username column and one column "
+        "per score (assignment, mid_exam, quiz, attendance, final_exam).",
+    )
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields["file"].widget.attrs.update({"class": "form-control"})
+
+    def clean_file(self):
+        file = self.cleaned_data["file"]
+        extension = os.path.splitext(file.name)[1].lower()
+        if extension not in SUPPORTED_EXTENSIONS:
+            raise forms.ValidationError("Upload a CSV or XLSX file.")
+        return file
@@ -0,0 +1,122 @@
+import csv
+import io
+import os
+import zipfile
+
+from .utils import SCORE_FIELDS, parse_score, score_course
+
+SUPPORTED_EXTENSIONS = (".csv", ".xlsx")
+
+
+def read_rows(uploaded_file):
+    """
+    Yield the rows of an uploaded CSV or XLSX file one at a time, so the
+    file is never held in memory as a whole. The first row is the header.
+    """
+    extension = os.path.splitext(uploaded_file.name)[1].lower()
+    if extension == ".csv":
+        text = io.TextIOWrapper(uploaded_file.file, encoding="utf-8-sig", newline="")
+        try:
+            yield from csv.reader(text)
+        except csv.Error as e:
+            raise ValueError(f"The file is not a valid CSV file: {e}") from e
+        finally:
+            text.detach()  # leave closing the upload to Django
+    elif extension == ".xlsx":
+        try:
+            from openpyxl import load_workbook
+            from openpyxl.utils.exceptions import InvalidFileException
+        except ImportError as e:
+            raise ValueError(
+                "XLSX files are not supported here, upload a CSV file."
+            ) from e
+        # A zip archive lacking the parts of a workbook fails with KeyError.
+        invalid = (zipfile.BadZipFile, InvalidFileException, KeyError)
+        try:
+            workbook = load_workbook(uploaded_file.file, read_only=True, data_only=True)
+        except invalid as e:
+            raise ValueError("The file is not a valid .xlsx file.") from e
+        try:
+            for row in workbook.active.iter_rows(values_only=True):
+                yield ["" if value is None else value for value in row]
+        except invalid as e:
+            raise ValueError("The file is not a valid .xlsx file.") from e
+        finally:
+            workbook.close()
+    else:
+        raise ValueError(
+            f"Unsupported file type '{extension}', expected one of "
+            + ", ".join(SUPPORTED_EXTENSIONS)
+        )
+
+
+def _column_name(cell):
+    return str(cell).strip().lower().replace(" ", "_").replace("-", "_")
+
+
+def _cell(row, index):
+    return str(row[index]).strip() if index < len(row) else ""
+
+
+def import_scores(course, uploaded_file, semester, session):
+    """
+    Apply a score sheet to the students of ``course``.
+
+    The sheet needs a ``username`` column and at least one of the score
+    columns (SCORE_FIELDS); scores that are missing or left blank keep
+    their current value. Valid rows are saved together by score_course.
+    Returns ``(updated, errors)`` where ``errors`` lists ``(line, username,
+    message)`` tuples; a ValueError is raised when the file itself is
+    unusable.
+    """
+    rows = read_rows(uploaded_file)
+    header = [_column_name(cell) for cell in next(rows, [])]
+    if "username" not in header:
+        raise ValueError("The first row must have a 'username' column.")
+    username_column = header.index("username")
+    columns = [
+        (position, header.index(field))
+        for position, field in enumerate(SCORE_FIELDS)
+        if field in header
+    ]
+    if not columns:
+        raise ValueError(
+            "The first row must have at least one of the columns "
+            + ", ".join(SCORE_FIELDS)
+        )
+
+    current = {
+        username: (pk, list(values))
+        for pk, username, *values in course.taken_courses.values_list(
+            "pk", "student__student__username", *SCORE_FIELDS
+        )
+    }
+    scores = {}
+    lines = {}
+    errors = []
+    for line, row in enumerate(rows, start=2):
+        if not any(str(cell).strip() for cell in row):
+            continue
+        username = _cell(row, username_column)
+        if username not in current:
+            errors.append((line, username, "student is not registered for this course"))
+            continue
+        pk, values = current[username]
+        if pk in scores:
+            errors.append((line, username, f"already given on line {lines[pk]}"))
+            continue
+        values = list(values)
+        try:
+            for position, index in columns:
+                value = _cell(row, index)
+                if value:
+                    values[position] = parse_score(value)
+        except ValueError as e:
+            errors.append((line, username, f"{SCORE_FIELDS[position]}: {e}"))
+            continue
+        scores[pk] = values
+        lines[pk] = line
+
+    updated, failed = score_course(course, scores, semester, session)
+    errors += [(lines.get(int(pk)), "", message) for pk, message in failed]
+    return updated, errors
@@ -0,0 +1,132 @@
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import connection
+from django.utils import timezone
+
+from core.models import Semester, Session
+from course.models import Course, Program
+from .bundles import build_program_bundle
+from .models import PDFJob, TakenCourse
+from .pdf import render_pdf
+from .views import (
+    REGISTRATION_FORM_LAYOUT,
+    RESULT_SHEET_LAYOUT,
+    registration_form_story,
+    result_sheet_story,
+)
+
+
+def render_registration_form(job):
+    session = Session.objects.get(pk=job.params["session"])
+    courses = TakenCourse.objects.filter(
+        student__student__id=job.owner_id
+    ).select_related("course")
+    story = registration_form_story(job.owner, courses, session)
+    filename = job.owner.username.replace("/", "-") + ".pdf"
+    return filename, render_pdf(story, **REGISTRATION_FORM_LAYOUT)
+
+
+def render_result_sheet(job):
+    course = Course.objects.get(pk=job.params["course"])
+    semester = Semester.objects.get(pk=job.params["semester"])
+    session = Session.objects.get(pk=job.params["session"])
+    rows = list(course.taken_courses.select_related("student__student").order_by("pk"))
+    lecturer_name = job.owner.get_full_name
+    story = result_sheet_story(course, rows, semester, session, lecturer_name)
+    filename = f"{semester}_semester_{session}_{course}_resultSheet.pdf"
+    return filename.replace("/", "-"), render_pdf(story, **RESULT_SHEET_LAYOUT)
+
+
+def render_program_bundle(job):
+    program = Program.objects.get(pk=job.params["program"])
+    semester = Semester.objects.get(pk=job.params["semester"])
+    session = Session.objects.get(pk=job.params["session"])
+    # Rendered in this worker: forking a pool from a run_pdf_workers process
+    # would hand its database connections and heartbeat thread to the pool.
+    archive, _report = build_program_bundle(program, semester, session, workers=1)
+    filename = f"{program}_{semester}_semester_{session}.zip"
+    return filename.replace("/", "-").replace(" ", "_"), archive
+
+
+RENDERERS = {
+    PDFJob.REGISTRATION_FORM: render_registration_form,
+    PDFJob.RESULT_SHEET: render_result_sheet,
+    PDFJob.PROGRAM_BUNDLE: render_program_bundle,
+}
+
+
+class Heartbeat(threading.Thread):
+    """
+    Refresh the heartbeat of a claimed job every PDF_JOB_HEARTBEAT_INTERVAL
+    seconds until stopped, so a long render is not taken for a dead worker.
+    """
+
+    def __init__(self, job):
+        super().__init__(daemon=True)
+        self.job = job
+        self.stopped = threading.Event()
+
+    def run(self):
+        try:
+            while not self.stopped.wait(settings.PDF_JOB_HEARTBEAT_INTERVAL):
+                if not PDFJob.objects.beat(self.job):
+                    return
+        finally:
+            connection.close()
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+
+
+def run_job(job):
+    """
+    Render a claimed job and store the outcome on it. Rendering errors are
+    recorded on the job rather than raised so a worker can carry on. The
+    outcome is only written while the job is still held under this claim;
+    a job requeued or failed in the meantime keeps its state and the
+    rendered file is discarded.
+    """
+    heartbeat = Heartbeat(job)
+    heartbeat.start()
+    try:
+        filename, pdf = RENDERERS[job.kind](job)
+        with pdf:
+            job.file.save(filename, ContentFile(pdf.read()), save=False)
+    except Exception as e:
+        job.status = PDFJob.FAILED
+        job.error = f"{type(e).__name__}: {e}"
+    else:
+        job.status = PDFJob.DONE
+        job.filename = filename
+    finally:
+        heartbeat.stop()
+    job.finished_at = timezone.now()
+    job.expires_at = job.finished_at + timedelta(seconds=settings.PDF_JOB_TTL)
+    recorded = PDFJob.objects.claimed(job).update(
+        status=job.status,
+        filename=job.filename,
+        file=job.file.name,
+        error=job.error,
+        finished_at=job.finished_at,
+        expires_at=job.expires_at,
+    )
+    if not recorded:
+        if job.file:
+            job.file.delete(save=False)
+        job.refresh_from_db()
+    return job
+
+
+def run_pending_jobs(limit=None):
+    """Claim and run jobs until the queue is empty. Returns the jobs run."""
+    done = []
+    while limit is None or len(done) < limit:
+        job = PDFJob.objects.claim()
+        if job is None:
+            break
+        done.append(run_job(job))
+    return done
@@ -0,0 +1,132 @@
+import time
+import tracemalloc
+from decimal import Decimal
+from types import SimpleNamespace
+
+from django.core.management.base import BaseCommand
+from reportlab.lib import colors
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.lib.units import inch
+from reportlab.platypus import Paragraph, Table, TableStyle
+
+from result.pdf import render_pdf
+from result.views import RESULT_SHEET_HEADER, RESULT_SHEET_LAYOUT, result_sheet_table
+
+GRADES = (
+    ("A", Decimal("12.00"), "PASS"),
+    ("C", Decimal("6.00"), "PASS"),
+    ("F", Decimal("0.00"), "FAIL"),
+)
+
+
+def fake_rows(count):
+    rows = []
+    for i in range(count):
+        grade, point, comment = GRADES[i % len(GRADES)]
+        # Every tenth name is long enough to wrap onto a second line.
+        name = f"Student {i}" + (" Abebe Kebede Tesfaye" if i % 10 == 0 else "")
+        user = SimpleNamespace(username=f"ugr/{i:05d}/24", get_full_name=name)
+        rows.append(
+            SimpleNamespace(
+                student=SimpleNamespace(student=user),
+                total=Decimal(40 + i % 60),
+                grade=grade,
+                point=point,
+                comment=comment,
+            )
+        )
+    return rows
+
+
+def legacy_story(result):
+    """The previous layout: one header table, then one table per student."""
+    styles = getSampleStyleSheet()
+    table_header = Table([RESULT_SHEET_HEADER], [inch], [0.5 * inch])
+    table_header.setStyle(
+        TableStyle(
+            [
+                ("BACKGROUND", (0, 0), (-1, -1), colors.black),
+                ("TEXTCOLOR", (1, 0), (-1, -1), colors.white),
+                ("TEXTCOLOR", (0, 0), (0, 0), colors.cyan),
+                ("ALIGN", (0, 0), (-1, -1), "CENTER"),
+                ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+                ("BOX", (0, 0), (-1, -1), 1, colors.black),
+            ]
+        )
+    )
+    story = [table_header]
+    for count, student in enumerate(result, 1):
+        data = [
+            (
+                count,
+                student.student.student.username.upper(),
+                Paragraph(
+                    student.student.student.get_full_name.capitalize(), styles["Normal"]
+                ),
+                student.total,
+                student.grade,
+                student.point,
+                student.comment,
+            )
+        ]
+        t_body = Table(data, colWidths=[inch])
+        t_body.setStyle(
+            TableStyle(
+                [
+                    ("INNERGRID", (0, 0), (-1, -1), 0.05, colors.black),
+                    ("BOX", (0, 0), (-1, -1), 0.1, colors.black),
+                ]
+            )
+        )
+        story.append(t_body)
+    return story
+
+
+RENDERERS = {
+    "per-row tables": legacy_story,
+    "single table": lambda rows: [result_sheet_table(rows)],
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare render time and peak memory of the single-table result sheet "
+        "layout against the previous one-table-per-student layout."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            type=int,
+            nargs="+",
+            default=[100, 1000, 5000],
+            help="Numbers of students to render (default: 100 1000 5000).",
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(
+            f"{'students':>8}  {'layout':<15} {'seconds':>8} {'peak MiB':>9} "
+            f"{'PDF KiB':>8}"
+        )
+        for size in options["sizes"]:
+            rows = fake_rows(size)
+            for name, build in RENDERERS.items():
+                # Time and memory are measured in separate runs because
+                # tracemalloc slows allocation-heavy code down severalfold.
+                started = time.perf_counter()
+                length = self.render(build, rows)
+                elapsed = time.perf_counter() - started
+
+                tracemalloc.start()
+                self.render(build, rows)
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                self.stdout.write(
+                    f"{size:>8}  {name:<15} {elapsed:>8.2f} "
+                    f"{peak / 2**20:>9.1f} {length / 2**10:>8.0f}"
+                )
+
+    @staticmethod
+    def render(build, rows):
+        with render_pdf(build(rows), **RESULT_SHEET_LAYOUT) as pdf:
+            return len(pdf.read())
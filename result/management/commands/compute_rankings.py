@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.models import Semester
+from result.cache import invalidate_rankings
+from result.rankings import rankings
+
+
+class Command(BaseCommand):
+    help = (
+        "Rank the students of every program and level for a semester and store "
+        "the ranking in the cache, e.g. right after the semester is finalized."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--semester",
+            type=int,
+            help="Id of the semester to rank (default: the current semester).",
+        )
+
+    def handle(self, *args, **options):
+        semesters = Semester.objects.select_related("session")
+        try:
+            if options["semester"] is None:
+                semester = semesters.get(is_current_semester=True)
+            else:
+                semester = semesters.get(pk=options["semester"])
+        except Semester.DoesNotExist:
+            raise CommandError("The semester does not exist.")
+        if semester.session is None:
+            raise CommandError(f"Semester {semester.pk} has no session.")
+
+        period = (semester.semester, str(semester.session))
+        invalidate_rankings([period])
+        ranked = rankings([period])[period]
+        cohorts = {(row["program"], row["level"]) for row in ranked.values()}
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Ranked {len(ranked)} student(s) in {len(cohorts)} program "
+                f"level(s) for the {period[0]} semester {period[1]}."
+            )
+        )
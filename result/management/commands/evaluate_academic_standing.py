@@ -0,0 +1,46 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.models import Semester
+from result.models import AcademicStanding
+from result.standing import evaluate_academic_standing
+
+
+class Command(BaseCommand):
+    help = (
+        "Compute the academic standing (good, warning, probation) of every "
+        "student from the results of a semester."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--semester",
+            type=int,
+            help="Id of the semester to evaluate (default: the current semester).",
+        )
+
+    def handle(self, *args, **options):
+        semesters = Semester.objects.select_related("session")
+        try:
+            if options["semester"] is None:
+                semester = semesters.get(is_current_semester=True)
+            else:
+                semester = semesters.get(pk=options["semester"])
+        except Semester.DoesNotExist:
+            raise CommandError("The semester does not exist.")
+        if semester.session is None:
+            raise CommandError(f"Semester {semester.pk} has no session.")
+
+        started = time.perf_counter()
+        counts = evaluate_academic_standing(semester.semester, semester.session)
+        elapsed = time.perf_counter() - started
+        labels = dict(AcademicStanding.STANDING_CHOICES)
+        for standing, count in counts.items():
+            self.stdout.write(f"{labels[standing]}: {count}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Evaluated {sum(counts.values())} student(s) for the "
+                f"{semester} semester {semester.session} in {elapsed:.2f}s."
+            )
+        )
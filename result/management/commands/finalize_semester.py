@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.models import Semester
+from result.utils import finalize_semester
+
+
+class Command(BaseCommand):
+    help = (
+        "Close a semester: compute every student's Result from the semester's "
+        "courses and freeze the rows under a snapshot."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--semester",
+            type=int,
+            help="Id of the semester to close (default: the current semester).",
+        )
+
+    def handle(self, *args, **options):
+        semesters = Semester.objects.select_related("session")
+        try:
+            if options["semester"] is None:
+                semester = semesters.get(is_current_semester=True)
+            else:
+                semester = semesters.get(pk=options["semester"])
+        except Semester.DoesNotExist:
+            raise CommandError("The semester does not exist.")
+        if semester.session is None:
+            raise CommandError(f"Semester {semester.pk} has no session.")
+
+        finalization = finalize_semester(semester)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Finalized {finalization}: {finalization.students} student(s), "
+                f"{finalization.courses} course(s)."
+            )
+        )
@@ -0,0 +1,79 @@
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.models import Semester, Session
+from course.models import Program
+from result.bundles import REGISTRATION_FORM, RESULT_SHEET, build_program_bundle
+
+
+class Command(BaseCommand):
+    help = (
+        "Render the result sheet of every course and the registration form of "
+        "every student in a program into a single zip archive."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("program", type=int, help="Id of the program.")
+        parser.add_argument(
+            "--output",
+            help="Path of the zip archive (default: program_<id>.zip).",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Number of rendering processes (default: number of CPUs).",
+        )
+        parser.add_argument(
+            "--only",
+            choices=[RESULT_SHEET, REGISTRATION_FORM],
+            help="Only render one kind of document.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            program = Program.objects.get(pk=options["program"])
+        except Program.DoesNotExist:
+            raise CommandError(f"Program {options['program']} does not exist.")
+        try:
+            semester = Semester.objects.get(is_current_semester=True)
+        except (Semester.DoesNotExist, Semester.MultipleObjectsReturned):
+            raise CommandError("There must be exactly one current semester.")
+        try:
+            session = Session.objects.get(is_current_session=True)
+        except (Session.DoesNotExist, Session.MultipleObjectsReturned):
+            raise CommandError("There must be exactly one current session.")
+        output = options["output"] or f"program_{program.pk}.zip"
+        kinds = [options["only"]] if options["only"] else None
+
+        started = time.perf_counter()
+        with open(output, "wb") as out:
+            _, report = build_program_bundle(
+                program,
+                semester,
+                session,
+                workers=options["workers"],
+                kinds=kinds,
+                out=out,
+            )
+        elapsed = time.perf_counter() - started
+
+        failures = [entry for entry in report if entry[4]]
+        for kind, pk, filename, seconds, error in report:
+            if error:
+                self.stdout.write(
+                    self.style.ERROR(f"FAILED {kind} {pk} ({seconds:.3f}s): {error}")
+                )
+            else:
+                self.stdout.write(f"{kind} {pk} -> {filename} ({seconds:.3f}s)")
+
+        summary = (
+            f"Rendered {len(report) - len(failures)} of {len(report)} document(s) "
+            f"into {output} in {elapsed:.2f}s."
+        )
+        if failures:
+            self.stdout.write(self.style.WARNING(f"{summary} {len(failures)} failed."))
+        else:
+            self.stdout.write(self.style.SUCCESS(summary))
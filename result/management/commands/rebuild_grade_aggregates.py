@@ -0,0 +1,57 @@
+from django.core.management.base import BaseCommand
+
+from result.models import GradeAggregate
+
+
+class Command(BaseCommand):
+    help = "Recompute per-student GPA aggregates from TakenCourse and report drift."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report drift, don't rewrite the stored aggregates.",
+        )
+        parser.add_argument(
+            "--student",
+            type=int,
+            action="append",
+            dest="student_ids",
+            help="Limit the rebuild to this student id (can be repeated).",
+        )
+        parser.add_argument(
+            "--show",
+            type=int,
+            default=20,
+            help="Number of drifted aggregates to list (default: 20).",
+        )
+
+    def handle(self, *args, **options):
+        drift = GradeAggregate.objects.rebuild(
+            student_ids=options["student_ids"], commit=not options["dry_run"]
+        )
+        for (student_id, level, semester), stored, expected in drift[: options["show"]]:
+            self.stdout.write(
+                f"student={student_id} level={level} semester={semester}: "
+                f"stored={self._format(stored)} expected={self._format(expected)}"
+            )
+        if len(drift) > options["show"]:
+            self.stdout.write(f"... and {len(drift) - options['show']} more")
+
+        if not drift:
+            self.stdout.write(self.style.SUCCESS("Aggregates are up to date."))
+        elif options["dry_run"]:
+            self.stdout.write(
+                self.style.WARNING(f"{len(drift)} aggregate(s) drifted (dry run).")
+            )
+        else:
+            self.stdout.write(
+                self.style.SUCCESS(f"Rebuilt {len(drift)} drifted aggregate(s).")
+            )
+
+    @staticmethod
+    def _format(totals):
+        if totals is None:
+            return "missing"
+        points, credits = totals
+        return f"{points} points / {credits} credits"
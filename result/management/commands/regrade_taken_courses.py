@@ -0,0 +1,155 @@
+import time
+from collections import Counter
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from result.cache import invalidate_course_statistics, invalidate_result_sheets
+from result.models import (
+    AssessmentScheme,
+    GradeAggregate,
+    GradingScheme,
+    Result,
+    TakenCourse,
+)
+from result.utils import GRADED_FIELDS, SCORE_FIELDS, grade_batch, weighted_totals
+
+ROW_FIELDS = (
+    (
+        "pk",
+        "student_id",
+        "course__credit",
+        "course__level",
+        "course__semester",
+        "course__program_id",
+        "course_id",
+    )
+    + SCORE_FIELDS
+    + GRADED_FIELDS
+)
+SCORES_START = 7
+GRADED_START = SCORES_START + len(SCORE_FIELDS)
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute total, grade, point and comment of every TakenCourse after "
+        "the grade boundaries, grade points or assessment weights have changed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=5000,
+            help="Number of rows read and written per batch (default: 5000).",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report what would change without writing anything.",
+        )
+        parser.add_argument(
+            "--show",
+            type=int,
+            default=20,
+            help="Number of changed rows to list (default: 20).",
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = options["chunk_size"]
+        dry_run = options["dry_run"]
+        tables = GradingScheme.objects.tables()
+        evaluators = AssessmentScheme.objects.evaluators()
+
+        scanned = changed = 0
+        transitions = Counter()
+        samples = []
+        started = time.perf_counter()
+        last_pk = 0
+        while True:
+            rows = list(
+                TakenCourse.objects.filter(pk__gt=last_pk)
+                .order_by("pk")
+                .values_list(*ROW_FIELDS)[:chunk_size]
+            )
+            if not rows:
+                break
+            last_pk = rows[-1][0]
+            scanned += len(rows)
+
+            columns = list(zip(*rows))
+            score_columns = columns[SCORES_START:GRADED_START]
+            row_tables = [
+                GradingScheme.objects.table_for(program_id, level, tables)
+                for level, program_id in zip(columns[3], columns[5])
+            ]
+            # Totals are computed column-wise per course, since every course
+            # may weigh its components differently.
+            by_course = {}
+            for index, course_id in enumerate(columns[6]):
+                by_course.setdefault(course_id, []).append(index)
+            totals = [None] * len(rows)
+            for course_id, indexes in by_course.items():
+                course_columns = [
+                    [column[i] for i in indexes] for column in score_columns
+                ]
+                evaluator = AssessmentScheme.objects.evaluator_for(
+                    course_id, evaluators
+                )
+                for i, total in zip(
+                    indexes, weighted_totals(course_columns, evaluator)
+                ):
+                    totals[i] = total
+            graded = grade_batch(totals, columns[2], row_tables)
+
+            updates = []
+            deltas = {}
+            for row, new in zip(rows, zip(*graded)):
+                old = row[GRADED_START:]
+                if tuple(old) == new:
+                    continue
+                pk, student_id, _credit, level, semester = row[:5]
+                transitions[(old[1], new[1])] += 1
+                if len(samples) < options["show"]:
+                    samples.append((pk, old, new))
+                updates.append(TakenCourse(pk=pk, **dict(zip(GRADED_FIELDS, new))))
+                key = (student_id, level, semester)
+                points, credits = deltas.get(key, (0, 0))
+                deltas[key] = (points + new[2] - old[2], credits)
+
+            changed += len(updates)
+            if updates and not dry_run:
+                with transaction.atomic():
+                    TakenCourse.objects.bulk_update(
+                        updates, GRADED_FIELDS, batch_size=1000
+                    )
+                    GradeAggregate.objects.apply_deltas(deltas)
+                    # Also drops the cached rankings of the refreshed periods.
+                    Result.objects.refresh_from_aggregates(
+                        {student_id for student_id, _level, _semester in deltas},
+                        {(level, semester) for _student_id, level, semester in deltas},
+                    )
+
+        if changed and not dry_run:
+            invalidate_result_sheets()
+            invalidate_course_statistics()
+        elapsed = time.perf_counter() - started
+        self.report(scanned, changed, transitions, samples, elapsed, dry_run)
+
+    def report(self, scanned, changed, transitions, samples, elapsed, dry_run):
+        for pk, old, new in samples:
+            self.stdout.write(
+                f"TakenCourse {pk}: total {old[0]} -> {new[0]}, "
+                f"grade {old[1] or '-'} -> {new[1]}, point {old[2]} -> {new[2]}, "
+                f"comment {old[3] or '-'} -> {new[3]}"
+            )
+        for (old_grade, new_grade), count in sorted(transitions.items()):
+            self.stdout.write(f"  {old_grade or '-'} -> {new_grade}: {count}")
+
+        rate = scanned / elapsed if elapsed else 0
+        self.stdout.write(
+            f"Scanned {scanned} rows in {elapsed:.2f}s ({rate:.0f} rows/s)."
+        )
+        verb = "would change" if dry_run else "changed"
+        self.stdout.write(self.style.SUCCESS(f"{changed} row(s) {verb}."))
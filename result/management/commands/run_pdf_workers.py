@@ -0,0 +1,77 @@
+import multiprocessing
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from result.jobs import run_job, run_pending_jobs
+from result.models import PDFJob
+
+
+def work(poll_interval, once):
+    while True:
+        PDFJob.objects.expire()
+        PDFJob.objects.recover_stale()
+        job = PDFJob.objects.claim()
+        if job is not None:
+            run_job(job)
+        elif once:
+            return
+        else:
+            time.sleep(poll_interval)
+
+
+class Command(BaseCommand):
+    help = (
+        "Render queued PDF jobs (registration forms, result sheets) in the background."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=settings.PDF_JOB_WORKERS,
+            help="Number of worker processes (default: PDF_JOB_WORKERS).",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=settings.PDF_JOB_POLL_INTERVAL,
+            help="Seconds to wait before checking an empty queue again.",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit once the queue is empty instead of polling for new jobs.",
+        )
+
+    def handle(self, *args, **options):
+        workers = max(options["workers"], 1)
+        if workers == 1:
+            if options["once"]:
+                PDFJob.objects.expire()
+                PDFJob.objects.recover_stale()
+                jobs = run_pending_jobs()
+                self.stdout.write(self.style.SUCCESS(f"Ran {len(jobs)} job(s)."))
+                return
+            work(options["poll_interval"], once=False)
+            return
+
+        # Forked workers must not share the parent's database connection.
+        connections.close_all()
+        processes = [
+            multiprocessing.Process(
+                target=work, args=(options["poll_interval"], options["once"])
+            )
+            for _ in range(workers)
+        ]
+        for process in processes:
+            process.start()
+        self.stdout.write(f"Started {workers} PDF worker(s).")
+        try:
+            for process in processes:
+                process.join()
+        except KeyboardInterrupt:
+            for process in processes:
+                process.terminate()
@@ -0,0 +1,99 @@
+# Generated by Django 4.0.8 on 2026-10-16 20:14
+
+from decimal import Decimal
+from django.db import migrations, models
+from django.db.models import Sum
+import django.db.models.deletion
+
+
+def build_grade_aggregates(apps, schema_editor):
+    TakenCourse = apps.get_model("result", "TakenCourse")
+    GradeAggregate = apps.get_model("result", "GradeAggregate")
+    rows = (
+        TakenCourse.objects.values_list(
+            "student_id", "course__level", "course__semester"
+        )
+        .annotate(points=Sum("point"), credits=Sum("course__credit"))
+        .order_by()
+    )
+    GradeAggregate.objects.bulk_create(
+        [
+            GradeAggregate(
+                student_id=student_id,
+                level=level,
+                semester=semester,
+                total_points=points,
+                total_credits=credits,
+            )
+            for student_id, level, semester, points, credits in rows
+        ],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0002_initial"),
+        ("result", "0002_alter_result_level_alter_takencourse_comment_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="GradeAggregate",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "level",
+                    models.CharField(
+                        choices=[
+                            ("Bachelor", "Bachelor Degree"),
+                            ("Master", "Master Degree"),
+                        ],
+                        max_length=25,
+                    ),
+                ),
+                (
+                    "semester",
+                    models.CharField(
+                        choices=[
+                            ("First", "First"),
+                            ("Second", "Second"),
+                            ("Third", "Third"),
+                        ],
+                        max_length=100,
+                    ),
+                ),
+                (
+                    "total_points",
+                    models.DecimalField(
+                        decimal_places=2, default=Decimal("0.00"), max_digits=12
+                    ),
+                ),
+                ("total_credits", models.IntegerField(default=0)),
+                (
+                    "student",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="grade_aggregates",
+                        to="accounts.student",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="gradeaggregate",
+            constraint=models.UniqueConstraint(
+                fields=("student", "level", "semester"), name="unique_grade_aggregate"
+            ),
+        ),
+        migrations.RunPython(build_grade_aggregates, migrations.RunPython.noop),
+    ]
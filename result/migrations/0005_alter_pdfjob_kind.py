@@ -0,0 +1,25 @@
+# Generated by Django 4.0.8 on 2026-10-16 20:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("result", "0004_pdfjob"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="pdfjob",
+            name="kind",
+            field=models.CharField(
+                choices=[
+                    ("registration_form", "Registration form"),
+                    ("result_sheet", "Result sheet"),
+                    ("program_bundle", "Program bundle (zip)"),
+                ],
+                max_length=30,
+            ),
+        ),
+    ]
@@ -0,0 +1,120 @@
+# Generated by Django 4.0.8 on 2026-10-16 20:31
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("course", "0004_alter_course_code_alter_course_credit_and_more"),
+        ("result", "0005_alter_pdfjob_kind"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="GradingScheme",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=100)),
+                (
+                    "level",
+                    models.CharField(
+                        blank=True,
+                        choices=[
+                            ("Bachelor", "Bachelor Degree"),
+                            ("Master", "Master Degree"),
+                        ],
+                        help_text="Leave empty to apply the scheme to every level.",
+                        max_length=25,
+                    ),
+                ),
+                (
+                    "program",
+                    models.ForeignKey(
+                        blank=True,
+                        help_text="Leave empty to apply the scheme to every program.",
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="grading_schemes",
+                        to="course.program",
+                    ),
+                ),
+            ],
+        ),
+        migrations.CreateModel(
+            name="GradeBoundary",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "grade",
+                    models.CharField(
+                        choices=[
+                            ("A+", "A+"),
+                            ("A", "A"),
+                            ("A-", "A-"),
+                            ("B+", "B+"),
+                            ("B", "B"),
+                            ("B-", "B-"),
+                            ("C+", "C+"),
+                            ("C", "C"),
+                            ("C-", "C-"),
+                            ("D", "D"),
+                            ("F", "F"),
+                            ("NG", "NG"),
+                        ],
+                        max_length=2,
+                    ),
+                ),
+                ("min_total", models.DecimalField(decimal_places=2, max_digits=5)),
+                ("point", models.DecimalField(decimal_places=2, max_digits=3)),
+                (
+                    "scheme",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="boundaries",
+                        to="result.gradingscheme",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-min_total"],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="gradingscheme",
+            constraint=models.UniqueConstraint(
+                fields=("program", "level"), name="unique_grading_scheme"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="gradingscheme",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("program__isnull", True)),
+                fields=("level",),
+                name="unique_global_grading_scheme",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="gradeboundary",
+            constraint=models.UniqueConstraint(
+                fields=("scheme", "grade"), name="unique_scheme_grade"
+            ),
+        ),
+    ]
@@ -0,0 +1,110 @@
+# Generated by Django 4.0.8 on 2026-10-16 20:40
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def remove_duplicate_results(apps, schema_editor):
+    """Keep only the latest Result of each student, semester, session and level."""
+    Result = apps.get_model("result", "Result")
+    latest = (
+        Result.objects.values("student", "semester", "session", "level")
+        .annotate(latest=models.Max("pk"), rows=models.Count("pk"))
+        .filter(rows__gt=1)
+        .order_by()
+    )
+    for group in latest:
+        Result.objects.filter(
+            student=group["student"],
+            semester=group["semester"],
+            session=group["session"],
+            level=group["level"],
+        ).exclude(pk=group["latest"]).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("result", "0006_gradingscheme"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SemesterFinalization",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "semester",
+                    models.CharField(
+                        choices=[
+                            ("First", "First"),
+                            ("Second", "Second"),
+                            ("Third", "Third"),
+                        ],
+                        max_length=100,
+                    ),
+                ),
+                ("session", models.CharField(max_length=100)),
+                ("finalized_at", models.DateTimeField(auto_now=True)),
+                ("students", models.PositiveIntegerField(default=0)),
+                ("courses", models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.AddField(
+            model_name="result",
+            name="total_credits",
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="result",
+            name="total_points",
+            field=models.DecimalField(
+                blank=True, decimal_places=2, max_digits=12, null=True
+            ),
+        ),
+        migrations.RunPython(remove_duplicate_results, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="result",
+            constraint=models.UniqueConstraint(
+                fields=("student", "semester", "session", "level"), name="unique_result"
+            ),
+        ),
+        migrations.AddField(
+            model_name="semesterfinalization",
+            name="finalized_by",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="+",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AddField(
+            model_name="result",
+            name="finalization",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="results",
+                to="result.semesterfinalization",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="semesterfinalization",
+            constraint=models.UniqueConstraint(
+                fields=("semester", "session"), name="unique_semester_finalization"
+            ),
+        ),
+    ]
@@ -0,0 +1,78 @@
+# Generated by Django 4.0.8 on 2026-10-16 20:46
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0002_initial"),
+        ("result", "0007_result_finalization"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AcademicStanding",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "semester",
+                    models.CharField(
+                        choices=[
+                            ("First", "First"),
+                            ("Second", "Second"),
+                            ("Third", "Third"),
+                        ],
+                        max_length=100,
+                    ),
+                ),
+                ("session", models.CharField(max_length=100)),
+                (
+                    "standing",
+                    models.CharField(
+                        choices=[
+                            ("good", "Good standing"),
+                            ("warning", "Academic warning"),
+                            ("probation", "Academic probation"),
+                        ],
+                        max_length=10,
+                    ),
+                ),
+                ("gpa", models.FloatField()),
+                ("cgpa", models.FloatField()),
+                ("failed_courses", models.PositiveSmallIntegerField(default=0)),
+                ("evaluated_at", models.DateTimeField()),
+                (
+                    "student",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="academic_standings",
+                        to="accounts.student",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="academicstanding",
+            index=models.Index(
+                fields=["semester", "session", "standing"],
+                name="result_acad_semeste_fe4d93_idx",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="academicstanding",
+            constraint=models.UniqueConstraint(
+                fields=("student", "semester", "session"),
+                name="unique_academic_standing",
+            ),
+        ),
+    ]
@@ -0,0 +1,104 @@
+# Generated by Django 4.0.8 on 2026-10-16 20:48
+
+from decimal import Decimal
+import django.core.validators
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("course", "0004_alter_course_code_alter_course_credit_and_more"),
+        ("result", "0008_academicstanding"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AssessmentScheme",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "course",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="assessment_scheme",
+                        to="course.course",
+                    ),
+                ),
+            ],
+        ),
+        migrations.CreateModel(
+            name="AssessmentComponent",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "component",
+                    models.CharField(
+                        choices=[
+                            ("assignment", "Assignment"),
+                            ("mid_exam", "Mid exam"),
+                            ("quiz", "Quiz"),
+                            ("attendance", "Attendance"),
+                            ("final_exam", "Final exam"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "weight",
+                    models.DecimalField(
+                        decimal_places=2,
+                        help_text="Points of the total this component is worth.",
+                        max_digits=5,
+                        validators=[
+                            django.core.validators.MinValueValidator(0),
+                            django.core.validators.MaxValueValidator(100),
+                        ],
+                    ),
+                ),
+                (
+                    "max_score",
+                    models.DecimalField(
+                        decimal_places=2,
+                        help_text="Highest score a student can get on this component.",
+                        max_digits=5,
+                        validators=[
+                            django.core.validators.MinValueValidator(Decimal("0.01")),
+                            django.core.validators.MaxValueValidator(Decimal("100")),
+                        ],
+                    ),
+                ),
+                (
+                    "scheme",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="components",
+                        to="result.assessmentscheme",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="assessmentcomponent",
+            constraint=models.UniqueConstraint(
+                fields=("scheme", "component"), name="unique_assessment_component"
+            ),
+        ),
+    ]
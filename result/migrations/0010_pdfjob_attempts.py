@@ -0,0 +1,18 @@
+# Generated by Django 4.0.8 on 2026-10-16 21:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("result", "0009_assessmentscheme"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="pdfjob",
+            name="attempts",
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+    ]
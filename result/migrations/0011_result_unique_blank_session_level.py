@@ -0,0 +1,50 @@
+# Generated by Django 4.0.8 on 2026-10-17 09:12
+
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def remove_duplicate_results(apps, schema_editor):
+    """
+    Keep only the latest Result of each student, semester, session and level,
+    counting a missing session or level as blank.
+    """
+    Result = apps.get_model("result", "Result")
+    seen = set()
+    duplicates = []
+    rows = Result.objects.order_by("-pk").values_list(
+        "pk", "student", "semester", "session", "level"
+    )
+    for pk, student, semester, session, level in rows.iterator():
+        key = (student, semester, session or "", level or "")
+        if key in seen:
+            duplicates.append(pk)
+        else:
+            seen.add(key)
+    for start in range(0, len(duplicates), 500):
+        Result.objects.filter(pk__in=duplicates[start : start + 500]).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("result", "0010_pdfjob_attempts"),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name="result",
+            name="unique_result",
+        ),
+        migrations.RunPython(remove_duplicate_results, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="result",
+            constraint=models.UniqueConstraint(
+                models.F("student"),
+                models.F("semester"),
+                Coalesce("session", models.Value("")),
+                Coalesce("level", models.Value("")),
+                name="unique_result",
+            ),
+        ),
+    ]
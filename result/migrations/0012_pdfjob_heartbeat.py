@@ -0,0 +1,30 @@
+# Generated by Django 4.0.8 on 2026-10-17 09:40
+
+from django.db import migrations, models
+
+
+def start_heartbeats(apps, schema_editor):
+    """Let jobs already running count as alive since they were claimed."""
+    PDFJob = apps.get_model("result", "PDFJob")
+    PDFJob.objects.filter(status="running").update(heartbeat_at=models.F("started_at"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("result", "0011_result_unique_blank_session_level"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="pdfjob",
+            name="claim_token",
+            field=models.UUIDField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="pdfjob",
+            name="heartbeat_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(start_heartbeats, migrations.RunPython.noop),
+    ]
@@ -1,12 +1,30 @@
-from decimal import Decimal
+import uuid
+from bisect import bisect_right
+from datetime import timedelta
+from decimal import ROUND_HALF_UP, Decimal
+from operator import mul
 from django.conf import settings
+from django.core.cache import cache
+from django.core.validators import MaxValueValidator, MinValueValidator
 
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Case, Sum, Value, When
+from django.db.models.functions import Coalesce
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
 from django.urls import reverse
+from django.utils import timezone
 
 from accounts.models import Student
-from core.models import Semester
-from course.models import Course
+from core.models import Semester, Session
+from course.models import Course, Program
+from .cache import (
+    cache_version,
+    invalidate_course_caches_on_commit,
+    invalidate_course_statistics,
+    invalidate_rankings,
+    invalidate_result_sheets,
+)
 
 A_PLUS = "A+"
 A = "A"
@@ -74,6 +92,300 @@ GRADE_POINT_MAPPING = {
 }
 
 
+def compile_grade_table(boundaries=None, points=None):
+    """
+    Turn ``(lower bound, grade)`` boundaries into ascending thresholds so a
+    grade can be found with a binary search instead of a linear scan.
+    """
+    boundaries = sorted(boundaries or GRADE_BOUNDARIES)
+    points = points or GRADE_POINT_MAPPING
+    thresholds = [Decimal(bound) for bound, _grade in boundaries]
+    grades = [grade for _bound, grade in boundaries]
+    return thresholds, grades, {g: Decimal(p) for g, p in points.items()}
+
+
+DEFAULT_GRADE_TABLE = compile_grade_table()
+
+
+def grade_from_table(total, table):
+    thresholds, grades, _points = table
+    position = bisect_right(thresholds, total)
+    return grades[position - 1] if position else NG
+
+
+def gpa_from_totals(total_points, total_credits):
+    """Divide accumulated grade points by credits, rounded like the result pages."""
+    if total_credits:
+        return round(Decimal(total_points) / Decimal(total_credits), 2)
+    return Decimal("0.00")
+
+
+# Compiled tables of every grading scheme, shared by all requests of this
+# process and reloaded once the version in the shared cache changes.
+_grading_tables = {"version": None, "tables": None}
+
+
+class GradingSchemeManager(models.Manager):
+    version_key = "result:grading_scheme_version"
+
+    def tables(self):
+        """Compiled grading tables keyed by ``(program id, level)``."""
+        version = cache_version(self.version_key)
+        if (
+            _grading_tables["tables"] is None
+            or version is None
+            or version != _grading_tables["version"]
+        ):
+            tables = {
+                (scheme.program_id, scheme.level): scheme.compile()
+                for scheme in self.prefetch_related("boundaries")
+            }
+            _grading_tables.update(version=version, tables=tables)
+        return _grading_tables["tables"]
+
+    def table_for(self, program_id, level, tables=None):
+        """
+        The grading table of a course: the scheme of its program and level,
+        else of its program, else of its level, else the default scale.
+        """
+        tables = self.tables() if tables is None else tables
+        for key in ((program_id, level), (program_id, ""), (None, level)):
+            if key in tables:
+                return tables[key]
+        return tables.get((None, ""), DEFAULT_GRADE_TABLE)
+
+    def invalidate(self):
+        _grading_tables["tables"] = None
+        cache.set(self.version_key, uuid.uuid4().hex, None)
+
+
+class GradingScheme(models.Model):
+    """
+    A grading scale used instead of the default one for the courses of a
+    program and/or level. Existing grades are not recomputed when a scheme
+    changes; run the ``regrade_taken_courses`` command for that.
+    """
+
+    name = models.CharField(max_length=100)
+    program = models.ForeignKey(
+        Program,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="grading_schemes",
+        help_text="Leave empty to apply the scheme to every program.",
+    )
+    level = models.CharField(
+        max_length=25,
+        choices=settings.LEVEL_CHOICES,
+        blank=True,
+        help_text="Leave empty to apply the scheme to every level.",
+    )
+
+    objects = GradingSchemeManager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["program", "level"], name="unique_grading_scheme"
+            ),
+            models.UniqueConstraint(
+                fields=["level"],
+                condition=models.Q(program__isnull=True),
+                name="unique_global_grading_scheme",
+            ),
+        ]
+
+    def __str__(self):
+        return self.name
+
+    def compile(self):
+        boundaries = self.boundaries.all()
+        return compile_grade_table(
+            [(boundary.min_total, boundary.grade) for boundary in boundaries],
+            {boundary.grade: boundary.point for boundary in boundaries},
+        )
+
+
+class GradeBoundary(models.Model):
+    scheme = models.ForeignKey(
+        GradingScheme, on_delete=models.CASCADE, related_name="boundaries"
+    )
+    grade = models.CharField(choices=GRADE_CHOICES, max_length=2)
+    min_total = models.DecimalField(max_digits=5, decimal_places=2)
+    point = models.DecimalField(max_digits=3, decimal_places=2)
+
+    class Meta:
+        ordering = ["-min_total"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["scheme", "grade"], name="unique_scheme_grade"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.grade} >= {self.min_total}"
+
+
+@receiver(post_save, sender=GradingScheme)
+@receiver(post_delete, sender=GradingScheme)
+@receiver(post_save, sender=GradeBoundary)
+@receiver(post_delete, sender=GradeBoundary)
+def invalidate_grading_tables(sender, **kwargs):
+    # Once now for this process and again after commit, so other processes
+    # cannot reload and keep the tables from before the change.
+    GradingScheme.objects.invalidate()
+    transaction.on_commit(GradingScheme.objects.invalidate)
+
+
+ASSIGNMENT = "assignment"
+MID_EXAM = "mid_exam"
+QUIZ = "quiz"
+ATTENDANCE = "attendance"
+FINAL_EXAM = "final_exam"
+
+SCORE_FIELDS = (ASSIGNMENT, MID_EXAM, QUIZ, ATTENDANCE, FINAL_EXAM)
+
+COMPONENT_CHOICES = (
+    (ASSIGNMENT, "Assignment"),
+    (MID_EXAM, "Mid exam"),
+    (QUIZ, "Quiz"),
+    (ATTENDANCE, "Attendance"),
+    (FINAL_EXAM, "Final exam"),
+)
+
+MAX_COMPONENT_SCORE = Decimal("100")
+TWO_PLACES = Decimal("0.01")
+
+
+def compile_assessment(components=None):
+    """
+    Turn ``{component: (weight, max score)}`` into per-component factors
+    (weight / max score) and maxima in SCORE_FIELDS order, so a total is a
+    plain weighted sum. Without components every score counts as entered.
+    """
+    if components is None:
+        return (Decimal("1"),) * len(SCORE_FIELDS), (MAX_COMPONENT_SCORE,) * len(
+            SCORE_FIELDS
+        )
+    factors = []
+    maxima = []
+    for field in SCORE_FIELDS:
+        weight, max_score = components.get(field, (Decimal("0"), Decimal("0")))
+        factors.append(Decimal(weight) / Decimal(max_score) if max_score else 0)
+        maxima.append(Decimal(max_score))
+    return tuple(factors), tuple(maxima)
+
+
+DEFAULT_ASSESSMENT = compile_assessment()
+
+
+def total_from_scores(scores, evaluator):
+    """Weighted total of one row of scores given in SCORE_FIELDS order."""
+    factors, _maxima = evaluator
+    total = sum(map(mul, scores, factors))
+    return Decimal(total).quantize(TWO_PLACES, ROUND_HALF_UP)
+
+
+# Compiled evaluators of every assessment scheme, shared like the grading
+# tables above.
+_assessment_evaluators = {"version": None, "evaluators": None}
+
+
+class AssessmentSchemeManager(models.Manager):
+    version_key = "result:assessment_scheme_version"
+
+    def evaluators(self):
+        """Compiled assessment evaluators keyed by course id."""
+        version = cache_version(self.version_key)
+        if (
+            _assessment_evaluators["evaluators"] is None
+            or version is None
+            or version != _assessment_evaluators["version"]
+        ):
+            evaluators = {
+                scheme.course_id: scheme.compile()
+                for scheme in self.prefetch_related("components")
+            }
+            _assessment_evaluators.update(version=version, evaluators=evaluators)
+        return _assessment_evaluators["evaluators"]
+
+    def evaluator_for(self, course_id, evaluators=None):
+        evaluators = self.evaluators() if evaluators is None else evaluators
+        return evaluators.get(course_id, DEFAULT_ASSESSMENT)
+
+    def invalidate(self):
+        _assessment_evaluators["evaluators"] = None
+        cache.set(self.version_key, uuid.uuid4().hex, None)
+
+
+class AssessmentScheme(models.Model):
+    """
+    How the component scores of a course add up to its total. Components
+    missing from a scheme don't count. Courses without a scheme simply sum
+    the components. Existing totals are not recomputed when a scheme
+    changes; run the ``regrade_taken_courses`` command for that.
+    """
+
+    course = models.OneToOneField(
+        Course, on_delete=models.CASCADE, related_name="assessment_scheme"
+    )
+
+    objects = AssessmentSchemeManager()
+
+    def __str__(self):
+        return f"Assessment of {self.course}"
+
+    def compile(self):
+        return compile_assessment(
+            {
+                component.component: (component.weight, component.max_score)
+                for component in self.components.all()
+            }
+        )
+
+
+class AssessmentComponent(models.Model):
+    scheme = models.ForeignKey(
+        AssessmentScheme, on_delete=models.CASCADE, related_name="components"
+    )
+    component = models.CharField(max_length=20, choices=COMPONENT_CHOICES)
+    weight = models.DecimalField(
+        max_digits=5,
+        decimal_places=2,
+        validators=[MinValueValidator(0), MaxValueValidator(100)],
+        help_text="Points of the total this component is worth.",
+    )
+    max_score = models.DecimalField(
+        max_digits=5,
+        decimal_places=2,
+        validators=[
+            MinValueValidator(Decimal("0.01")),
+            MaxValueValidator(MAX_COMPONENT_SCORE),
+        ],
+        help_text="Highest score a student can get on this component.",
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["scheme", "component"], name="unique_assessment_component"
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.get_component_display()}: {self.weight} / {self.max_score}"
+
+
+@receiver(post_save, sender=AssessmentScheme)
+@receiver(post_delete, sender=AssessmentScheme)
+@receiver(post_save, sender=AssessmentComponent)
+@receiver(post_delete, sender=AssessmentComponent)
+def invalidate_assessment_evaluators(sender, **kwargs):
+    AssessmentScheme.objects.invalidate()
+    transaction.on_commit(AssessmentScheme.objects.invalidate)
+
+
 class TakenCourse(models.Model):
     student = models.ForeignKey(Student, on_delete=models.CASCADE)
     course = models.ForeignKey(
@@ -111,70 +423,377 @@ class TakenCourse(models.Model):
     def __str__(self):
         return f"{self.course.title} ({self.course.code})"
 
-    def get_total(self):
-        return sum(
-            [
-                Decimal(self.assignment),
-                Decimal(self.mid_exam),
-                Decimal(self.quiz),
-                Decimal(self.attendance),
-                Decimal(self.final_exam),
-            ]
+    def get_total(self, evaluator=None):
+        return total_from_scores(
+            [Decimal(getattr(self, field)) for field in SCORE_FIELDS],
+            evaluator or self.assessment_evaluator(),
         )
 
-    def get_grade(self):
-        total = self.total
-        for boundary, grade in GRADE_BOUNDARIES:
-            if total >= boundary:
-                return grade
-        return NG
+    def assessment_evaluator(self):
+        return AssessmentScheme.objects.evaluator_for(self.course_id)
+
+    def grading_table(self):
+        return GradingScheme.objects.table_for(
+            self.course.program_id, self.course.level
+        )
+
+    def get_grade(self, table=None):
+        return grade_from_table(Decimal(self.total), table or self.grading_table())
 
     def get_comment(self):
         if self.grade in [F, NG]:
             return FAIL
         return PASS
 
-    def get_point(self):
+    def get_point(self, table=None):
         credit = self.course.credit
-        grade_point = GRADE_POINT_MAPPING.get(self.grade, 0.0)
-        return Decimal(credit) * Decimal(grade_point)
+        _thresholds, _grades, grade_points = table or self.grading_table()
+        grade_point = grade_points.get(self.grade, Decimal("0"))
+        return Decimal(credit) * grade_point
 
     def save(self, *args, **kwargs):
+        table = self.grading_table()
         self.total = self.get_total()
-        self.grade = self.get_grade()
-        self.point = self.get_point()
+        self.grade = self.get_grade(table)
+        self.point = self.get_point(table)
         self.comment = self.get_comment()
         super().save(*args, **kwargs)
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._remember_loaded_state()
+        return instance
+
+    def _remember_loaded_state(self):
+        # What the aggregates currently account for, used to compute deltas
+        self._loaded_student_id = self.__dict__.get("student_id")
+        self._loaded_course_id = self.__dict__.get("course_id")
+        self._loaded_point = self.__dict__.get("point")
+
+    def aggregate_key(self, course=None, student_id=None):
+        course = course or self.course
+        return (student_id or self.student_id, course.level, course.semester)
+
     def calculate_gpa(self):
         current_semester = Semester.objects.filter(is_current_semester=True).first()
         if not current_semester:
             return Decimal("0.00")
+        return GradeAggregate.objects.gpa(
+            self.student_id, self.student.level, current_semester.semester
+        )
+
+    def calculate_cgpa(self):
+        return GradeAggregate.objects.cgpa(self.student_id)
+
+
+@receiver(post_save, sender=TakenCourse)
+def update_grade_aggregate_on_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    loaded_course_id = getattr(instance, "_loaded_course_id", None)
+    if created:
+        deltas = {instance.aggregate_key(): (instance.point, instance.course.credit)}
+    elif loaded_course_id is None:
+        # Saved from an instance that was never loaded; we don't know the old
+        # values, so recount this student instead of guessing a delta.
+        GradeAggregate.objects.rebuild(student_ids=[instance.student_id])
+        instance._remember_loaded_state()
+        return
+    elif (loaded_course_id, instance._loaded_student_id) != (
+        instance.course_id,
+        instance.student_id,
+    ):
+        old_course = Course.objects.get(pk=loaded_course_id)
+        deltas = {
+            instance.aggregate_key(old_course, instance._loaded_student_id): (
+                -instance._loaded_point,
+                -old_course.credit,
+            )
+        }
+        key = instance.aggregate_key()
+        points, credits = deltas.get(key, (0, 0))
+        deltas[key] = (points + instance.point, credits + instance.course.credit)
+    else:
+        deltas = {
+            instance.aggregate_key(): (instance.point - instance._loaded_point, 0)
+        }
+    GradeAggregate.objects.apply_deltas(deltas)
+    instance._remember_loaded_state()
+
 
-        taken_courses = TakenCourse.objects.filter(
-            student=self.student,
-            course__level=self.student.level,
-            course__semester=current_semester.semester,
+@receiver(post_delete, sender=TakenCourse)
+def update_grade_aggregate_on_delete(sender, instance, **kwargs):
+    GradeAggregate.objects.apply_deltas(
+        {instance.aggregate_key(): (-instance.point, -instance.course.credit)},
+        create=False,
+    )
+
+
+@receiver(post_save, sender=TakenCourse)
+@receiver(post_delete, sender=TakenCourse)
+def invalidate_course_caches(sender, instance, raw=False, **kwargs):
+    if not raw:
+        invalidate_course_caches_on_commit([instance.course_id])
+
+
+class GradeAggregateManager(models.Manager):
+    def apply_deltas(self, deltas, create=True, batch_size=250):
+        """
+        Add ``(points, credits)`` deltas to the aggregates keyed by
+        ``(student_id, level, semester)``. Keys sharing a level and semester
+        are updated together with one UPDATE per ``batch_size`` students.
+        Missing rows are created first unless ``create`` is False.
+        """
+        groups = {}
+        for (student_id, level, semester), (points, credits) in deltas.items():
+            if points or credits:
+                groups.setdefault((level, semester), {})[student_id] = (
+                    Decimal(points),
+                    int(credits),
+                )
+        if not groups:
+            return
+        if create:
+            self.bulk_create(
+                [
+                    self.model(student_id=student_id, level=level, semester=semester)
+                    for (level, semester), students in groups.items()
+                    for student_id in students
+                ],
+                ignore_conflicts=True,
+                batch_size=500,
+            )
+        for (level, semester), students in groups.items():
+            items = list(students.items())
+            for start in range(0, len(items), batch_size):
+                batch = items[start : start + batch_size]
+                points = Case(
+                    *[When(student_id=pk, then=Value(p)) for pk, (p, _c) in batch],
+                    default=Value(Decimal("0.00")),
+                    output_field=models.DecimalField(max_digits=12, decimal_places=2),
+                )
+                credits = Case(
+                    *[When(student_id=pk, then=Value(c)) for pk, (_p, c) in batch],
+                    default=Value(0),
+                    output_field=models.IntegerField(),
+                )
+                self.filter(
+                    level=level,
+                    semester=semester,
+                    student_id__in=[pk for pk, _delta in batch],
+                ).update(
+                    total_points=models.F("total_points") + points,
+                    total_credits=models.F("total_credits") + credits,
+                )
+
+    def gpa(self, student_id, level, semester):
+        totals = (
+            self.filter(student_id=student_id, level=level, semester=semester)
+            .values_list("total_points", "total_credits")
+            .first()
         )
+        return gpa_from_totals(*totals) if totals else Decimal("0.00")
 
-        total_points = sum(tc.point for tc in taken_courses)
-        total_credits = sum(tc.course.credit for tc in taken_courses)
+    def cgpa(self, student_id):
+        totals = self.filter(student_id=student_id).aggregate(
+            points=Sum("total_points"), credits=Sum("total_credits")
+        )
+        return gpa_from_totals(totals["points"], totals["credits"])
 
-        if total_credits > 0:
-            gpa = total_points / Decimal(total_credits)
-            return round(gpa, 2)
-        return Decimal("0.00")
+    def expected_totals(self, student_ids=None):
+        """Recount aggregates from TakenCourse, keyed like ``apply_deltas``."""
+        taken_courses = TakenCourse.objects.all()
+        if student_ids is not None:
+            taken_courses = taken_courses.filter(student_id__in=student_ids)
+        rows = taken_courses.values_list(
+            "student_id", "course__level", "course__semester"
+        ).annotate(points=Sum("point"), credits=Sum("course__credit"))
+        return {
+            (student_id, level, semester): (points, credits)
+            for student_id, level, semester, points, credits in rows.order_by()
+        }
+
+    def rebuild(self, student_ids=None, commit=True):
+        """
+        Recompute aggregates from scratch and return the drift found as a
+        list of ``(key, stored, expected)`` tuples, where a missing side is
+        None. Stored rows are only rewritten when ``commit`` is True.
+        """
+        expected = self.expected_totals(student_ids)
+        aggregates = self.all()
+        if student_ids is not None:
+            aggregates = aggregates.filter(student_id__in=student_ids)
+        stored = {(agg.student_id, agg.level, agg.semester): agg for agg in aggregates}
+
+        drift = []
+        to_update = []
+        to_create = []
+        to_delete = []
+        for key, (points, credits) in expected.items():
+            aggregate = stored.get(key)
+            if aggregate is None:
+                drift.append((key, None, (points, credits)))
+                to_create.append(
+                    self.model(
+                        student_id=key[0],
+                        level=key[1],
+                        semester=key[2],
+                        total_points=points,
+                        total_credits=credits,
+                    )
+                )
+            elif (aggregate.total_points, aggregate.total_credits) != (points, credits):
+                drift.append(
+                    (
+                        key,
+                        (aggregate.total_points, aggregate.total_credits),
+                        (points, credits),
+                    )
+                )
+                aggregate.total_points = points
+                aggregate.total_credits = credits
+                to_update.append(aggregate)
+        for key, aggregate in stored.items():
+            if key not in expected and (
+                aggregate.total_points or aggregate.total_credits
+            ):
+                drift.append(
+                    (key, (aggregate.total_points, aggregate.total_credits), None)
+                )
+                to_delete.append(aggregate.pk)
+
+        if commit and drift:
+            with transaction.atomic():
+                self.bulk_update(
+                    to_update, ["total_points", "total_credits"], batch_size=500
+                )
+                self.bulk_create(to_create, batch_size=500)
+                self.filter(pk__in=to_delete).delete()
+        return drift
 
-    def calculate_cgpa(self):
-        taken_courses = TakenCourse.objects.filter(student=self.student)
 
-        total_points = sum(tc.point for tc in taken_courses)
-        total_credits = sum(tc.course.credit for tc in taken_courses)
+class GradeAggregate(models.Model):
+    """
+    Running sum of grade points and credits of a student's courses for one
+    level and semester, kept in step with TakenCourse so GPA/CGPA reads
+    don't have to scan the student's whole history.
+    """
 
-        if total_credits > 0:
-            cgpa = total_points / Decimal(total_credits)
-            return round(cgpa, 2)
-        return Decimal("0.00")
+    student = models.ForeignKey(
+        Student, on_delete=models.CASCADE, related_name="grade_aggregates"
+    )
+    level = models.CharField(max_length=25, choices=settings.LEVEL_CHOICES)
+    semester = models.CharField(max_length=100, choices=settings.SEMESTER_CHOICES)
+    total_points = models.DecimalField(
+        max_digits=12, decimal_places=2, default=Decimal("0.00")
+    )
+    total_credits = models.IntegerField(default=0)
+
+    objects = GradeAggregateManager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["student", "level", "semester"],
+                name="unique_grade_aggregate",
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.student} - {self.level} {self.semester}"
+
+    @property
+    def gpa(self):
+        return gpa_from_totals(self.total_points, self.total_credits)
+
+
+def result_key(result):
+    """The identity of a Result under the unique_result constraint."""
+    return (
+        result.student_id,
+        result.semester,
+        result.session or "",
+        result.level or "",
+    )
+
+
+class ResultManager(models.Manager):
+    def upsert(self, results, fields, include_finalized=False):
+        """
+        Insert unsaved ``results`` or update ``fields`` of the rows already
+        stored for the same student, semester, session and level (a missing
+        session or level matching a blank one, as in the unique_result
+        constraint). Rows of a finalized semester are left untouched unless
+        ``include_finalized``.
+        """
+        if not results:
+            return
+        self.bulk_create(results, ignore_conflicts=True, batch_size=500)
+        wanted = {result_key(r): r for r in results}
+        stored = self.alias(session_key=Coalesce("session", Value(""))).filter(
+            student_id__in={r.student_id for r in results},
+            semester__in={r.semester for r in results},
+            session_key__in={r.session or "" for r in results},
+        )
+        if not include_finalized:
+            stored = stored.filter(finalization__isnull=True)
+        to_update = []
+        for result in stored:
+            key = result_key(result)
+            if key in wanted:
+                for field in fields:
+                    setattr(result, field, getattr(wanted[key], field))
+                to_update.append(result)
+        self.bulk_update(to_update, fields, batch_size=500)
+        invalidate_rankings({(r.semester, r.session) for r in results})
+
+    def refresh_from_aggregates(self, student_ids, periods):
+        """
+        Recompute GPA/CGPA of the existing Result rows of ``student_ids``
+        whose ``(level, semester)`` is in ``periods`` from the grade
+        aggregates. ``student_ids`` may be a subquery. The aggregates sum a
+        student's whole history, so CGPA is only refreshed on rows of the
+        current session; rows of earlier sessions keep the CGPA of their
+        transcript. Rows of a finalized semester are left untouched.
+        Returns the number of rows updated.
+        """
+        gpas = {}
+        totals = {}
+        for aggregate in GradeAggregate.objects.filter(student_id__in=student_ids):
+            key = (aggregate.student_id, aggregate.level, aggregate.semester)
+            gpas[key] = aggregate.gpa
+            points, credits = totals.get(aggregate.student_id, (0, 0))
+            totals[aggregate.student_id] = (
+                points + aggregate.total_points,
+                credits + aggregate.total_credits,
+            )
+
+        results = list(
+            self.filter(
+                student_id__in=student_ids,
+                level__in={level for level, _semester in periods},
+                semester__in={semester for _level, semester in periods},
+                finalization__isnull=True,
+            )
+        )
+        current_session = (
+            Session.objects.filter(is_current_session=True)
+            .values_list("session", flat=True)
+            .first()
+        )
+        to_update = []
+        for result in results:
+            if (result.level, result.semester) not in periods:
+                continue
+            key = (result.student_id, result.level, result.semester)
+            result.gpa = gpas.get(key, Decimal("0.00"))
+            if current_session is not None and result.session == current_session:
+                result.cgpa = gpa_from_totals(*totals.get(result.student_id, (0, 0)))
+            to_update.append(result)
+        self.bulk_update(to_update, ["gpa", "cgpa"], batch_size=500)
+        invalidate_rankings({(r.semester, r.session) for r in to_update})
+        return len(to_update)
 
 
 class Result(models.Model):
@@ -184,6 +803,326 @@ class Result(models.Model):
     semester = models.CharField(max_length=100, choices=settings.SEMESTER_CHOICES)
     session = models.CharField(max_length=100, blank=True, null=True)
     level = models.CharField(max_length=25, choices=settings.LEVEL_CHOICES, null=True)
+    total_points = models.DecimalField(
+        max_digits=12, decimal_places=2, null=True, blank=True
+    )
+    total_credits = models.IntegerField(null=True, blank=True)
+    finalization = models.ForeignKey(
+        "SemesterFinalization",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="results",
+    )
+
+    objects = ResultManager()
+
+    class Meta:
+        constraints = [
+            # A missing session or level counts as blank, since NULLs never
+            # conflict in a plain unique constraint.
+            models.UniqueConstraint(
+                models.F("student"),
+                models.F("semester"),
+                Coalesce("session", Value("")),
+                Coalesce("level", Value("")),
+                name="unique_result",
+            )
+        ]
 
     def __str__(self):
         return f"Result for {self.student} - Semester: {self.semester}, Level: {self.level}"
+
+
+@receiver(post_save, sender=Result)
+@receiver(post_delete, sender=Result)
+def invalidate_result_rankings(sender, instance, raw=False, **kwargs):
+    if not raw:
+        invalidate_rankings([(instance.semester, instance.session)])
+
+
+class SemesterFinalization(models.Model):
+    """
+    Record of a closed semester. The Result rows it owns hold a snapshot of
+    the grades at closing time and are no longer refreshed by score edits.
+    """
+
+    semester = models.CharField(max_length=100, choices=settings.SEMESTER_CHOICES)
+    session = models.CharField(max_length=100)
+    finalized_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    finalized_at = models.DateTimeField(auto_now=True)
+    students = models.PositiveIntegerField(default=0)
+    courses = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["semester", "session"], name="unique_semester_finalization"
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.semester} semester {self.session}"
+
+
+@receiver(pre_save, sender=Course)
+def remember_course_grading_fields(sender, instance, raw=False, **kwargs):
+    instance._previous_grading_fields = None
+    if not raw and instance.pk is not None:
+        instance._previous_grading_fields = (
+            Course.objects.filter(pk=instance.pk)
+            .values_list("credit", "level", "semester", "program")
+            .first()
+        )
+
+
+@receiver(post_save, sender=Course)
+def propagate_course_grading_change(sender, instance, raw=False, **kwargs):
+    """
+    Grades, points, aggregates and results are denormalised from the
+    course's credit, level, semester and program. When one of them changes,
+    regrade with one set-based UPDATE and refresh only the impacted students.
+    """
+    previous = getattr(instance, "_previous_grading_fields", None)
+    if raw or previous is None:
+        return
+    credit = int(instance.credit)
+    current = (credit, instance.level, instance.semester, instance.program_id)
+    if current == previous:
+        return
+
+    tables = GradingScheme.objects.tables()
+    table = GradingScheme.objects.table_for(instance.program_id, instance.level, tables)
+    previous_table = GradingScheme.objects.table_for(previous[3], previous[1], tables)
+    thresholds, grades, grade_points = table
+    decimal_field = models.DecimalField(max_digits=5, decimal_places=2)
+    taken_courses = TakenCourse.objects.filter(course=instance)
+    student_ids = taken_courses.values("student_id")
+    with transaction.atomic():
+        if table != previous_table:
+            # Another grading scheme applies now: regrade the stored totals,
+            # highest band first like grade_from_table.
+            bands = list(zip(thresholds, grades))[::-1]
+            taken_courses.update(
+                grade=Case(
+                    *[When(total__gte=bound, then=Value(g)) for bound, g in bands],
+                    default=Value(NG),
+                ),
+                point=Case(
+                    *[
+                        When(
+                            total__gte=bound,
+                            then=Value(credit * grade_points.get(g, Decimal("0"))),
+                        )
+                        for bound, g in bands
+                    ],
+                    default=Value(credit * grade_points.get(NG, Decimal("0"))),
+                    output_field=decimal_field,
+                ),
+                comment=Case(
+                    *[
+                        When(
+                            total__gte=bound,
+                            then=Value(FAIL if g in (F, NG) else PASS),
+                        )
+                        for bound, g in bands
+                    ],
+                    default=Value(FAIL),
+                ),
+            )
+        elif credit != previous[0]:
+            taken_courses.update(
+                point=Case(
+                    *[
+                        When(grade=grade, then=Value(credit * point))
+                        for grade, point in grade_points.items()
+                    ],
+                    default=Value(Decimal("0.00")),
+                    output_field=decimal_field,
+                )
+            )
+        GradeAggregate.objects.rebuild(student_ids=student_ids)
+        Result.objects.refresh_from_aggregates(
+            student_ids, {previous[1:3], current[1:3]}
+        )
+    invalidate_result_sheets([instance.pk])
+    invalidate_course_statistics([instance.pk])
+
+
+class AcademicStanding(models.Model):
+    """
+    Standing of a student after the results of a semester, recomputed for
+    everyone at once by ``result.standing.evaluate_academic_standing``.
+    """
+
+    GOOD = "good"
+    WARNING = "warning"
+    PROBATION = "probation"
+    STANDING_CHOICES = (
+        (GOOD, "Good standing"),
+        (WARNING, "Academic warning"),
+        (PROBATION, "Academic probation"),
+    )
+
+    student = models.ForeignKey(
+        Student, on_delete=models.CASCADE, related_name="academic_standings"
+    )
+    semester = models.CharField(max_length=100, choices=settings.SEMESTER_CHOICES)
+    session = models.CharField(max_length=100)
+    standing = models.CharField(max_length=10, choices=STANDING_CHOICES)
+    gpa = models.FloatField()
+    cgpa = models.FloatField()
+    failed_courses = models.PositiveSmallIntegerField(default=0)
+    evaluated_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["student", "semester", "session"],
+                name="unique_academic_standing",
+            )
+        ]
+        indexes = [models.Index(fields=["semester", "session", "standing"])]
+
+    def __str__(self):
+        return f"{self.student} - {self.get_standing_display()} ({self.semester} {self.session})"
+
+
+class PDFJobManager(models.Manager):
+    def claim(self):
+        """
+        Hand the oldest pending job to the calling worker. The status change
+        is a conditional update so two workers can never claim the same job.
+        """
+        for pk in (
+            self.filter(status=PDFJob.PENDING)
+            .order_by("created_at")[:10]
+            .values_list("pk", flat=True)
+        ):
+            now = timezone.now()
+            claimed = self.filter(pk=pk, status=PDFJob.PENDING).update(
+                status=PDFJob.RUNNING,
+                claim_token=uuid.uuid4(),
+                started_at=now,
+                heartbeat_at=now,
+                attempts=models.F("attempts") + 1,
+            )
+            if claimed:
+                return self.get(pk=pk)
+        return None
+
+    def claimed(self, job):
+        """``job`` as long as it is still running under the caller's claim."""
+        return self.filter(
+            pk=job.pk, status=PDFJob.RUNNING, claim_token=job.claim_token
+        )
+
+    def beat(self, job):
+        """
+        Record that the worker holding ``job`` is still rendering it. Returns
+        False once the job has been requeued or failed in the meantime.
+        """
+        return bool(self.claimed(job).update(heartbeat_at=timezone.now()))
+
+    def stale(self):
+        """Running jobs without a heartbeat for PDF_JOB_TIMEOUT."""
+        cutoff = timezone.now() - timedelta(seconds=settings.PDF_JOB_TIMEOUT)
+        return self.filter(status=PDFJob.RUNNING, heartbeat_at__lte=cutoff)
+
+    def recover_stale(self):
+        """
+        Requeue jobs left running by a worker that died so another worker can
+        pick them up, or fail them once they have been claimed
+        PDF_JOB_MAX_ATTEMPTS times. Returns (requeued, failed).
+        """
+        now = timezone.now()
+        failed = (
+            self.stale()
+            .filter(attempts__gte=settings.PDF_JOB_MAX_ATTEMPTS)
+            .update(
+                status=PDFJob.FAILED,
+                claim_token=None,
+                error="The worker rendering this job stopped responding.",
+                finished_at=now,
+                expires_at=now + timedelta(seconds=settings.PDF_JOB_TTL),
+            )
+        )
+        requeued = self.stale().update(
+            status=PDFJob.PENDING,
+            claim_token=None,
+            started_at=None,
+            heartbeat_at=None,
+        )
+        return requeued, failed
+
+    def expired(self):
+        return self.filter(expires_at__lte=timezone.now())
+
+    def expire(self):
+        """Delete expired jobs together with their files."""
+        count = 0
+        for job in self.expired():
+            job.file.delete(save=False)
+            job.delete()
+            count += 1
+        return count
+
+
+class PDFJob(models.Model):
+    """A PDF rendered in the background by the ``run_pdf_workers`` command."""
+
+    REGISTRATION_FORM = "registration_form"
+    RESULT_SHEET = "result_sheet"
+    PROGRAM_BUNDLE = "program_bundle"
+    KIND_CHOICES = (
+        (REGISTRATION_FORM, "Registration form"),
+        (RESULT_SHEET, "Result sheet"),
+        (PROGRAM_BUNDLE, "Program bundle (zip)"),
+    )
+
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    STATUS_CHOICES = (
+        (PENDING, "Pending"),
+        (RUNNING, "Running"),
+        (DONE, "Done"),
+        (FAILED, "Failed"),
+    )
+
+    kind = models.CharField(max_length=30, choices=KIND_CHOICES)
+    params = models.JSONField(default=dict, blank=True)
+    owner = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="pdf_jobs"
+    )
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    filename = models.CharField(max_length=255, blank=True)
+    file = models.FileField(upload_to="pdf_jobs/", blank=True)
+    error = models.TextField(blank=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    # Set anew on every claim, so only the worker holding the current claim
+    # can record the outcome.
+    claim_token = models.UUIDField(null=True, blank=True, editable=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    expires_at = models.DateTimeField(null=True, blank=True)
+
+    objects = PDFJobManager()
+
+    class Meta:
+        indexes = [models.Index(fields=["status", "created_at"])]
+
+    def __str__(self):
+        return f"{self.get_kind_display()} #{self.pk} ({self.status})"
+
+    def get_absolute_url(self):
+        return reverse("pdf_job_status", kwargs={"pk": self.pk})
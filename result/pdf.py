@@ -0,0 +1,36 @@
+import io
+import tempfile
+
+from django.http import FileResponse
+from reportlab.platypus import SimpleDocTemplate
+
+# Documents up to this size are rendered entirely in memory; larger ones
+# roll over to an anonymous temporary file that is removed once closed.
+SPOOL_MAX_SIZE = 5 * 1024 * 1024
+
+
+def render_pdf(story, **layout):
+    """
+    Build a ReportLab story into a spooled buffer and return the buffer
+    rewound to the start. ``layout`` is passed on to SimpleDocTemplate.
+    """
+    buffer = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+    SimpleDocTemplate(buffer, **layout).build(story)
+    buffer.seek(0)
+    return buffer
+
+
+def pdf_response(pdf, filename):
+    """
+    Stream a PDF (a buffer returned by render_pdf or raw bytes) inline to
+    the browser. The buffer is closed once the response has been sent.
+    """
+    if isinstance(pdf, bytes):
+        pdf = io.BytesIO(pdf)
+    # FileResponse cannot size a SpooledTemporaryFile before Python 3.11.
+    pdf.seek(0, io.SEEK_END)
+    size = pdf.tell()
+    pdf.seek(0)
+    response = FileResponse(pdf, content_type="application/pdf", filename=filename)
+    response["Content-Length"] = size
+    return response
@@ -0,0 +1,103 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, F, Window
+from django.db.models.functions import PercentRank, Rank
+
+from .cache import rankings_keys
+from .models import Result
+
+ROW_FIELDS = (
+    "student_id",
+    "student__student__username",
+    "student__student__first_name",
+    "student__student__last_name",
+    "student__program_id",
+    "level",
+    "gpa",
+    "cgpa",
+    "rank",
+    "percentile",
+    "cohort",
+)
+
+
+def compute_rankings(semester, session):
+    """
+    Rank every student with a result for ``semester``/``session`` by GPA
+    within their program and level, using window functions so the whole
+    period is ranked in one query. Returns rows keyed by student id, in
+    program, level and rank order.
+    """
+    cohort = [F("student__program_id"), F("level")]
+    rows = (
+        Result.objects.filter(
+            semester=str(semester), session=str(session), gpa__isnull=False
+        )
+        .annotate(
+            rank=Window(Rank(), partition_by=cohort, order_by=F("gpa").desc()),
+            percentile=Window(
+                PercentRank(), partition_by=cohort, order_by=F("gpa").asc()
+            ),
+            cohort=Window(Count("pk"), partition_by=cohort),
+        )
+        .order_by("student__program_id", "level", "rank", "student_id")
+        .values_list(*ROW_FIELDS)
+    )
+    ranked = {}
+    for (
+        student_id,
+        username,
+        first_name,
+        last_name,
+        program_id,
+        level,
+        gpa,
+        cgpa,
+        rank,
+        percentile,
+        cohort_size,
+    ) in rows:
+        ranked[student_id] = {
+            "student": student_id,
+            "username": username,
+            "name": f"{first_name} {last_name}".strip(),
+            "program": program_id,
+            "level": level,
+            "gpa": gpa,
+            "cgpa": cgpa,
+            "rank": rank,
+            "cohort": cohort_size,
+            "percentile": round(100 * percentile, 1),
+        }
+    return ranked
+
+
+def rankings(periods):
+    """
+    Cached rankings keyed by ``(semester, session)`` as strings. Only the
+    periods missing from the cache are computed.
+    """
+    keys = rankings_keys(
+        {(str(semester), str(session)) for semester, session in periods}
+    )
+    cached = cache.get_many(keys)
+    found = {keys[key]: value for key, value in cached.items()}
+    missing = {key: period for key, period in keys.items() if key not in cached}
+    if missing:
+        computed = {key: compute_rankings(*period) for key, period in missing.items()}
+        cache.set_many(computed, settings.RANKINGS_CACHE_TIMEOUT)
+        found.update({missing[key]: value for key, value in computed.items()})
+    return found
+
+
+def deans_list(semester, session, program_id, level=None, top=None):
+    """The ``top`` ranked students of a program (and level) for one period."""
+    top = settings.DEANS_LIST_SIZE if top is None else top
+    period = (str(semester), str(session))
+    return [
+        row
+        for row in rankings([period])[period].values()
+        if row["program"] == program_id
+        and (level is None or row["level"] == level)
+        and row["rank"] <= top
+    ]
@@ -0,0 +1,78 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F
+from django.utils import timezone
+
+from .models import FAIL, AcademicStanding, Result, TakenCourse
+
+BATCH_SIZE = 2000
+
+
+def classify(gpa, cgpa, failed_courses):
+    if cgpa < settings.ACADEMIC_PROBATION_CGPA:
+        return AcademicStanding.PROBATION
+    if (
+        gpa < settings.ACADEMIC_WARNING_GPA
+        or failed_courses >= settings.ACADEMIC_WARNING_FAILED_COURSES
+    ):
+        return AcademicStanding.WARNING
+    return AcademicStanding.GOOD
+
+
+def evaluate_academic_standing(semester, session):
+    """
+    Recompute the standing of every student with a result for
+    ``semester``/``session`` in one pass: one query for the results, one
+    grouped query for the failed courses, and bulk inserts replacing the
+    previous evaluation of the period. Returns the number of students in
+    each standing.
+    """
+    semester, session = str(semester), str(session)
+    failed = dict(
+        TakenCourse.objects.filter(
+            comment=FAIL,
+            course__semester=semester,
+            course__level=F("student__level"),
+        )
+        .values_list("student_id")
+        .annotate(count=Count("pk"))
+        .order_by()
+    )
+    results = (
+        Result.objects.filter(
+            semester=semester,
+            session=session,
+            level=F("student__level"),
+            gpa__isnull=False,
+            cgpa__isnull=False,
+        )
+        .values_list("student_id", "gpa", "cgpa")
+        .order_by()
+    )
+
+    now = timezone.now()
+    counts = dict.fromkeys(dict(AcademicStanding.STANDING_CHOICES), 0)
+    with transaction.atomic():
+        AcademicStanding.objects.filter(semester=semester, session=session).delete()
+        batch = []
+        for student_id, gpa, cgpa in results.iterator(chunk_size=BATCH_SIZE):
+            failed_courses = failed.get(student_id, 0)
+            standing = classify(gpa, cgpa, failed_courses)
+            counts[standing] += 1
+            batch.append(
+                AcademicStanding(
+                    student_id=student_id,
+                    semester=semester,
+                    session=session,
+                    standing=standing,
+                    gpa=gpa,
+                    cgpa=cgpa,
+                    failed_courses=failed_courses,
+                    evaluated_at=now,
+                )
+            )
+            if len(batch) == BATCH_SIZE:
+                AcademicStanding.objects.bulk_create(batch)
+                batch = []
+        AcademicStanding.objects.bulk_create(batch)
+    return counts
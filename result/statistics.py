@@ -0,0 +1,99 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Avg, Count, Q, StdDev
+
+from .cache import course_statistics_keys
+from .models import GRADE_CHOICES, PASS, TakenCourse
+
+GRADES = [grade for grade, _label in GRADE_CHOICES]
+
+
+def _round(value):
+    return None if value is None else round(float(value), 2)
+
+
+def _median(values):
+    if not values:
+        return None
+    middle = len(values) // 2
+    if len(values) % 2:
+        return values[middle]
+    return (values[middle - 1] + values[middle]) / 2
+
+
+def _empty(course_id):
+    return {
+        "course": course_id,
+        "count": 0,
+        "mean": None,
+        "median": None,
+        "stddev": None,
+        "passed": 0,
+        "failed": 0,
+        "pass_rate": None,
+        "grades": dict.fromkeys(GRADES, 0),
+    }
+
+
+def compute_course_statistics(course_ids):
+    """
+    Class statistics of the given courses, computed with one aggregate
+    query for all of them plus one query for the medians.
+    """
+    statistics = {pk: _empty(pk) for pk in course_ids}
+    rows = (
+        TakenCourse.objects.filter(course_id__in=course_ids)
+        .values("course_id")
+        .order_by()
+        .annotate(
+            count=Count("pk"),
+            mean=Avg("total"),
+            stddev=StdDev("total"),
+            passed=Count("pk", filter=Q(comment=PASS)),
+            **{
+                f"grade_{i}": Count("pk", filter=Q(grade=grade))
+                for i, grade in enumerate(GRADES)
+            },
+        )
+    )
+    for row in rows:
+        stats = statistics[row["course_id"]]
+        stats.update(
+            count=row["count"],
+            mean=_round(row["mean"]),
+            stddev=_round(row["stddev"]),
+            passed=row["passed"],
+            failed=row["count"] - row["passed"],
+            pass_rate=_round(100 * row["passed"] / row["count"]),
+            grades={grade: row[f"grade_{i}"] for i, grade in enumerate(GRADES)},
+        )
+
+    totals = {pk: [] for pk in course_ids}
+    for course_id, total in (
+        TakenCourse.objects.filter(course_id__in=course_ids)
+        .order_by("course_id", "total")
+        .values_list("course_id", "total")
+    ):
+        totals[course_id].append(total)
+    for pk, values in totals.items():
+        statistics[pk]["median"] = _round(_median(values))
+    return statistics
+
+
+def course_statistics(course_ids):
+    """
+    Cached class statistics keyed by course id. Only the courses missing
+    from the cache are computed, together.
+    """
+    keys = course_statistics_keys(course_ids)
+    cached = cache.get_many(keys)
+    statistics = {keys[key]: value for key, value in cached.items()}
+    missing = [pk for key, pk in keys.items() if key not in cached]
+    if missing:
+        computed = compute_course_statistics(missing)
+        cache.set_many(
+            {key: computed[pk] for key, pk in keys.items() if pk in computed},
+            settings.COURSE_STATISTICS_CACHE_TIMEOUT,
+        )
+        statistics.update(computed)
+    return statistics
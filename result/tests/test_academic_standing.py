@@ -0,0 +1,104 @@
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from accounts.models import Student, User
+from core.models import Semester, Session
+from course.models import Course, Program
+from result.models import AcademicStanding, Result, TakenCourse
+from result.standing import evaluate_academic_standing
+
+
+@override_settings(
+    ACADEMIC_PROBATION_CGPA=2.0,
+    ACADEMIC_WARNING_GPA=2.5,
+    ACADEMIC_WARNING_FAILED_COURSES=2,
+)
+class AcademicStandingTest(TestCase):
+    def setUp(self):
+        session = Session.objects.create(session="2024-2025", is_current_session=True)
+        Semester.objects.create(
+            semester="First", is_current_semester=True, session=session
+        )
+        self.program = Program.objects.create(title="Computer Science")
+        self.courses = [
+            Course.objects.create(
+                title=f"CS20{i}",
+                code=f"CS20{i}",
+                credit=3,
+                semester="First",
+                level="Bachelor",
+                program=self.program,
+            )
+            for i in range(3)
+        ]
+
+    def add_student(self, name, gpa, cgpa, failed=0):
+        user = User.objects.create_user(username=name)
+        student = Student.objects.create(
+            student=user, program=self.program, level="Bachelor"
+        )
+        for i, course in enumerate(self.courses):
+            TakenCourse.objects.create(
+                student=student,
+                course=course,
+                final_exam=Decimal("10" if i < failed else "80"),
+            )
+        Result.objects.create(
+            student=student,
+            gpa=gpa,
+            cgpa=cgpa,
+            semester="First",
+            session="2024-2025",
+            level="Bachelor",
+        )
+        return student
+
+    def standing(self, student):
+        return AcademicStanding.objects.get(student=student).standing
+
+    def test_classifies_every_student(self):
+        good = self.add_student("good", 3.5, 3.4, failed=1)
+        low_gpa = self.add_student("low_gpa", 2.2, 3.0)
+        failing = self.add_student("failing", 3.0, 3.0, failed=2)
+        probation = self.add_student("probation", 3.0, 1.9)
+
+        counts = evaluate_academic_standing("First", "2024-2025")
+
+        self.assertEqual(counts, {"good": 1, "warning": 2, "probation": 1})
+        self.assertEqual(self.standing(good), AcademicStanding.GOOD)
+        self.assertEqual(self.standing(low_gpa), AcademicStanding.WARNING)
+        self.assertEqual(self.standing(failing), AcademicStanding.WARNING)
+        self.assertEqual(self.standing(probation), AcademicStanding.PROBATION)
+        self.assertEqual(
+            AcademicStanding.objects.get(student=failing).failed_courses, 2
+        )
+
+    def test_reevaluation_replaces_previous_standing(self):
+        student = self.add_student("student", 3.0, 1.5)
+        evaluate_academic_standing("First", "2024-2025")
+        Result.objects.filter(student=student).update(cgpa=3.0)
+        evaluate_academic_standing("First", "2024-2025")
+        self.assertEqual(AcademicStanding.objects.count(), 1)
+        self.assertEqual(self.standing(student), AcademicStanding.GOOD)
+
+    def test_query_count_does_not_grow_with_students(self):
+        self.add_student("a", 3.0, 3.0)
+        with CaptureQueriesContext(connection) as few:
+            evaluate_academic_standing("First", "2024-2025")
+        for i in range(10):
+            self.add_student(f"student{i}", 1.0, 1.0, failed=i % 3)
+        with CaptureQueriesContext(connection) as many:
+            evaluate_academic_standing("First", "2024-2025")
+        self.assertEqual(len(few), len(many))
+
+    def test_command(self):
+        self.add_student("student", 3.0, 1.5)
+        out = StringIO()
+        call_command("evaluate_academic_standing", stdout=out)
+        self.assertIn("Academic probation: 1", out.getvalue())
+        self.assertIn("Evaluated 1 student(s)", out.getvalue())
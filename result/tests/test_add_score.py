@@ -0,0 +1,133 @@
+from decimal import Decimal
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+
+from accounts.models import Student
+from core.models import Semester, Session
+from course.models import Course, CourseAllocation, Program
+from result.models import Result, TakenCourse
+
+User = get_user_model()
+
+
+@override_settings(
+    STATICFILES_STORAGE="django.contrib.staticfiles.storage.StaticFilesStorage",
+    MIDDLEWARE=[
+        m
+        for m in settings.MIDDLEWARE
+        if m
+        not in [
+            "django.middleware.locale.LocaleMiddleware",
+            "whitenoise.middleware.WhiteNoiseMiddleware",
+        ]
+    ],
+    LANGUAGE_CODE="en-us",
+)
+class AddScoreForViewTest(TestCase):
+    def setUp(self):
+        self.lecturer = User.objects.create_user(
+            username="lecturer", password="testpass123", is_lecturer=True
+        )
+        self.client = Client()
+        self.client.force_login(self.lecturer)
+
+        self.session = Session.objects.create(
+            session="2024-2025", is_current_session=True
+        )
+        self.semester = Semester.objects.create(
+            semester="First", is_current_semester=True, session=self.session
+        )
+        self.program = Program.objects.create(title="Computer Science")
+        self.course = Course.objects.create(
+            title="Algorithms",
+            code="CS201",
+            credit=3,
+            semester="First",
+            level="Bachelor",
+            program=self.program,
+        )
+        allocation = CourseAllocation.objects.create(
+            lecturer=self.lecturer, session=self.session
+        )
+        allocation.courses.add(self.course)
+
+    def enroll(self, count, prefix="student"):
+        taken = []
+        for i in range(count):
+            user = User.objects.create_user(username=f"{prefix}{i}")
+            student = Student.objects.create(
+                student=user, program=self.program, level="Bachelor"
+            )
+            taken.append(
+                TakenCourse.objects.create(student=student, course=self.course)
+            )
+        return taken
+
+    def post_scores(self, scores):
+        return self.client.post(
+            reverse("add_score_for", kwargs={"id": self.course.pk}), scores
+        )
+
+    def test_scores_are_graded_and_results_created(self):
+        first, second = self.enroll(2)
+        response = self.post_scores(
+            {
+                str(first.pk): ["10", "20", "10", "10", "40"],
+                str(second.pk): ["5", "5", "5", "5", "10"],
+            }
+        )
+        self.assertEqual(response.status_code, 302)
+
+        first.refresh_from_db()
+        self.assertEqual(first.total, Decimal("90.00"))
+        self.assertEqual(first.grade, "A+")
+        self.assertEqual(first.point, Decimal("12.00"))
+        self.assertEqual(first.comment, "PASS")
+        second.refresh_from_db()
+        self.assertEqual(second.grade, "F")
+        self.assertEqual(second.comment, "FAIL")
+
+        result = Result.objects.get(student=first.student)
+        self.assertEqual(result.gpa, 4.0)
+        self.assertEqual(result.cgpa, 4.0)
+        self.assertEqual(result.semester, "First")
+        self.assertEqual(result.session, "2024-2025")
+
+    def test_existing_result_is_updated(self):
+        (taken,) = self.enroll(1)
+        self.post_scores({str(taken.pk): ["10", "10", "10", "10", "30"]})
+        self.post_scores({str(taken.pk): ["10", "20", "10", "10", "40"]})
+        results = Result.objects.filter(student=taken.student)
+        self.assertEqual(results.count(), 1)
+        self.assertEqual(results.get().gpa, 4.0)
+
+    def test_invalid_scores_are_reported_and_skipped(self):
+        valid, invalid = self.enroll(2)
+        response = self.post_scores(
+            {
+                str(valid.pk): ["10", "20", "10", "10", "40"],
+                str(invalid.pk): ["abc", "20", "10", "10", "40"],
+            }
+        )
+        messages = [str(m) for m in response.wsgi_request._messages]
+        self.assertTrue(any("student1" in m for m in messages))
+        invalid.refresh_from_db()
+        self.assertEqual(invalid.total, Decimal("0.00"))
+        valid.refresh_from_db()
+        self.assertEqual(valid.total, Decimal("90.00"))
+
+    def test_query_count_does_not_grow_with_class_size(self):
+        def count_queries(taken):
+            scores = {str(tc.pk): ["10", "20", "10", "10", "40"] for tc in taken}
+            with CaptureQueriesContext(connection) as ctx:
+                self.post_scores(scores)
+            return len(ctx.captured_queries)
+
+        small = count_queries(self.enroll(2))
+        large = count_queries(self.enroll(20, prefix="other"))
+        self.assertEqual(small, large)
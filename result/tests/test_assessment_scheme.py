@@ -0,0 +1,132 @@
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+
+from accounts.models import Student
+from core.models import Semester, Session
+from course.models import Course, Program
+from result.models import AssessmentComponent, AssessmentScheme, TakenCourse
+from result.utils import score_course
+
+User = get_user_model()
+
+
+class AssessmentSchemeTest(TestCase):
+    def setUp(self):
+        self.addCleanup(AssessmentScheme.objects.invalidate)
+        self.session = Session.objects.create(
+            session="2024-2025", is_current_session=True
+        )
+        self.semester = Semester.objects.create(
+            semester="First", is_current_semester=True, session=self.session
+        )
+        self.program = Program.objects.create(title="Computer Science")
+        self.course = Course.objects.create(
+            title="Algorithms",
+            code="CS201",
+            credit=3,
+            semester="First",
+            level="Bachelor",
+            program=self.program,
+        )
+        self.student = Student.objects.create(
+            student=User.objects.create_user(username="student"),
+            program=self.program,
+            level="Bachelor",
+        )
+
+    def make_scheme(self, course=None):
+        # The mid exam is marked out of 50 and worth 40 points, the final
+        # exam is worth 60 points; the other components don't count.
+        scheme = AssessmentScheme.objects.create(course=course or self.course)
+        AssessmentComponent.objects.create(
+            scheme=scheme, component="mid_exam", weight=40, max_score=50
+        )
+        AssessmentComponent.objects.create(
+            scheme=scheme, component="final_exam", weight=60, max_score=100
+        )
+        return scheme
+
+    def take(self, **scores):
+        return TakenCourse.objects.create(
+            student=self.student, course=self.course, **scores
+        )
+
+    def test_components_are_summed_without_scheme(self):
+        taken = self.take(assignment=Decimal("10"), final_exam=Decimal("60"))
+        self.assertEqual(taken.total, Decimal("70.00"))
+
+    def test_save_uses_weights(self):
+        self.make_scheme()
+        taken = self.take(
+            assignment=Decimal("10"), mid_exam=Decimal("45"), final_exam=Decimal("80")
+        )
+        # 45 / 50 * 40 + 80 / 100 * 60
+        self.assertEqual(taken.total, Decimal("84.00"))
+        self.assertEqual(taken.grade, "A-")
+
+    def test_bulk_entry_uses_weights_and_maxima(self):
+        self.make_scheme()
+        taken = self.take()
+        other = TakenCourse.objects.create(
+            student=Student.objects.create(
+                student=User.objects.create_user(username="other"),
+                program=self.program,
+                level="Bachelor",
+            ),
+            course=self.course,
+        )
+        updated, errors = score_course(
+            self.course,
+            {
+                str(taken.pk): ["0", "33", "0", "0", "70"],
+                str(other.pk): ["0", "60", "0", "0", "70"],
+            },
+            self.semester,
+            self.session,
+        )
+        self.assertEqual(updated, 1)
+        self.assertEqual(
+            errors, [(str(other.pk), "other: mid_exam must not be more than 50.00")]
+        )
+        taken.refresh_from_db()
+        # 33 / 50 * 40 + 70 / 100 * 60 = 26.4 + 42
+        self.assertEqual(taken.total, Decimal("68.40"))
+        self.assertEqual(taken.grade, "B-")
+
+    def test_evaluators_are_cached_and_invalidated(self):
+        scheme = self.make_scheme()
+        AssessmentScheme.objects.evaluators()
+        with self.assertNumQueries(0):
+            AssessmentScheme.objects.evaluator_for(self.course.pk)
+
+        component = scheme.components.get(component="final_exam")
+        component.weight = 30
+        component.save()
+        taken = self.take(mid_exam=Decimal("50"), final_exam=Decimal("100"))
+        self.assertEqual(taken.total, Decimal("70.00"))
+
+    def test_evaluators_are_reloaded_when_the_version_is_evicted(self):
+        scheme = self.make_scheme()
+        cache.delete(AssessmentScheme.objects.version_key)
+        AssessmentScheme.objects.evaluators()
+
+        # Another process changes the scheme, then its new version is evicted.
+        scheme.components.filter(component="final_exam").update(weight=30)
+        cache.set(AssessmentScheme.objects.version_key, "changed", None)
+        cache.delete(AssessmentScheme.objects.version_key)
+        taken = self.take(mid_exam=Decimal("50"), final_exam=Decimal("100"))
+        self.assertEqual(taken.total, Decimal("70.00"))
+
+    def test_regrade_applies_new_scheme(self):
+        taken = self.take(assignment=Decimal("20"), final_exam=Decimal("50"))
+        self.assertEqual(taken.total, Decimal("70.00"))
+        self.make_scheme()
+        call_command("regrade_taken_courses", stdout=StringIO())
+        taken.refresh_from_db()
+        self.assertEqual(taken.total, Decimal("30.00"))
+        self.assertEqual(taken.grade, "F")
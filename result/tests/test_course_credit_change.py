@@ -0,0 +1,150 @@
+from decimal import Decimal
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from accounts.models import Student, User
+from core.models import Semester, Session
+from course.models import Course, Program
+from result.models import (
+    GradeAggregate,
+    GradeBoundary,
+    GradingScheme,
+    Result,
+    TakenCourse,
+)
+
+
+class CourseCreditChangeTest(TestCase):
+    def setUp(self):
+        session = Session.objects.create(session="2024-2025", is_current_session=True)
+        Semester.objects.create(
+            semester="First", is_current_semester=True, session=session
+        )
+        self.program = Program.objects.create(title="Computer Science")
+        self.algorithms = self.make_course("CS201", 3)
+        self.databases = self.make_course("CS202", 2)
+        self.students = []
+
+    def make_course(self, code, credit):
+        return Course.objects.create(
+            title=code,
+            code=code,
+            credit=credit,
+            semester="First",
+            level="Bachelor",
+            program=self.program,
+        )
+
+    def enroll(self, count):
+        for i in range(len(self.students), len(self.students) + count):
+            user = User.objects.create_user(username=f"student{i}")
+            student = Student.objects.create(
+                student=user, program=self.program, level="Bachelor"
+            )
+            TakenCourse.objects.create(
+                student=student, course=self.algorithms, final_exam=Decimal("90")
+            )
+            TakenCourse.objects.create(
+                student=student, course=self.databases, final_exam=Decimal("70")
+            )
+            Result.objects.create(
+                student=student,
+                gpa=3.6,
+                cgpa=3.6,
+                semester="First",
+                session="2024-2025",
+                level="Bachelor",
+            )
+            self.students.append(student)
+
+    def change_credit(self, course, credit):
+        course = Course.objects.get(pk=course.pk)
+        course.credit = credit
+        course.save()
+
+    def test_credit_change_updates_points_aggregates_and_results(self):
+        self.enroll(3)
+        self.change_credit(self.algorithms, 4)
+
+        points = set(
+            TakenCourse.objects.filter(course=self.algorithms).values_list(
+                "point", flat=True
+            )
+        )
+        self.assertEqual(points, {Decimal("16.00")})
+        points = set(
+            TakenCourse.objects.filter(course=self.databases).values_list(
+                "point", flat=True
+            )
+        )
+        self.assertEqual(points, {Decimal("6.00")})
+        self.assertEqual(GradeAggregate.objects.rebuild(commit=False), [])
+        for result in Result.objects.all():
+            self.assertEqual(result.gpa, 3.67)
+            self.assertEqual(result.cgpa, 3.67)
+
+    def test_credit_change_keeps_cgpa_of_earlier_sessions(self):
+        self.enroll(1)
+        Result.objects.update(session="2023-2024")
+        self.change_credit(self.algorithms, 4)
+
+        result = Result.objects.get(student=self.students[0])
+        self.assertEqual(result.gpa, 3.67)
+        self.assertEqual(result.cgpa, 3.6)
+
+    def test_semester_change_moves_aggregates(self):
+        self.enroll(1)
+        self.databases.semester = "Second"
+        self.databases.save()
+
+        self.assertEqual(GradeAggregate.objects.rebuild(commit=False), [])
+        aggregate = GradeAggregate.objects.get(
+            student=self.students[0], level="Bachelor", semester="First"
+        )
+        self.assertEqual(aggregate.total_credits, 3)
+        result = Result.objects.get(student=self.students[0])
+        self.assertEqual(result.gpa, 4.0)
+        self.assertEqual(result.cgpa, 3.6)
+
+    def test_level_change_regrades_with_the_new_scheme(self):
+        self.addCleanup(GradingScheme.objects.invalidate)
+        scheme = GradingScheme.objects.create(name="Strict", level="Master")
+        for grade, min_total, point in (("A", 95, 4), ("B", 80, 3), ("F", 0, 0)):
+            GradeBoundary.objects.create(
+                scheme=scheme, grade=grade, min_total=min_total, point=point
+            )
+        self.enroll(2)
+        self.algorithms.level = "Master"
+        self.algorithms.save()
+
+        for taken in TakenCourse.objects.filter(course=self.algorithms):
+            self.assertEqual(
+                (taken.grade, taken.point, taken.comment),
+                ("B", Decimal("9.00"), "PASS"),
+            )
+        self.assertEqual(
+            set(
+                TakenCourse.objects.filter(course=self.databases).values_list(
+                    "grade", flat=True
+                )
+            ),
+            {"B"},
+        )
+        self.assertEqual(GradeAggregate.objects.rebuild(commit=False), [])
+
+    def test_unrelated_change_does_nothing(self):
+        self.enroll(1)
+        with CaptureQueriesContext(connection) as queries:
+            self.change_credit(self.algorithms, 3)
+        self.assertFalse([q for q in queries.captured_queries if "result_" in q["sql"]])
+
+    def test_query_count_does_not_grow_with_students(self):
+        self.enroll(2)
+        with CaptureQueriesContext(connection) as few:
+            self.change_credit(self.algorithms, 4)
+        self.enroll(8)
+        with CaptureQueriesContext(connection) as many:
+            self.change_credit(self.algorithms, 5)
+        self.assertEqual(len(few), len(many))
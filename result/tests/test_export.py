@@ -0,0 +1,113 @@
+import csv
+import json
+from decimal import Decimal
+from io import StringIO
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase
+from django.test.utils import override_settings
+from django.urls import reverse
+
+from accounts.models import Student
+from course.models import Course, Program
+from result.models import Result, TakenCourse
+
+User = get_user_model()
+
+
+@override_settings(
+    STATICFILES_STORAGE="django.contrib.staticfiles.storage.StaticFilesStorage",
+    MIDDLEWARE=[
+        m
+        for m in settings.MIDDLEWARE
+        if m
+        not in [
+            "django.middleware.locale.LocaleMiddleware",
+            "whitenoise.middleware.WhiteNoiseMiddleware",
+        ]
+    ],
+    LANGUAGE_CODE="en-us",
+)
+class ExportResultsViewTest(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.client.force_login(User.objects.create_superuser("admin", password="x"))
+        self.programs = []
+        for title in ("Computer Science", "Physics"):
+            program = Program.objects.create(title=title)
+            course = Course.objects.create(
+                title=title,
+                code=title[:3].upper() + "101",
+                credit=3,
+                semester="First",
+                level="Bachelor",
+                program=program,
+            )
+            student = Student.objects.create(
+                student=User.objects.create_user(username=f"{title[:3]}-student"),
+                program=program,
+                level="Bachelor",
+            )
+            TakenCourse.objects.create(
+                student=student, course=course, final_exam=Decimal("70")
+            )
+            Result.objects.create(
+                student=student,
+                gpa=3.0,
+                cgpa=3.0,
+                semester="First",
+                session="2024-2025",
+                level="Bachelor",
+            )
+            self.programs.append(program)
+
+    def export(self, **params):
+        return self.client.get(reverse("export_results"), params)
+
+    def test_taken_courses_csv(self):
+        response = self.export(dataset="taken_courses", program=self.programs[0].pk)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "text/csv")
+        rows = list(csv.DictReader(StringIO(response.getvalue().decode())))
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]["student"], "Com-student")
+        self.assertEqual(rows[0]["course"], "COM101")
+        self.assertEqual(rows[0]["total"], "70.00")
+        self.assertEqual(rows[0]["grade"], "B")
+
+    def test_results_ndjson(self):
+        response = self.export(format="ndjson", session="2024-2025")
+        lines = response.getvalue().decode().splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertEqual(
+            json.loads(lines[0]),
+            {
+                "student": "Com-student",
+                "program": "Computer Science",
+                "level": "Bachelor",
+                "semester": "First",
+                "session": "2024-2025",
+                "gpa": 3.0,
+                "cgpa": 3.0,
+            },
+        )
+
+    def test_results_filtered_by_course(self):
+        course = Course.objects.get(code="PHY101")
+        response = self.export(course=course.pk)
+        self.assertIn("Phy-student", response.getvalue().decode())
+        self.assertNotIn("Com-student", response.getvalue().decode())
+
+    def test_invalid_parameters_are_rejected(self):
+        self.assertEqual(self.export(format="xml").status_code, 400)
+        self.assertEqual(self.export(program="cs").status_code, 400)
+        self.assertEqual(
+            self.export(dataset="taken_courses", session="2024-2025").status_code,
+            400,
+        )
+
+    def test_only_admins_can_export(self):
+        self.client.force_login(User.objects.create_user("lecturer", is_lecturer=True))
+        response = self.export()
+        self.assertEqual(response.status_code, 302)
@@ -0,0 +1,119 @@
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import IntegrityError, transaction
+from django.test import TestCase
+
+from accounts.models import Student, User
+from core.models import Semester, Session
+from course.models import Course, Program
+from result.models import Result, SemesterFinalization, TakenCourse
+from result.utils import finalize_semester, refresh_results
+
+
+class FinalizeSemesterTest(TestCase):
+    def setUp(self):
+        session = Session.objects.create(session="2024-2025", is_current_session=True)
+        self.semester = Semester.objects.create(
+            semester="First", is_current_semester=True, session=session
+        )
+        program = Program.objects.create(title="Computer Science")
+        self.first = self.make_course(program, "CS201", 3, "First")
+        self.second = self.make_course(program, "CS202", 2, "First")
+        self.previous = self.make_course(program, "CS101", 4, "Second")
+        self.students = []
+        for i, exams in enumerate([(90, 70, 60), (40, 55, 90)]):
+            user = User.objects.create_user(username=f"student{i}")
+            student = Student.objects.create(
+                student=user, program=program, level="Bachelor"
+            )
+            for course, exam in zip([self.first, self.second, self.previous], exams):
+                TakenCourse.objects.create(
+                    student=student, course=course, final_exam=Decimal(exam)
+                )
+            self.students.append(student)
+
+    def make_course(self, program, code, credit, semester):
+        return Course.objects.create(
+            title=code,
+            code=code,
+            credit=credit,
+            semester=semester,
+            level="Bachelor",
+            program=program,
+        )
+
+    def result(self, student):
+        return Result.objects.get(student=student, semester="First")
+
+    def test_finalize_computes_results_and_snapshot(self):
+        # A stale row written earlier is replaced rather than duplicated.
+        refresh_results(self.students[:1], "First", "2024-2025")
+
+        finalization = finalize_semester(self.semester)
+
+        self.assertEqual(finalization.students, 2)
+        self.assertEqual(finalization.courses, 2)
+        self.assertEqual(Result.objects.count(), 2)
+        result = self.result(self.students[0])
+        # (3 * 4.0 + 2 * 3.0) / 5 this semester, plus 4 * 2.5 overall
+        self.assertEqual(result.gpa, 3.6)
+        self.assertEqual(result.cgpa, 3.11)
+        self.assertEqual(result.total_points, Decimal("18.00"))
+        self.assertEqual(result.total_credits, 5)
+        self.assertEqual(result.finalization, finalization)
+        result = self.result(self.students[1])
+        # (3 * 0.0 + 2 * 2.0) / 5 this semester, plus 4 * 4.0 overall
+        self.assertEqual(result.gpa, 0.8)
+        self.assertEqual(result.cgpa, 2.22)
+
+    def test_finalized_results_are_not_refreshed(self):
+        finalize_semester(self.semester)
+        taken = TakenCourse.objects.get(student=self.students[0], course=self.first)
+        taken.final_exam = Decimal("0")
+        taken.save()
+        refresh_results(self.students, "First", "2024-2025")
+        self.assertEqual(self.result(self.students[0]).gpa, 3.6)
+
+        # Finalizing again takes a new snapshot.
+        finalize_semester(self.semester)
+        self.assertEqual(self.result(self.students[0]).gpa, 1.2)
+        self.assertEqual(SemesterFinalization.objects.count(), 1)
+
+    def test_results_are_unique(self):
+        refresh_results(self.students, "First", "2024-2025")
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Result.objects.create(
+                student=self.students[0],
+                semester="First",
+                session="2024-2025",
+                level="Bachelor",
+            )
+
+    def test_results_without_session_are_unique(self):
+        for gpa in (3.0, 3.5):
+            Result.objects.upsert(
+                [
+                    Result(
+                        student=self.students[0],
+                        gpa=gpa,
+                        semester="First",
+                        session=None,
+                        level=None,
+                    )
+                ],
+                ["gpa"],
+            )
+        result = Result.objects.get(student=self.students[0])
+        self.assertEqual(result.gpa, 3.5)
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Result.objects.create(
+                student=self.students[0], semester="First", session="", level=""
+            )
+
+    def test_command_finalizes_current_semester(self):
+        out = StringIO()
+        call_command("finalize_semester", stdout=out)
+        self.assertIn("2 student(s), 2 course(s)", out.getvalue())
+        self.assertEqual(Result.objects.filter(finalization__isnull=False).count(), 2)
@@ -0,0 +1,102 @@
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from accounts.models import Student, User
+from core.models import Semester, Session
+from course.models import Course, Program
+from result.models import GradeAggregate, TakenCourse
+
+
+class GradeAggregateTest(TestCase):
+    def setUp(self):
+        session = Session.objects.create(session="2024-2025", is_current_session=True)
+        Semester.objects.create(
+            semester="First", is_current_semester=True, session=session
+        )
+        program = Program.objects.create(title="Computer Science")
+        user = User.objects.create_user(username="student")
+        self.student = Student.objects.create(
+            student=user, program=program, level="Bachelor"
+        )
+        self.first = Course.objects.create(
+            title="Algorithms",
+            code="CS201",
+            credit=3,
+            semester="First",
+            level="Bachelor",
+            program=program,
+        )
+        self.second = Course.objects.create(
+            title="Databases",
+            code="CS202",
+            credit=2,
+            semester="Second",
+            level="Bachelor",
+            program=program,
+        )
+
+    def aggregate(self, semester="First"):
+        return GradeAggregate.objects.get(
+            student=self.student, level="Bachelor", semester=semester
+        )
+
+    def test_create_and_update_apply_deltas(self):
+        taken = TakenCourse.objects.create(
+            student=self.student, course=self.first, final_exam=Decimal("90")
+        )
+        aggregate = self.aggregate()
+        self.assertEqual(aggregate.total_points, Decimal("12.00"))
+        self.assertEqual(aggregate.total_credits, 3)
+
+        taken = TakenCourse.objects.get(pk=taken.pk)
+        taken.final_exam = Decimal("70")
+        taken.save()
+        aggregate.refresh_from_db()
+        self.assertEqual(aggregate.total_points, Decimal("9.00"))
+        self.assertEqual(aggregate.total_credits, 3)
+
+        # saving again without changes must not count the course twice
+        taken.save()
+        aggregate.refresh_from_db()
+        self.assertEqual(aggregate.total_points, Decimal("9.00"))
+        self.assertEqual(aggregate.total_credits, 3)
+
+    def test_delete_removes_contribution(self):
+        TakenCourse.objects.create(
+            student=self.student, course=self.first, final_exam=Decimal("90")
+        )
+        TakenCourse.objects.filter(student=self.student).delete()
+        aggregate = self.aggregate()
+        self.assertEqual(aggregate.total_points, Decimal("0.00"))
+        self.assertEqual(aggregate.total_credits, 0)
+
+    def test_gpa_and_cgpa_read_aggregates(self):
+        taken = TakenCourse.objects.create(
+            student=self.student, course=self.first, final_exam=Decimal("90")
+        )
+        TakenCourse.objects.create(
+            student=self.student, course=self.second, final_exam=Decimal("70")
+        )
+        self.assertEqual(taken.calculate_gpa(), Decimal("4.00"))
+        # (12 + 6) / 5
+        self.assertEqual(taken.calculate_cgpa(), Decimal("3.60"))
+
+    def test_rebuild_command_reports_and_fixes_drift(self):
+        TakenCourse.objects.create(
+            student=self.student, course=self.first, final_exam=Decimal("90")
+        )
+        GradeAggregate.objects.update(total_points=Decimal("1.00"))
+
+        out = StringIO()
+        call_command("rebuild_grade_aggregates", "--dry-run", stdout=out)
+        self.assertIn("1 aggregate(s) drifted", out.getvalue())
+        self.assertEqual(self.aggregate().total_points, Decimal("1.00"))
+
+        out = StringIO()
+        call_command("rebuild_grade_aggregates", stdout=out)
+        self.assertIn("Rebuilt 1 drifted aggregate(s)", out.getvalue())
+        self.assertEqual(self.aggregate().total_points, Decimal("12.00"))
+        self.assertEqual(GradeAggregate.objects.rebuild(), [])
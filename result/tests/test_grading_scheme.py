@@ -0,0 +1,98 @@
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+
+from accounts.models import Student
+from course.models import Course, Program
+from result.models import GradeBoundary, GradingScheme, TakenCourse
+
+User = get_user_model()
+
+
+class GradingSchemeTest(TestCase):
+    def setUp(self):
+        self.addCleanup(GradingScheme.objects.invalidate)
+        self.program = Program.objects.create(title="Medicine")
+        self.course = Course.objects.create(
+            title="Anatomy",
+            code="MD101",
+            credit=4,
+            semester="First",
+            level="Bachelor",
+            program=self.program,
+        )
+        self.student = Student.objects.create(
+            student=User.objects.create_user(username="student"),
+            program=self.program,
+            level="Bachelor",
+        )
+
+    def make_scheme(self, name, boundaries, program=None, level=""):
+        scheme = GradingScheme.objects.create(name=name, program=program, level=level)
+        for grade, min_total, point in boundaries:
+            GradeBoundary.objects.create(
+                scheme=scheme, grade=grade, min_total=min_total, point=point
+            )
+        return scheme
+
+    def take(self, final_exam):
+        return TakenCourse.objects.create(
+            student=self.student, course=self.course, final_exam=final_exam
+        )
+
+    def test_default_scale_without_scheme(self):
+        taken = self.take(Decimal("72"))
+        self.assertEqual(taken.grade, "B")
+        self.assertEqual(taken.point, Decimal("12.00"))
+
+    def test_program_scheme_is_used(self):
+        self.make_scheme(
+            "Pass/fail",
+            [("A", 60, Decimal("4")), ("F", 0, Decimal("0"))],
+            program=self.program,
+        )
+        taken = self.take(Decimal("72"))
+        self.assertEqual(taken.grade, "A")
+        self.assertEqual(taken.point, Decimal("16.00"))
+        self.assertEqual(self.take(Decimal("59")).comment, "FAIL")
+
+    def test_most_specific_scheme_wins(self):
+        self.make_scheme("Bachelor", [("C", 0, Decimal("2"))], level="Bachelor")
+        self.make_scheme(
+            "Medicine bachelor",
+            [("B", 0, Decimal("3"))],
+            program=self.program,
+            level="Bachelor",
+        )
+        self.assertEqual(self.take(Decimal("10")).grade, "B")
+
+    def test_edits_invalidate_compiled_tables(self):
+        scheme = self.make_scheme(
+            "Strict", [("A", 95, Decimal("4")), ("F", 0, Decimal("0"))]
+        )
+        self.assertEqual(self.take(Decimal("90")).grade, "F")
+
+        boundary = scheme.boundaries.get(grade="A")
+        boundary.min_total = 85
+        boundary.save()
+        self.assertEqual(self.take(Decimal("90")).grade, "A")
+
+    def test_lookups_are_served_from_the_compiled_tables(self):
+        self.make_scheme("Strict", [("A", 95, Decimal("4"))], program=self.program)
+        GradingScheme.objects.tables()
+        with self.assertNumQueries(0):
+            for _ in range(3):
+                GradingScheme.objects.table_for(self.program.pk, "Bachelor")
+
+    def test_tables_are_reloaded_when_the_version_is_evicted(self):
+        scheme = self.make_scheme("Strict", [("A", 95, Decimal("4"))])
+        cache.delete(GradingScheme.objects.version_key)
+        GradingScheme.objects.tables()
+
+        # Another process changes the scheme, then its new version is evicted.
+        GradeBoundary.objects.filter(scheme=scheme).update(min_total=85)
+        cache.set(GradingScheme.objects.version_key, "changed", None)
+        cache.delete(GradingScheme.objects.version_key)
+        self.assertEqual(self.take(Decimal("90")).grade, "A")
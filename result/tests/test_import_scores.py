@@ -0,0 +1,143 @@
+import zipfile
+from decimal import Decimal
+from io import BytesIO
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import Client, TestCase
+from django.test.utils import override_settings
+from django.urls import reverse
+from openpyxl import Workbook
+
+from accounts.models import Student
+from core.models import Semester, Session
+from course.models import Course, Program
+from result.models import Result, TakenCourse
+
+User = get_user_model()
+
+
+@override_settings(
+    STATICFILES_STORAGE="django.contrib.staticfiles.storage.StaticFilesStorage",
+    MIDDLEWARE=[
+        m
+        for m in settings.MIDDLEWARE
+        if m
+        not in [
+            "django.middleware.locale.LocaleMiddleware",
+            "whitenoise.middleware.WhiteNoiseMiddleware",
+        ]
+    ],
+    LANGUAGE_CODE="en-us",
+)
+class ImportScoresViewTest(TestCase):
+    def setUp(self):
+        lecturer = User.objects.create_user(username="lecturer", is_lecturer=True)
+        self.client = Client()
+        self.client.force_login(lecturer)
+        session = Session.objects.create(session="2024-2025", is_current_session=True)
+        Semester.objects.create(
+            semester="First", is_current_semester=True, session=session
+        )
+        program = Program.objects.create(title="Computer Science")
+        self.course = Course.objects.create(
+            title="Algorithms",
+            code="CS201",
+            credit=3,
+            semester="First",
+            level="Bachelor",
+            program=program,
+        )
+        self.taken = {}
+        for username in ("alice", "bob"):
+            student = Student.objects.create(
+                student=User.objects.create_user(username=username),
+                program=program,
+                level="Bachelor",
+            )
+            self.taken[username] = TakenCourse.objects.create(
+                student=student, course=self.course, assignment=Decimal("5")
+            )
+        self.url = reverse("import_scores_for", kwargs={"id": self.course.pk})
+
+    def upload(self, name, content):
+        return self.client.post(
+            self.url, {"file": SimpleUploadedFile(name, content)}, follow=True
+        )
+
+    def test_csv_import(self):
+        response = self.upload(
+            "scores.csv",
+            b"Username,Mid Exam,Final Exam\nalice,20,55\nbob,15,\n",
+        )
+        self.assertRedirects(
+            response, reverse("add_score_for", kwargs={"id": self.course.pk})
+        )
+        alice = TakenCourse.objects.get(pk=self.taken["alice"].pk)
+        self.assertEqual(alice.total, Decimal("80.00"))
+        self.assertEqual(alice.grade, "A-")
+        bob = TakenCourse.objects.get(pk=self.taken["bob"].pk)
+        self.assertEqual(bob.final_exam, Decimal("0.00"))  # blank keeps the score
+        self.assertEqual(bob.total, Decimal("20.00"))
+        self.assertEqual(Result.objects.count(), 2)
+
+    def test_xlsx_import(self):
+        workbook = Workbook()
+        sheet = workbook.active
+        sheet.append(["username", "final_exam"])
+        sheet.append(["alice", 60.5])
+        content = BytesIO()
+        workbook.save(content)
+
+        self.upload("scores.xlsx", content.getvalue())
+        alice = TakenCourse.objects.get(pk=self.taken["alice"].pk)
+        self.assertEqual(alice.final_exam, Decimal("60.50"))
+
+    def test_corrupt_xlsx_is_rejected(self):
+        response = self.upload("scores.xlsx", b"not a spreadsheet")
+        self.assertFormError(
+            response, "form", "file", "The file is not a valid .xlsx file."
+        )
+
+    def test_xlsx_without_a_workbook_is_rejected(self):
+        archive = BytesIO()
+        with zipfile.ZipFile(archive, "w") as content:
+            content.writestr("readme.txt", "not a workbook")
+        response = self.upload("scores.xlsx", archive.getvalue())
+        self.assertFormError(
+            response, "form", "file", "The file is not a valid .xlsx file."
+        )
+
+    def test_unreadable_csv_is_rejected(self):
+        # csv.Error, as raised for NUL bytes before Python 3.11
+        content = b"username,final_exam\nalice," + b"5" * 200000 + b"\n"
+        response = self.upload("scores.csv", content)
+        self.assertEqual(response.status_code, 200)
+        [error] = response.context["form"].errors["file"]
+        self.assertTrue(error.startswith("The file is not a valid CSV file"))
+
+    def test_row_errors_are_reported(self):
+        response = self.upload(
+            "scores.csv",
+            b"username,final_exam\nalice,abc\nmallory,50\nbob,50\nbob,40\n",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.context["errors"],
+            [
+                (2, "alice", "final_exam: 'abc' is not a number"),
+                (3, "mallory", "student is not registered for this course"),
+                (5, "bob", "already given on line 4"),
+            ],
+        )
+        bob = TakenCourse.objects.get(pk=self.taken["bob"].pk)
+        self.assertEqual(bob.final_exam, Decimal("50.00"))
+        alice = TakenCourse.objects.get(pk=self.taken["alice"].pk)
+        self.assertEqual(alice.final_exam, Decimal("0.00"))
+
+    def test_missing_username_column_is_rejected(self):
+        response = self.upload("scores.csv", b"name,final_exam\nalice,50\n")
+        self.assertFormError(
+            response, "form", "file", "The first row must have a 'username' column."
+        )
@@ -0,0 +1,119 @@
+import os
+from types import SimpleNamespace
+from decimal import Decimal
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import Client, SimpleTestCase, TestCase
+from django.test.utils import override_settings
+from django.urls import reverse
+from reportlab.lib import colors
+from reportlab.platypus import Paragraph
+from reportlab.lib.styles import getSampleStyleSheet
+
+from accounts.models import Student
+from core.models import Semester, Session
+from course.models import Course, Program
+from result.models import TakenCourse
+from result.pdf import pdf_response, render_pdf
+from result.views import result_sheet_table
+
+User = get_user_model()
+
+
+class RenderPDFTest(SimpleTestCase):
+    def test_renders_into_memory(self):
+        story = [Paragraph("Hello", getSampleStyleSheet()["Normal"])]
+        buffer = render_pdf(story)
+        self.assertFalse(buffer._rolled)
+        self.assertEqual(buffer.read(4), b"%PDF")
+
+    def test_response_streams_pdf_inline(self):
+        response = pdf_response(b"%PDF-1", "sheet.pdf")
+        self.assertEqual(response["Content-Type"], "application/pdf")
+        self.assertEqual(
+            response["Content-Disposition"], 'inline; filename="sheet.pdf"'
+        )
+        self.assertEqual(b"".join(response.streaming_content), b"%PDF-1")
+
+    def test_response_sets_length_of_a_spooled_buffer(self):
+        story = [Paragraph("Hello", getSampleStyleSheet()["Normal"])]
+        buffer = render_pdf(story)
+        size = len(buffer.read())
+        buffer.seek(0)
+        response = pdf_response(buffer, "sheet.pdf")
+        self.assertEqual(response["Content-Length"], str(size))
+        self.assertEqual(len(b"".join(response.streaming_content)), size)
+
+
+class ResultSheetTableTest(SimpleTestCase):
+    def row(self, name, grade):
+        user = SimpleNamespace(username="ugr/1/24", get_full_name=name)
+        return SimpleNamespace(
+            student=SimpleNamespace(student=user),
+            total=Decimal("30"),
+            grade=grade,
+            point=Decimal("0"),
+            comment="FAIL",
+        )
+
+    def test_single_table_with_repeated_header(self):
+        rows = [self.row("Abebe", "A"), self.row("A very long name " * 3, "F")]
+        table = result_sheet_table(rows)
+
+        self.assertEqual(table.repeatRows, 1)
+        self.assertEqual(len(table._cellvalues), 3)
+        self.assertEqual(table._cellvalues[1][2], "Abebe")
+        self.assertIsInstance(table._cellvalues[2][2], Paragraph)
+        self.assertNotEqual(table._cellStyles[1][0].color, colors.red)
+        self.assertEqual(table._cellStyles[2][0].color, colors.red)
+
+
+@override_settings(
+    STATICFILES_STORAGE="django.contrib.staticfiles.storage.StaticFilesStorage",
+    MIDDLEWARE=[
+        m
+        for m in settings.MIDDLEWARE
+        if m
+        not in [
+            "django.middleware.locale.LocaleMiddleware",
+            "whitenoise.middleware.WhiteNoiseMiddleware",
+        ]
+    ],
+    LANGUAGE_CODE="en-us",
+)
+class RegistrationFormTest(TestCase):
+    def setUp(self):
+        session = Session.objects.create(session="2024-2025", is_current_session=True)
+        Semester.objects.create(
+            semester="First", is_current_semester=True, session=session
+        )
+        program = Program.objects.create(title="Computer Science")
+        course = Course.objects.create(
+            title="Algorithms",
+            code="CS201",
+            credit=3,
+            semester="First",
+            level="Bachelor",
+            program=program,
+        )
+        self.user = User.objects.create_user(username="student", is_student=True)
+        student = Student.objects.create(
+            student=self.user, program=program, level="Bachelor"
+        )
+        TakenCourse.objects.create(
+            student=student, course=course, final_exam=Decimal("80")
+        )
+        self.client = Client()
+        self.client.force_login(self.user)
+
+    def test_form_is_streamed_without_touching_media_root(self):
+        directory = os.path.join(settings.MEDIA_ROOT, "registration_form")
+        before = set(os.listdir(directory))
+
+        response = self.client.get(reverse("course_registration_form"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "application/pdf")
+        self.assertTrue(b"".join(response.streaming_content).startswith(b"%PDF"))
+        self.assertEqual(set(os.listdir(directory)), before)
@@ -0,0 +1,180 @@
+import shutil
+import tempfile
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.http import Http404
+from django.test import Client, RequestFactory, TestCase
+from django.test.utils import override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import Student
+from core.models import Semester, Session
+from course.models import Course, Program
+from result.jobs import run_job, run_pending_jobs
+from result.models import PDFJob, TakenCourse
+from result.views import pdf_job_download, pdf_job_status
+
+User = get_user_model()
+
+
+@override_settings(
+    STATICFILES_STORAGE="django.contrib.staticfiles.storage.StaticFilesStorage",
+    MIDDLEWARE=[
+        m
+        for m in settings.MIDDLEWARE
+        if m
+        not in [
+            "django.middleware.locale.LocaleMiddleware",
+            "whitenoise.middleware.WhiteNoiseMiddleware",
+        ]
+    ],
+    LANGUAGE_CODE="en-us",
+)
+class PDFJobTest(TestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        media = override_settings(MEDIA_ROOT=media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+
+        session = Session.objects.create(session="2024-2025", is_current_session=True)
+        Semester.objects.create(
+            semester="First", is_current_semester=True, session=session
+        )
+        program = Program.objects.create(title="Computer Science")
+        self.course = Course.objects.create(
+            title="Algorithms",
+            code="CS201",
+            credit=3,
+            semester="First",
+            level="Bachelor",
+            program=program,
+        )
+        self.lecturer = User.objects.create_user(username="lecturer", is_lecturer=True)
+        self.student_user = User.objects.create_user(
+            username="student", is_student=True
+        )
+        student = Student.objects.create(
+            student=self.student_user, program=program, level="Bachelor"
+        )
+        TakenCourse.objects.create(
+            student=student, course=self.course, final_exam=Decimal("80")
+        )
+        self.client = Client()
+
+    def test_result_sheet_job_lifecycle(self):
+        self.client.force_login(self.lecturer)
+        response = self.client.post(
+            reverse("result_sheet_pdf_job", kwargs={"id": self.course.pk})
+        )
+        self.assertEqual(response.status_code, 202)
+        job = response.json()
+        self.assertEqual(job["status"], PDFJob.PENDING)
+        self.assertNotIn("download_url", job)
+
+        self.assertEqual(len(run_pending_jobs()), 1)
+
+        status = self.client.get(job["status_url"]).json()
+        self.assertEqual(status["status"], PDFJob.DONE)
+        download = self.client.get(status["download_url"])
+        self.assertEqual(download["Content-Type"], "application/pdf")
+        self.assertTrue(b"".join(download.streaming_content).startswith(b"%PDF"))
+
+    def test_registration_form_job_via_worker_command(self):
+        self.client.force_login(self.student_user)
+        job = self.client.post(reverse("course_registration_form_job")).json()
+
+        call_command("run_pdf_workers", workers=1, once=True, stdout=StringIO())
+
+        self.assertEqual(PDFJob.objects.get(pk=job["id"]).status, PDFJob.DONE)
+
+    def test_jobs_are_private_to_their_owner(self):
+        job = PDFJob.objects.create(kind=PDFJob.REGISTRATION_FORM, owner=self.lecturer)
+        request = RequestFactory().get("/")
+        request.user = self.student_user
+        with self.assertRaises(Http404):
+            pdf_job_status(request, pk=job.pk)
+
+    def test_claim_is_exclusive(self):
+        job = PDFJob.objects.create(kind=PDFJob.REGISTRATION_FORM, owner=self.lecturer)
+        self.assertEqual(PDFJob.objects.claim(), job)
+        self.assertIsNone(PDFJob.objects.claim())
+
+    def test_failures_are_recorded(self):
+        job = PDFJob.objects.create(
+            kind=PDFJob.RESULT_SHEET,
+            owner=self.lecturer,
+            params={"course": 0, "semester": 0, "session": 0},
+        )
+        run_pending_jobs()
+        job.refresh_from_db()
+        self.assertEqual(job.status, PDFJob.FAILED)
+        self.assertIn("DoesNotExist", job.error)
+
+    def test_expired_jobs_are_removed(self):
+        self.client.force_login(self.student_user)
+        self.client.post(reverse("course_registration_form_job"))
+        (job,) = run_pending_jobs()
+        PDFJob.objects.filter(pk=job.pk).update(
+            expires_at=timezone.now() - timedelta(seconds=1)
+        )
+
+        request = RequestFactory().get("/")
+        request.user = self.student_user
+        with self.assertRaises(Http404):
+            pdf_job_download(request, pk=job.pk)
+        self.assertEqual(PDFJob.objects.expire(), 1)
+        self.assertFalse(job.file.storage.exists(job.file.name))
+
+    def test_stale_running_jobs_are_requeued_then_failed(self):
+        job = PDFJob.objects.create(kind=PDFJob.REGISTRATION_FORM, owner=self.lecturer)
+        self.assertEqual(PDFJob.objects.claim(), job)
+        self.assertEqual(PDFJob.objects.recover_stale(), (0, 0))
+
+        long_ago = timezone.now() - timedelta(seconds=settings.PDF_JOB_TIMEOUT + 1)
+        PDFJob.objects.filter(pk=job.pk).update(heartbeat_at=long_ago)
+        self.assertEqual(PDFJob.objects.recover_stale(), (1, 0))
+        job.refresh_from_db()
+        self.assertEqual(job.status, PDFJob.PENDING)
+
+        for _ in range(settings.PDF_JOB_MAX_ATTEMPTS - 1):
+            self.assertEqual(PDFJob.objects.claim(), job)
+            PDFJob.objects.filter(pk=job.pk).update(heartbeat_at=long_ago)
+            PDFJob.objects.recover_stale()
+        job.refresh_from_db()
+        self.assertEqual(job.status, PDFJob.FAILED)
+        self.assertEqual(job.attempts, settings.PDF_JOB_MAX_ATTEMPTS)
+        self.assertIsNotNone(job.expires_at)
+
+    def test_jobs_with_a_recent_heartbeat_are_not_stale(self):
+        PDFJob.objects.create(kind=PDFJob.REGISTRATION_FORM, owner=self.lecturer)
+        job = PDFJob.objects.claim()
+        long_ago = timezone.now() - timedelta(seconds=settings.PDF_JOB_TIMEOUT + 1)
+        PDFJob.objects.filter(pk=job.pk).update(
+            started_at=long_ago, heartbeat_at=long_ago
+        )
+        self.assertTrue(PDFJob.objects.beat(job))
+        self.assertEqual(PDFJob.objects.recover_stale(), (0, 0))
+
+    def test_outcome_is_only_recorded_under_the_current_claim(self):
+        self.client.force_login(self.student_user)
+        self.client.post(reverse("course_registration_form_job"))
+        stale = PDFJob.objects.claim()
+        long_ago = timezone.now() - timedelta(seconds=settings.PDF_JOB_TIMEOUT + 1)
+        PDFJob.objects.filter(pk=stale.pk).update(heartbeat_at=long_ago)
+        PDFJob.objects.recover_stale()
+        current = PDFJob.objects.claim()
+
+        job = run_job(stale)
+        self.assertEqual(job.status, PDFJob.RUNNING)
+        self.assertEqual(job.claim_token, current.claim_token)
+        self.assertFalse(PDFJob.objects.beat(stale))
+
+        self.assertEqual(run_job(current).status, PDFJob.DONE)
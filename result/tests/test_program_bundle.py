@@ -0,0 +1,117 @@
+import os
+import shutil
+import tempfile
+import zipfile
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from accounts.models import Student
+from core.models import Semester, Session
+from course.models import Course, Program
+from result.bundles import build_program_bundle
+from result.models import TakenCourse
+
+User = get_user_model()
+
+
+class ProgramBundleTest(TestCase):
+    def setUp(self):
+        self.session = Session.objects.create(
+            session="2024-2025", is_current_session=True
+        )
+        self.semester = Semester.objects.create(
+            semester="First", is_current_semester=True, session=self.session
+        )
+        self.program = Program.objects.create(title="Computer Science")
+        for code in ("CS101", "CS102"):
+            course = Course.objects.create(
+                title=code,
+                code=code,
+                credit=3,
+                semester="First",
+                level="Bachelor",
+                program=self.program,
+            )
+        student = Student.objects.create(
+            student=User.objects.create_user(username="student"),
+            program=self.program,
+            level="Bachelor",
+        )
+        TakenCourse.objects.create(
+            student=student, course=course, final_exam=Decimal("80")
+        )
+
+    def test_bundle_contains_every_document_and_a_report(self):
+        archive, report = build_program_bundle(
+            self.program, self.semester, self.session
+        )
+        with zipfile.ZipFile(archive) as bundle:
+            self.assertEqual(
+                sorted(bundle.namelist()),
+                [
+                    "registration_forms/student.pdf",
+                    "report.csv",
+                    "result_sheets/CS101_resultSheet.pdf",
+                    "result_sheets/CS102_resultSheet.pdf",
+                ],
+            )
+            self.assertTrue(
+                bundle.read("result_sheets/CS101_resultSheet.pdf").startswith(b"%PDF")
+            )
+        self.assertEqual(len(report), 3)
+        self.assertFalse(any(error for *_, error in report))
+
+    def test_courses_of_other_semesters_are_excluded(self):
+        Course.objects.create(
+            title="CS103",
+            code="CS103",
+            credit=3,
+            semester="Second",
+            level="Bachelor",
+            program=self.program,
+        )
+        archive, report = build_program_bundle(
+            self.program, self.semester, self.session
+        )
+        with zipfile.ZipFile(archive) as bundle:
+            self.assertNotIn("result_sheets/CS103_resultSheet.pdf", bundle.namelist())
+        self.assertEqual(len(report), 3)
+
+    def test_failures_are_reported_without_aborting(self):
+        with mock.patch(
+            "result.bundles.registration_form_story", side_effect=ValueError("boom")
+        ):
+            archive, report = build_program_bundle(
+                self.program, self.semester, self.session
+            )
+        errors = [error for *_, error in report if error]
+        self.assertEqual(errors, ["ValueError: boom"])
+        with zipfile.ZipFile(archive) as bundle:
+            self.assertIn("ValueError: boom", bundle.read("report.csv").decode())
+
+    def test_command_writes_zip(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        output = os.path.join(directory, "bundle.zip")
+        out = StringIO()
+        call_command(
+            "generate_program_pdfs",
+            self.program.pk,
+            output=output,
+            workers=1,
+            only="result_sheet",
+            stdout=out,
+        )
+        with zipfile.ZipFile(output) as bundle:
+            self.assertEqual(len(bundle.namelist()), 3)
+        self.assertIn("Rendered 2 of 2 document(s)", out.getvalue())
+
+    def test_command_requires_a_current_semester(self):
+        Semester.objects.update(is_current_semester=False)
+        with self.assertRaisesMessage(CommandError, "exactly one current semester"):
+            call_command("generate_program_pdfs", self.program.pk, stdout=StringIO())
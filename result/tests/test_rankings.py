@@ -0,0 +1,141 @@
+from io import StringIO
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+
+from accounts.models import Student
+from core.models import Semester, Session
+from course.models import Program
+from result.models import Result
+from result.rankings import compute_rankings, deans_list, rankings
+
+User = get_user_model()
+
+
+@override_settings(
+    STATICFILES_STORAGE="django.contrib.staticfiles.storage.StaticFilesStorage",
+    MIDDLEWARE=[
+        m
+        for m in settings.MIDDLEWARE
+        if m
+        not in [
+            "django.middleware.locale.LocaleMiddleware",
+            "whitenoise.middleware.WhiteNoiseMiddleware",
+        ]
+    ],
+    LANGUAGE_CODE="en-us",
+)
+class RankingsTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        session = Session.objects.create(session="2024-2025", is_current_session=True)
+        Semester.objects.create(
+            semester="First", is_current_semester=True, session=session
+        )
+        self.cs = Program.objects.create(title="Computer Science")
+        self.math = Program.objects.create(title="Mathematics")
+        self.students = {}
+        for name, program, level, gpa in [
+            ("ana", self.cs, "Bachelor", 3.9),
+            ("ben", self.cs, "Bachelor", 3.2),
+            ("cai", self.cs, "Bachelor", 3.9),
+            ("dan", self.cs, "Bachelor", 2.1),
+            ("eva", self.cs, "Master", 3.0),
+            ("fay", self.math, "Bachelor", 4.0),
+        ]:
+            user = User.objects.create_user(username=name)
+            student = Student.objects.create(student=user, program=program, level=level)
+            Result.objects.create(
+                student=student,
+                gpa=gpa,
+                cgpa=gpa,
+                semester="First",
+                session="2024-2025",
+                level=level,
+            )
+            self.students[name] = student
+
+    def ranking(self, name):
+        return compute_rankings("First", "2024-2025")[self.students[name].pk]
+
+    def test_ranks_within_program_and_level(self):
+        with CaptureQueriesContext(connection) as ctx:
+            ranked = compute_rankings("First", "2024-2025")
+        self.assertEqual(len(ctx.captured_queries), 1)
+        self.assertEqual(len(ranked), 6)
+
+        self.assertEqual(self.ranking("ana")["rank"], 1)
+        self.assertEqual(self.ranking("cai")["rank"], 1)
+        self.assertEqual(self.ranking("ben")["rank"], 3)
+        self.assertEqual(self.ranking("dan")["rank"], 4)
+        self.assertEqual(self.ranking("dan")["cohort"], 4)
+        self.assertEqual(self.ranking("ana")["percentile"], 66.7)
+        self.assertEqual(self.ranking("dan")["percentile"], 0.0)
+        self.assertEqual(self.ranking("eva")["rank"], 1)
+        self.assertEqual(self.ranking("fay")["rank"], 1)
+
+    def test_rankings_are_cached_until_results_change(self):
+        period = ("First", "2024-2025")
+        rankings([period])
+        with CaptureQueriesContext(connection) as ctx:
+            rankings([period])
+        self.assertEqual(len(ctx.captured_queries), 0)
+
+        result = Result.objects.get(student=self.students["dan"])
+        result.gpa = 4.0
+        result.save()
+        self.assertEqual(rankings([period])[period][self.students["dan"].pk]["rank"], 1)
+
+    def test_deans_list(self):
+        names = [
+            row["username"]
+            for row in deans_list("First", "2024-2025", self.cs.pk, "Bachelor", top=2)
+        ]
+        self.assertEqual(names, ["ana", "cai"])
+        names = [
+            row["username"] for row in deans_list("First", "2024-2025", self.cs.pk)
+        ]
+        self.assertEqual(names, ["ana", "cai", "ben", "dan", "eva"])
+
+    def test_deans_list_json(self):
+        lecturer = User.objects.create_user(username="lecturer", is_lecturer=True)
+        client = Client()
+        client.force_login(lecturer)
+        url = reverse("deans_list_json")
+
+        response = client.get(url, {"program": self.cs.pk, "top": 1})
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data["semester"], "First")
+        self.assertEqual(data["session"], "2024-2025")
+        self.assertEqual(
+            [row["username"] for row in data["students"]], ["ana", "cai", "eva"]
+        )
+
+        for params in ({}, {"program": "x"}, {"program": self.cs.pk, "top": "-1"}):
+            self.assertEqual(client.get(url, params).status_code, 400)
+
+    def test_grade_result_shows_rank(self):
+        user = self.students["ben"].student
+        user.is_student = True
+        user.save()
+        client = Client()
+        client.force_login(user)
+        response = client.get(reverse("grade_results"))
+        self.assertEqual(response.context["results"][0].ranking["rank"], 3)
+        self.assertContains(response, "3 / 4")
+
+    def test_command_precomputes_rankings(self):
+        out = StringIO()
+        call_command("compute_rankings", stdout=out)
+        self.assertIn("Ranked 6 student(s) in 3 program level(s)", out.getvalue())
+        with CaptureQueriesContext(connection) as ctx:
+            rankings([("First", "2024-2025")])
+        self.assertEqual(len(ctx.captured_queries), 0)
@@ -0,0 +1,74 @@
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from accounts.models import Student, User
+from core.models import Session
+from course.models import Course, Program
+from result.models import GradeAggregate, Result, TakenCourse
+
+
+class RegradeCommandTest(TestCase):
+    def setUp(self):
+        program = Program.objects.create(title="Computer Science")
+        self.course = Course.objects.create(
+            title="Algorithms",
+            code="CS201",
+            credit=3,
+            semester="First",
+            level="Bachelor",
+            program=program,
+        )
+        self.taken = []
+        for i, final_exam in enumerate(["95", "72", "30"]):
+            user = User.objects.create_user(username=f"student{i}")
+            student = Student.objects.create(
+                student=user, program=program, level="Bachelor"
+            )
+            self.taken.append(
+                TakenCourse.objects.create(
+                    student=student, course=self.course, final_exam=Decimal(final_exam)
+                )
+            )
+        # simulate rows graded under an older scale
+        TakenCourse.objects.filter(pk=self.taken[1].pk).update(
+            grade="A", point=Decimal("12.00")
+        )
+        GradeAggregate.objects.rebuild()
+
+    def test_dry_run_reports_without_writing(self):
+        out = StringIO()
+        call_command("regrade_taken_courses", "--dry-run", stdout=out)
+        output = out.getvalue()
+        self.assertIn("A -> B: 1", output)
+        self.assertIn("1 row(s) would change", output)
+        self.assertIn("Scanned 3 rows", output)
+        self.assertEqual(TakenCourse.objects.get(pk=self.taken[1].pk).grade, "A")
+
+    def test_regrade_updates_rows_and_aggregates(self):
+        out = StringIO()
+        call_command("regrade_taken_courses", "--chunk-size", "2", stdout=out)
+        self.assertIn("1 row(s) changed", out.getvalue())
+
+        taken = TakenCourse.objects.get(pk=self.taken[1].pk)
+        self.assertEqual(taken.grade, "B")
+        self.assertEqual(taken.point, Decimal("9.00"))
+        self.assertEqual(GradeAggregate.objects.rebuild(commit=False), [])
+
+    def test_regrade_refreshes_results(self):
+        Session.objects.create(session="2024-2025", is_current_session=True)
+        student = self.taken[1].student
+        result = Result.objects.create(
+            student=student,
+            level="Bachelor",
+            semester="First",
+            session="2024-2025",
+            gpa=4.0,
+            cgpa=4.0,
+        )
+        call_command("regrade_taken_courses", stdout=StringIO())
+        result.refresh_from_db()
+        self.assertEqual(result.gpa, 3.0)
+        self.assertEqual(result.cgpa, 3.0)
@@ -0,0 +1,132 @@
+import os
+import shutil
+import tempfile
+import time
+from decimal import Decimal
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import Client, SimpleTestCase, TestCase
+from django.test.utils import override_settings
+from django.urls import reverse
+
+from accounts.models import Student
+from core.models import Semester, Session
+from course.models import Course, Program
+from result.cache import PDFCache
+from result.models import TakenCourse
+
+User = get_user_model()
+
+
+class PDFCacheTest(SimpleTestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def test_get_returns_stored_content(self):
+        cache = PDFCache(self.directory, max_size=1024, max_age=60)
+        cache.set("sheet-1", "abc", b"%PDF-1")
+        self.assertEqual(cache.get("sheet-1", "abc"), b"%PDF-1")
+        self.assertIsNone(cache.get("sheet-1", "other"))
+
+    def test_expired_entries_are_dropped(self):
+        cache = PDFCache(self.directory, max_size=1024, max_age=60)
+        cache.set("sheet-1", "abc", b"%PDF-1")
+        old = time.time() - 120
+        os.utime(os.path.join(self.directory, "sheet-1-abc.pdf"), (old, old))
+        self.assertIsNone(cache.get("sheet-1", "abc"))
+
+    def test_least_recently_used_entries_are_evicted_over_size(self):
+        cache = PDFCache(self.directory, max_size=10, max_age=60)
+        cache.set("sheet-1", "a", b"12345")
+        old = time.time() - 30
+        os.utime(os.path.join(self.directory, "sheet-1-a.pdf"), (old, old))
+        cache.set("sheet-1", "b", b"12345")
+        cache.set("sheet-1", "c", b"12345")
+        self.assertIsNone(cache.get("sheet-1", "a"))
+        self.assertEqual(cache.get("sheet-1", "c"), b"12345")
+
+    def test_invalidate_drops_only_the_namespace(self):
+        cache = PDFCache(self.directory, max_size=1024, max_age=60)
+        cache.set("sheet-1", "a", b"1")
+        cache.set("sheet-2", "a", b"2")
+        cache.invalidate("sheet-1")
+        self.assertIsNone(cache.get("sheet-1", "a"))
+        self.assertEqual(cache.get("sheet-2", "a"), b"2")
+
+
+@override_settings(
+    STATICFILES_STORAGE="django.contrib.staticfiles.storage.StaticFilesStorage",
+    MIDDLEWARE=[
+        m
+        for m in settings.MIDDLEWARE
+        if m
+        not in [
+            "django.middleware.locale.LocaleMiddleware",
+            "whitenoise.middleware.WhiteNoiseMiddleware",
+        ]
+    ],
+    LANGUAGE_CODE="en-us",
+)
+class ResultSheetCacheViewTest(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        cache_settings = override_settings(RESULT_SHEET_CACHE_DIR=self.directory)
+        cache_settings.enable()
+        self.addCleanup(cache_settings.disable)
+
+        lecturer = User.objects.create_user(username="lecturer", is_lecturer=True)
+        self.client = Client()
+        self.client.force_login(lecturer)
+        session = Session.objects.create(session="2024-2025", is_current_session=True)
+        Semester.objects.create(
+            semester="First", is_current_semester=True, session=session
+        )
+        program = Program.objects.create(title="Computer Science")
+        self.course = Course.objects.create(
+            title="Algorithms",
+            code="CS201",
+            credit=3,
+            semester="First",
+            level="Bachelor",
+            program=program,
+        )
+        student = Student.objects.create(
+            student=User.objects.create_user(username="student"),
+            program=program,
+            level="Bachelor",
+        )
+        self.taken = TakenCourse.objects.create(
+            student=student, course=self.course, final_exam=Decimal("80")
+        )
+        self.url = reverse("result_sheet_pdf_view", kwargs={"id": self.course.pk})
+
+    def cached_files(self):
+        return [name for name in os.listdir(self.directory) if name.endswith(".pdf")]
+
+    def test_second_request_is_served_from_cache(self):
+        first = self.client.get(self.url)
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first["Content-Type"], "application/pdf")
+        self.assertEqual(len(self.cached_files()), 1)
+
+        with mock.patch("result.views.render_pdf") as render:
+            second = self.client.get(self.url)
+        render.assert_not_called()
+        self.assertEqual(second.getvalue(), first.getvalue())
+
+    def test_score_change_invalidates_cached_sheet(self):
+        first = self.client.get(self.url)
+        self.taken.final_exam = Decimal("40")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.taken.save()
+            # Still cached for readers until the change is committed.
+            self.assertEqual(len(self.cached_files()), 1)
+        self.assertEqual(self.cached_files(), [])
+
+        second = self.client.get(self.url)
+        self.assertNotEqual(second.getvalue(), first.getvalue())
+        self.assertEqual(len(self.cached_files()), 1)
@@ -0,0 +1,128 @@
+from decimal import Decimal
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.test.utils import override_settings
+from django.urls import reverse
+
+from accounts.models import Student
+from core.models import Semester, Session
+from course.models import Course, CourseAllocation, Program
+from result.models import TakenCourse
+from result.statistics import course_statistics
+
+User = get_user_model()
+
+
+@override_settings(
+    STATICFILES_STORAGE="django.contrib.staticfiles.storage.StaticFilesStorage",
+    MIDDLEWARE=[
+        m
+        for m in settings.MIDDLEWARE
+        if m
+        not in [
+            "django.middleware.locale.LocaleMiddleware",
+            "whitenoise.middleware.WhiteNoiseMiddleware",
+        ]
+    ],
+    LANGUAGE_CODE="en-us",
+)
+class CourseStatisticsTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.lecturer = User.objects.create_user(username="lecturer", is_lecturer=True)
+        self.session = Session.objects.create(
+            session="2024-2025", is_current_session=True
+        )
+        Semester.objects.create(
+            semester="First", is_current_semester=True, session=self.session
+        )
+        self.program = Program.objects.create(title="Computer Science")
+        self.allocation = CourseAllocation.objects.create(
+            lecturer=self.lecturer, session=self.session
+        )
+        self.course = self.make_course("CS201", [40, 60, 80])
+
+    def make_course(self, code, totals):
+        course = Course.objects.create(
+            title=code,
+            code=code,
+            credit=3,
+            semester="First",
+            level="Bachelor",
+            program=self.program,
+        )
+        self.allocation.courses.add(course)
+        for total in totals:
+            student = Student.objects.create(
+                student=User.objects.create_user(username=f"{code}-{total}"),
+                program=self.program,
+                level="Bachelor",
+            )
+            TakenCourse.objects.create(
+                student=student, course=course, final_exam=Decimal(total)
+            )
+        return course
+
+    def test_statistics_of_a_course(self):
+        stats = course_statistics([self.course.pk])[self.course.pk]
+        self.assertEqual(stats["count"], 3)
+        self.assertEqual(stats["mean"], 60.0)
+        self.assertEqual(stats["median"], 60.0)
+        self.assertEqual(stats["stddev"], 16.33)
+        self.assertEqual(stats["passed"], 2)
+        self.assertEqual(stats["failed"], 1)
+        self.assertEqual(stats["pass_rate"], 66.67)
+        self.assertEqual(stats["grades"]["F"], 1)
+        self.assertEqual(stats["grades"]["C+"], 1)
+        self.assertEqual(stats["grades"]["A-"], 1)
+        self.assertEqual(stats["grades"]["A+"], 0)
+
+    def test_bulk_computation_and_cache(self):
+        other = self.make_course("CS202", [50, 90])
+        empty = self.make_course("CS203", [])
+        ids = [self.course.pk, other.pk, empty.pk]
+        with self.assertNumQueries(2):
+            stats = course_statistics(ids)
+        self.assertEqual(stats[other.pk]["median"], 70.0)
+        self.assertEqual(stats[empty.pk]["count"], 0)
+        with self.assertNumQueries(0):
+            course_statistics(ids)
+
+    def test_score_changes_invalidate_the_cache(self):
+        course_statistics([self.course.pk])
+        taken = TakenCourse.objects.filter(course=self.course).first()
+        taken.final_exam = Decimal("100")
+        with mock.patch(
+            "result.cache.invalidate_result_sheets"
+        ) as invalidate_sheets, self.captureOnCommitCallbacks(execute=True):
+            taken.save()
+            taken.save()
+        invalidate_sheets.assert_called_once()
+        self.assertIn(self.course.pk, invalidate_sheets.call_args.args[0])
+        self.assertEqual(
+            course_statistics([self.course.pk])[self.course.pk]["mean"], 80.0
+        )
+
+    def test_json_endpoint_and_add_score_page(self):
+        self.make_course("MA101", [70])
+        Course.objects.create(
+            title="Not mine",
+            code="XX101",
+            credit=3,
+            semester="First",
+            level="Bachelor",
+            program=self.program,
+        )
+        client = Client()
+        client.force_login(self.lecturer)
+        data = client.get(reverse("course_statistics_json")).json()
+        self.assertEqual(sorted(course["count"] for course in data["courses"]), [1, 3])
+
+        response = client.get(reverse("add_score_for", kwargs={"id": self.course.pk}))
+        self.assertEqual(response.context["statistics"]["count"], 3)
+        self.assertContains(response, "66.67%")
@@ -0,0 +1,102 @@
+from decimal import Decimal
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+
+from accounts.models import Student
+from core.models import Semester, Session
+from course.models import Course, Program
+from result.models import Result, TakenCourse
+
+User = get_user_model()
+
+
+@override_settings(
+    STATICFILES_STORAGE="django.contrib.staticfiles.storage.StaticFilesStorage",
+    MIDDLEWARE=[
+        m
+        for m in settings.MIDDLEWARE
+        if m
+        not in [
+            "django.middleware.locale.LocaleMiddleware",
+            "whitenoise.middleware.WhiteNoiseMiddleware",
+        ]
+    ],
+    LANGUAGE_CODE="en-us",
+)
+class StudentResultViewsTest(TestCase):
+    def setUp(self):
+        session = Session.objects.create(session="2024-2025", is_current_session=True)
+        Semester.objects.create(
+            semester="First", is_current_semester=True, session=session
+        )
+        self.program = Program.objects.create(title="Computer Science")
+        user = User.objects.create_user(username="student", is_student=True)
+        self.student = Student.objects.create(
+            student=user, program=self.program, level="Bachelor"
+        )
+        Result.objects.create(
+            student=self.student,
+            gpa=3.0,
+            cgpa=3.0,
+            semester="First",
+            session="2024-2025",
+            level="Bachelor",
+        )
+        Result.objects.create(
+            student=self.student,
+            gpa=3.5,
+            cgpa=3.25,
+            semester="Second",
+            session="2024-2025",
+            level="Bachelor",
+        )
+        self.client = Client()
+        self.client.force_login(user)
+
+    def enroll(self, count):
+        start = Course.objects.count()
+        for i in range(start, start + count):
+            course = Course.objects.create(
+                title=f"Course {i}",
+                code=f"CS{i:03d}",
+                credit=3 if i % 2 else 2,
+                semester="First" if i % 2 else "Second",
+                level="Bachelor",
+                program=self.program,
+            )
+            TakenCourse.objects.create(
+                student=self.student, course=course, final_exam=Decimal("60")
+            )
+
+    def count_queries(self, url_name):
+        # Start from a cold cache so every request takes the same path.
+        cache.clear()
+        self.addCleanup(cache.clear)
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse(url_name))
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries), response
+
+    def test_grade_result_totals(self):
+        self.enroll(5)
+        _, response = self.count_queries("grade_results")
+        self.assertEqual(response.context["total_first_semester_credit"], 6)
+        self.assertEqual(response.context["total_sec_semester_credit"], 6)
+        self.assertEqual(response.context["total_first_and_second_semester_credit"], 12)
+        self.assertEqual(response.context["previousCGPA"], 3.25)
+
+    def test_query_count_does_not_grow_with_courses(self):
+        for url_name in ("grade_results", "ass_results"):
+            with self.subTest(url_name=url_name):
+                TakenCourse.objects.all().delete()
+                self.enroll(2)
+                few, _ = self.count_queries(url_name)
+                self.enroll(10)
+                many, _ = self.count_queries(url_name)
+                self.assertEqual(few, many)
@@ -0,0 +1,116 @@
+import json
+from decimal import Decimal
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+
+from accounts.models import Student
+from core.models import Semester, Session
+from course.models import Course, Program
+from result.models import TakenCourse
+
+User = get_user_model()
+
+
+@override_settings(
+    STATICFILES_STORAGE="django.contrib.staticfiles.storage.StaticFilesStorage",
+    MIDDLEWARE=[
+        m
+        for m in settings.MIDDLEWARE
+        if m
+        not in [
+            "django.middleware.locale.LocaleMiddleware",
+            "whitenoise.middleware.WhiteNoiseMiddleware",
+        ]
+    ],
+    LANGUAGE_CODE="en-us",
+)
+class WhatIfGPATest(TestCase):
+    def setUp(self):
+        session = Session.objects.create(session="2024-2025", is_current_session=True)
+        Semester.objects.create(
+            semester="First", is_current_semester=True, session=session
+        )
+        self.program = Program.objects.create(title="Computer Science")
+        user = User.objects.create_user(username="student", is_student=True)
+        self.student = Student.objects.create(
+            student=user, program=self.program, level="Bachelor"
+        )
+        self.algorithms = self.take("CS201", 3, "First", 60)
+        self.take("CS202", 2, "First", 90)
+        self.take("CS101", 4, "Second", 70)
+        self.client = Client()
+        self.client.force_login(user)
+
+    def take(self, code, credit, semester, final_exam, student=None):
+        course = Course.objects.create(
+            title=code,
+            code=code,
+            credit=credit,
+            semester=semester,
+            level="Bachelor",
+            program=self.program,
+        )
+        return TakenCourse.objects.create(
+            student=student or self.student,
+            course=course,
+            final_exam=Decimal(final_exam),
+        )
+
+    def post(self, scores):
+        return self.client.post(
+            reverse("what_if_gpa"),
+            json.dumps({"scores": scores}),
+            content_type="application/json",
+        )
+
+    def test_projects_grade_gpa_and_cgpa(self):
+        response = self.post({self.algorithms.pk: {"final_exam": 85}})
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        course = data["courses"][0]
+        self.assertEqual(course["current"]["grade"], "C+")
+        self.assertEqual(course["projected"]["grade"], "A")
+        self.assertEqual(course["projected"]["point"], "12.00")
+        # (7.5 + 8) / 5 now, (12 + 8) / 5 projected
+        self.assertEqual(data["gpa"], {"current": "3.10", "projected": "4.00"})
+        # plus 12 points over 4 credits from the second semester
+        self.assertEqual(data["cgpa"], {"current": "3.06", "projected": "3.56"})
+
+        self.algorithms.refresh_from_db()
+        self.assertEqual(self.algorithms.final_exam, Decimal("60.00"))
+        self.assertEqual(self.algorithms.grade, "C+")
+
+    def test_query_count_does_not_grow_with_history(self):
+        scores = {self.algorithms.pk: {"final_exam": 85}}
+        self.post(scores)  # warm up the grading tables
+        with CaptureQueriesContext(connection) as few:
+            self.post(scores)
+        for i in range(10):
+            self.take(f"CS3{i:02d}", 3, "Second", 50)
+        with CaptureQueriesContext(connection) as many:
+            self.post(scores)
+        self.assertEqual(len(few), len(many))
+
+    def test_invalid_requests(self):
+        other = Student.objects.create(
+            student=User.objects.create_user(username="other"),
+            program=self.program,
+            level="Bachelor",
+        )
+        foreign = self.take("CS900", 3, "First", 50, student=other)
+        for scores in (
+            {foreign.pk: {"final_exam": 80}},
+            {self.algorithms.pk: {"final_exam": "abc"}},
+            {self.algorithms.pk: {"final_exam": 150}},
+            {self.algorithms.pk: {"bonus": 10}},
+            {"x": {"final_exam": 10}},
+            {},
+        ):
+            with self.subTest(scores=scores):
+                self.assertEqual(self.post(scores).status_code, 400)
+        self.assertEqual(self.client.get(reverse("what_if_gpa")).status_code, 405)
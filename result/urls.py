@@ -2,20 +2,50 @@ from django.urls import path
 from .views import (
     add_score,
     add_score_for,
+    import_scores_for,
+    course_statistics_json,
+    deans_list_json,
     grade_result,
+    what_if_gpa,
     assessment_result,
     course_registration_form,
     result_sheet_pdf_view,
+    export_results,
+    result_sheet_pdf_job,
+    course_registration_form_job,
+    pdf_job_status,
+    pdf_job_download,
 )
 
 
 urlpatterns = [
     path("manage-score/", add_score, name="add_score"),
     path("manage-score/<int:id>/", add_score_for, name="add_score_for"),
+    path("manage-score/<int:id>/import/", import_scores_for, name="import_scores_for"),
+    path(
+        "manage-score/statistics/",
+        course_statistics_json,
+        name="course_statistics_json",
+    ),
+    path("deans-list/", deans_list_json, name="deans_list_json"),
     path("grade/", grade_result, name="grade_results"),
+    path("grade/what-if/", what_if_gpa, name="what_if_gpa"),
     path("assessment/", assessment_result, name="ass_results"),
     path("result/print/<int:id>/", result_sheet_pdf_view, name="result_sheet_pdf_view"),
     path(
         "registration/form/", course_registration_form, name="course_registration_form"
     ),
+    path("export/", export_results, name="export_results"),
+    path(
+        "result/print/<int:id>/job/",
+        result_sheet_pdf_job,
+        name="result_sheet_pdf_job",
+    ),
+    path(
+        "registration/form/job/",
+        course_registration_form_job,
+        name="course_registration_form_job",
+    ),
+    path("pdf-jobs/<int:pk>/", pdf_job_status, name="pdf_job_status"),
+    path("pdf-jobs/<int:pk>/download/", pdf_job_download, name="pdf_job_download"),
 ]
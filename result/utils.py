@@ -0,0 +1,379 @@
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+from itertools import repeat
+from operator import mul
+
+from django.db import transaction
+from django.db.models import F, Sum
+
+from .cache import invalidate_course_statistics, invalidate_result_sheets
+from .models import F as F_GRADE
+from .models import (
+    FAIL,
+    NG,
+    MAX_COMPONENT_SCORE,
+    PASS,
+    SCORE_FIELDS,
+    TWO_PLACES,
+    AssessmentScheme,
+    GradeAggregate,
+    GradingScheme,
+    Result,
+    SemesterFinalization,
+    TakenCourse,
+    gpa_from_totals,
+    grade_from_table,
+)
+
+GRADED_FIELDS = ("total", "grade", "point", "comment")
+
+
+def parse_score(value):
+    """
+    Convert a raw score submitted by a lecturer into a Decimal,
+    raising ValueError when it is not a number between 0 and 100.
+    """
+    try:
+        score = Decimal(str(value).strip())
+    except (InvalidOperation, TypeError):
+        raise ValueError(f"'{value}' is not a number")
+    if not score.is_finite() or score < 0 or score > MAX_COMPONENT_SCORE:
+        raise ValueError(f"'{value}' must be between 0 and {MAX_COMPONENT_SCORE}")
+    return score.quantize(TWO_PLACES)
+
+
+def parse_score_row(values):
+    """Parse one student's list of component scores (in SCORE_FIELDS order)."""
+    if len(values) != len(SCORE_FIELDS):
+        raise ValueError(f"expected {len(SCORE_FIELDS)} scores, got {len(values)}")
+    return [parse_score(value) for value in values]
+
+
+def check_maxima(scores, evaluator):
+    """Raise ValueError when a score exceeds its component's maximum."""
+    _factors, maxima = evaluator
+    for field, score, maximum in zip(SCORE_FIELDS, scores, maxima):
+        if score > maximum:
+            raise ValueError(f"{field} must not be more than {maximum}")
+
+
+def weighted_totals(columns, evaluator):
+    """
+    Totals of a batch of rows of one course. ``columns`` holds one sequence
+    of scores per entry of SCORE_FIELDS; each column is scaled by its
+    component's factor as a whole, and unweighted columns are left as is.
+    """
+    factors, _maxima = evaluator
+    scaled = [
+        column if factor == 1 else list(map(mul, column, repeat(factor)))
+        for column, factor in zip(columns, factors)
+    ]
+    return [
+        Decimal(sum(row)).quantize(TWO_PLACES, ROUND_HALF_UP) for row in zip(*scaled)
+    ]
+
+
+def grade_taken_course(taken_course, scores, table=None, evaluator=None):
+    """
+    Assign component scores to a TakenCourse and compute total, grade,
+    point and comment in memory. Nothing is written to the database.
+    """
+    table = table or taken_course.grading_table()
+    for field, score in zip(SCORE_FIELDS, scores):
+        setattr(taken_course, field, score)
+    taken_course.total = taken_course.get_total(evaluator)
+    taken_course.grade = taken_course.get_grade(table)
+    taken_course.point = taken_course.get_point(table)
+    taken_course.comment = taken_course.get_comment()
+    return taken_course
+
+
+def project_gpa(student, scores, semester):
+    """
+    What-if grading for a student. ``scores`` maps ids of the student's
+    TakenCourse rows to ``{component: score}`` dicts; components left out
+    keep their stored value. The courses are graded in memory and the
+    point differences applied to the student's grade aggregates, so the
+    cost doesn't depend on the length of their history. Nothing is written.
+    Returns ``(projection, errors)`` where ``errors`` is a list of
+    ``(taken_course_id, message)`` tuples.
+    """
+    errors = []
+    parsed = {}
+    for pk, components in scores.items():
+        if not str(pk).isdigit() or not isinstance(components, dict):
+            errors.append((pk, "expected a TakenCourse id and a dict of scores"))
+            continue
+        unknown = set(components) - set(SCORE_FIELDS)
+        if unknown:
+            errors.append((pk, f"unknown component(s): {', '.join(sorted(unknown))}"))
+            continue
+        try:
+            parsed[int(pk)] = {
+                field: parse_score(value) for field, value in components.items()
+            }
+        except ValueError as e:
+            errors.append((pk, str(e)))
+
+    rows = TakenCourse.objects.filter(student=student, pk__in=parsed).select_related(
+        "course"
+    )
+    rows = {tc.pk: tc for tc in rows}
+    errors += [(pk, "not one of your courses") for pk in parsed if pk not in rows]
+    if errors:
+        return None, errors
+
+    tables = GradingScheme.objects.tables()
+    evaluators = AssessmentScheme.objects.evaluators()
+    graded = []
+    for pk, components in parsed.items():
+        taken_course = rows[pk]
+        evaluator = AssessmentScheme.objects.evaluator_for(
+            taken_course.course_id, evaluators
+        )
+        row = [
+            components.get(field, getattr(taken_course, field))
+            for field in SCORE_FIELDS
+        ]
+        try:
+            check_maxima(row, evaluator)
+        except ValueError as e:
+            errors.append((pk, str(e)))
+        graded.append((taken_course, row, evaluator))
+    if errors:
+        return None, errors
+
+    courses = []
+    deltas = {}
+    for taken_course, row, evaluator in graded:
+        pk = taken_course.pk
+        current = (taken_course.total, taken_course.grade, taken_course.point)
+        table = GradingScheme.objects.table_for(
+            taken_course.course.program_id, taken_course.course.level, tables
+        )
+        grade_taken_course(taken_course, row, table, evaluator)
+        key = taken_course.aggregate_key()
+        points = deltas.get(key, Decimal("0"))
+        deltas[key] = points + taken_course.point - current[2]
+        courses.append(
+            {
+                "id": pk,
+                "course": taken_course.course.code,
+                "current": {
+                    "total": current[0],
+                    "grade": current[1],
+                    "point": current[2],
+                },
+                "projected": {
+                    "total": taken_course.total.quantize(TWO_PLACES),
+                    "grade": taken_course.grade,
+                    "point": taken_course.point.quantize(TWO_PLACES),
+                    "comment": taken_course.comment,
+                },
+            }
+        )
+
+    semester_key = (student.pk, student.level, str(semester))
+    totals = {semester_key: (Decimal("0"), 0)}
+    for aggregate in GradeAggregate.objects.filter(student=student):
+        totals[(student.pk, aggregate.level, aggregate.semester)] = (
+            aggregate.total_points,
+            aggregate.total_credits,
+        )
+    projected = {
+        key: (points + deltas.get(key, 0), credits)
+        for key, (points, credits) in totals.items()
+    }
+
+    def cumulative(totals):
+        return gpa_from_totals(
+            sum(points for points, _credits in totals.values()),
+            sum(credits for _points, credits in totals.values()),
+        )
+
+    projection = {
+        "level": student.level,
+        "semester": str(semester),
+        "courses": courses,
+        "gpa": {
+            "current": gpa_from_totals(*totals[semester_key]),
+            "projected": gpa_from_totals(*projected[semester_key]),
+        },
+        "cgpa": {
+            "current": cumulative(totals),
+            "projected": cumulative(projected),
+        },
+    }
+    return projection, []
+
+
+def score_course(course, scores, semester, session):
+    """
+    Bulk score entry for a single course.
+
+    ``scores`` maps TakenCourse ids to a list of raw component scores.
+    All TakenCourse rows of the course are loaded in one query, graded in
+    memory and written back with a single bulk update, then the Result rows
+    of the affected students are refreshed. Returns ``(updated, errors)``
+    where ``errors`` is a list of ``(taken_course_id, message)`` tuples.
+    """
+    rows = {tc.pk: tc for tc in course.taken_courses.select_related("student__student")}
+    table = GradingScheme.objects.table_for(course.program_id, course.level)
+    evaluator = AssessmentScheme.objects.evaluator_for(course.pk)
+    updated = []
+    score_rows = []
+    errors = []
+    for pk, values in scores.items():
+        taken_course = rows.get(int(pk))
+        if taken_course is None:
+            errors.append((pk, "student is not registered for this course"))
+            continue
+        try:
+            parsed = parse_score_row(values)
+            check_maxima(parsed, evaluator)
+        except ValueError as e:
+            errors.append((pk, f"{taken_course.student.student.username}: {e}"))
+            continue
+        updated.append(taken_course)
+        score_rows.append(parsed)
+
+    # Grade the whole course column-wise rather than row by row.
+    columns = list(zip(*score_rows)) or [()] * len(SCORE_FIELDS)
+    totals = weighted_totals(columns, evaluator)
+    graded = grade_batch(totals, [course.credit] * len(totals), [table] * len(totals))
+    deltas = {}
+    for taken_course, row, values in zip(updated, score_rows, zip(*graded)):
+        old_point = taken_course.point
+        for field, score in zip(SCORE_FIELDS, row):
+            setattr(taken_course, field, score)
+        for field, value in zip(GRADED_FIELDS, values):
+            setattr(taken_course, field, value)
+        deltas[taken_course.aggregate_key()] = (taken_course.point - old_point, 0)
+
+    if updated:
+        with transaction.atomic():
+            TakenCourse.objects.bulk_update(
+                updated, SCORE_FIELDS + GRADED_FIELDS, batch_size=500
+            )
+            GradeAggregate.objects.apply_deltas(deltas)
+            refresh_results([tc.student for tc in updated], semester, session)
+        invalidate_result_sheets([course.pk])
+        invalidate_course_statistics([course.pk])
+    return len(updated), errors
+
+
+def refresh_results(students, semester, session):
+    """
+    Upsert the Result rows of the given students for ``semester``/``session``
+    from their grade aggregates using a fixed number of queries. Rows of a
+    finalized semester are left untouched.
+    """
+    students = {student.pk: student for student in students}
+    if not students:
+        return
+
+    gpas = {}
+    totals = {}
+    for aggregate in GradeAggregate.objects.filter(student__in=students):
+        student = students[aggregate.student_id]
+        if (aggregate.level, aggregate.semester) == (student.level, str(semester)):
+            gpas[aggregate.student_id] = aggregate.gpa
+        points, credits = totals.get(aggregate.student_id, (0, 0))
+        totals[aggregate.student_id] = (
+            points + aggregate.total_points,
+            credits + aggregate.total_credits,
+        )
+
+    Result.objects.upsert(
+        [
+            Result(
+                student=student,
+                gpa=gpas.get(pk, Decimal("0.00")),
+                cgpa=gpa_from_totals(*totals.get(pk, (0, 0))),
+                semester=str(semester),
+                session=str(session),
+                level=student.level,
+            )
+            for pk, student in students.items()
+        ],
+        ["gpa", "cgpa"],
+    )
+
+
+def finalize_semester(semester, user=None):
+    """
+    Close ``semester`` (a core Semester): lock its TakenCourse rows, compute
+    every student's Result from them with grouped aggregates and store the
+    rows under a SemesterFinalization snapshot. Finalizing again replaces
+    the snapshot.
+    """
+    session = str(semester.session)
+    taken_courses = TakenCourse.objects.filter(
+        course__semester=semester.semester, course__level=F("student__level")
+    )
+    with transaction.atomic():
+        # Scores can't change under the snapshot while it is being taken.
+        list(taken_courses.select_for_update(of=("self",)).values_list("pk"))
+
+        semester_totals = (
+            taken_courses.values_list("student_id", "student__level")
+            .annotate(points=Sum("point"), credits=Sum("course__credit"))
+            .order_by()
+        )
+        cumulative = {
+            student_id: gpa_from_totals(points, credits)
+            for student_id, points, credits in TakenCourse.objects.filter(
+                student_id__in=taken_courses.values("student_id")
+            )
+            .values_list("student_id")
+            .annotate(points=Sum("point"), credits=Sum("course__credit"))
+            .order_by()
+        }
+        results = [
+            Result(
+                student_id=student_id,
+                gpa=gpa_from_totals(points, credits),
+                cgpa=cumulative[student_id],
+                semester=semester.semester,
+                session=session,
+                level=level,
+                total_points=points,
+                total_credits=credits,
+            )
+            for student_id, level, points, credits in semester_totals
+        ]
+        finalization, _created = SemesterFinalization.objects.update_or_create(
+            semester=semester.semester,
+            session=session,
+            defaults={
+                "finalized_by": user,
+                "students": len(results),
+                "courses": taken_courses.values("course").distinct().count(),
+            },
+        )
+        for result in results:
+            result.finalization = finalization
+        Result.objects.upsert(
+            results,
+            ["gpa", "cgpa", "total_points", "total_credits", "finalization"],
+            include_finalized=True,
+        )
+    return finalization
+
+
+def grade_batch(totals, credits, tables):
+    """
+    Grade a batch of rows column-wise.
+
+    ``totals``, ``credits`` and ``tables`` hold the total, course credit and
+    compiled grading table of every row. Returns parallel lists of totals,
+    grades, points and comments.
+    """
+    row_grades = [
+        grade_from_table(total, table) for total, table in zip(totals, tables)
+    ]
+    row_points = [
+        Decimal(credit) * table[2].get(grade, Decimal("0"))
+        for credit, grade, table in zip(credits, row_grades, tables)
+    ]
+    comments = [FAIL if grade in (F_GRADE, NG) else PASS for grade in row_grades]
+    return totals, row_grades, row_points, comments
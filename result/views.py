@@ -1,14 +1,23 @@
+import json
+
 from django.shortcuts import render, get_object_or_404
 from django.contrib import messages
-from django.http import HttpResponseRedirect
-from django.urls import reverse_lazy
+from django.http import (
+    FileResponse,
+    HttpResponseBadRequest,
+    HttpResponseRedirect,
+    JsonResponse,
+    StreamingHttpResponse,
+)
+from django.urls import reverse, reverse_lazy
+from django.utils import timezone
+from django.db.models import Q, Sum
+from django.db.models.functions import Coalesce
+from django.views.decorators.http import require_POST
 from django.conf import settings
 from django.contrib.auth.decorators import login_required
-from django.core.files.storage import FileSystemStorage
-from django.http import HttpResponse
 
 from reportlab.platypus import (
-    SimpleDocTemplate,
     Paragraph,
     Spacer,
     Table,
@@ -20,13 +29,23 @@ from reportlab.lib.enums import TA_JUSTIFY, TA_LEFT, TA_CENTER, TA_RIGHT
 
 # from reportlab.platypus.tables import Table
 from reportlab.lib.units import inch
+from reportlab.pdfbase.pdfmetrics import stringWidth
 from reportlab.lib import colors
 
 from core.models import Session, Semester
 from course.models import Course
 from accounts.models import Student
-from accounts.decorators import lecturer_required, student_required
-from .models import TakenCourse, Result
+from accounts.decorators import admin_required, lecturer_required, student_required
+from .models import F as F_GRADE
+from .models import PDFJob, TakenCourse, Result
+from .cache import result_sheet_cache, result_sheet_namespace
+from .pdf import pdf_response, render_pdf
+from .exports import result_rows, stream_csv, stream_ndjson, taken_course_rows
+from .forms import ScoreImportForm
+from .imports import import_scores
+from .rankings import deans_list, rankings
+from .statistics import course_statistics
+from .utils import project_gpa, score_course
 
 
 CM = 2.54
@@ -95,6 +114,7 @@ def add_score_for(request, id):
             )
             .filter(course__id=id)
             .filter(course__semester=current_semester)
+            .select_related("student__student")
         )
         context = {
             "title": "Submit Score",
@@ -102,144 +122,187 @@ def add_score_for(request, id):
             "course": course,
             # "myclass": myclass,
             "students": students,
+            "statistics": course_statistics([course.pk])[course.pk],
             "current_session": current_session,
             "current_semester": current_semester,
         }
         return render(request, "result/add_score_for.html", context)
 
     if request.method == "POST":
-        ids = ()
+        course = get_object_or_404(Course, pk=id)
         data = request.POST.copy()
         data.pop("csrfmiddlewaretoken", None)  # remove csrf_token
-        for key in data.keys():
-            ids = ids + (
-                str(key),
-            )  # gather all the all students id (i.e the keys) in a tuple
-        for s in range(
-            0, len(ids)
-        ):  # iterate over the list of student ids gathered above
-            student = TakenCourse.objects.get(id=ids[s])
-            # print(student)
-            # print(student.student)
-            # print(student.student.program.id)
-            courses = (
-                Course.objects.filter(level=student.student.level)
-                .filter(program__pk=student.student.program.id)
-                .filter(semester=current_semester)
-            )  # all courses of a specific level in current semester
-            total_credit_in_semester = 0
-            for i in courses:
-                if i == courses.count():
-                    break
-                total_credit_in_semester += int(i.credit)
-            score = data.getlist(
-                ids[s]
-            )  # get list of score for current student in the loop
-            assignment = score[
-                0
-            ]  # subscript the list to get the fisrt value > ca score
-            mid_exam = score[1]  # do the same for exam score
-            quiz = score[2]
-            attendance = score[3]
-            final_exam = score[4]
-            obj = TakenCourse.objects.get(pk=ids[s])  # get the current student data
-            obj.assignment = assignment  # set current student assignment score
-            obj.mid_exam = mid_exam  # set current student mid_exam score
-            obj.quiz = quiz  # set current student quiz score
-            obj.attendance = attendance  # set current student attendance score
-            obj.final_exam = final_exam  # set current student final_exam score
-
-            obj.total = obj.get_total()
-            obj.grade = obj.get_grade()
-
-            # obj.total = obj.get_total(assignment, mid_exam, quiz, attendance, final_exam)
-            # obj.grade = obj.get_grade(assignment, mid_exam, quiz, attendance, final_exam)
-
-            obj.point = obj.get_point()
-            obj.comment = obj.get_comment()
-            # obj.carry_over(obj.grade)
-            # obj.is_repeating()
-            obj.save()
-            gpa = obj.calculate_gpa()
-            cgpa = obj.calculate_cgpa()
+        # every key is a TakenCourse id holding the list of component scores
+        scores = {key: data.getlist(key) for key in data.keys() if key.isdigit()}
+        updated, errors = score_course(
+            course, scores, current_semester, current_session
+        )
+        for _pk, error in errors:
+            messages.error(request, error)
+        if updated:
+            messages.success(request, "Successfully Recorded! ")
+        return HttpResponseRedirect(reverse_lazy("add_score_for", kwargs={"id": id}))
+    return HttpResponseRedirect(reverse_lazy("add_score_for", kwargs={"id": id}))
 
+
+@login_required
+@lecturer_required
+def course_statistics_json(request):
+    """
+    Class statistics of the courses allocated to the lecturer (every course
+    for an admin), or of the single ``course`` given in the query string
+    """
+    courses = Course.objects.all()
+    if not request.user.is_superuser:
+        courses = courses.filter(allocated_course__lecturer__pk=request.user.id)
+    if request.GET.get("course"):
+        if not request.GET["course"].isdigit():
+            return HttpResponseBadRequest("course must be an id")
+        courses = courses.filter(pk=request.GET["course"])
+    course_ids = list(courses.values_list("pk", flat=True).distinct())
+    statistics = course_statistics(course_ids)
+    return JsonResponse({"courses": [statistics[pk] for pk in course_ids]})
+
+
+@login_required
+@lecturer_required
+def deans_list_json(request):
+    """
+    The top ranked students of a ``program`` (optionally one ``level``) for
+    the current semester, or the ``semester`` and ``session`` given
+    """
+    program = request.GET.get("program", "")
+    if not program.isdigit():
+        return HttpResponseBadRequest("program must be an id")
+    level = request.GET.get("level") or None
+    if level is not None and level not in dict(settings.LEVEL_CHOICES):
+        return HttpResponseBadRequest("unknown level")
+    top = request.GET.get("top", str(settings.DEANS_LIST_SIZE))
+    if not top.isdigit():
+        return HttpResponseBadRequest("top must be a number")
+
+    semester = request.GET.get("semester")
+    session = request.GET.get("session")
+    if not (semester and session):
+        current_semester = get_object_or_404(
+            Semester.objects.select_related("session"), is_current_semester=True
+        )
+        semester = semester or current_semester.semester
+        session = session or str(current_semester.session)
+    students = deans_list(semester, session, int(program), level, int(top))
+    return JsonResponse(
+        {
+            "semester": semester,
+            "session": session,
+            "program": int(program),
+            "level": level,
+            "students": students,
+        }
+    )
+
+
+@login_required
+@lecturer_required
+def import_scores_for(request, id):
+    """
+    Lets a lecturer upload the scores of a course as a CSV or XLSX file
+    instead of typing them into the score form
+    """
+    current_session = Session.objects.get(is_current_session=True)
+    current_semester = get_object_or_404(
+        Semester, is_current_semester=True, session=current_session
+    )
+    course = get_object_or_404(Course, pk=id)
+    errors = None
+    if request.method == "POST":
+        form = ScoreImportForm(request.POST, request.FILES)
+        if form.is_valid():
             try:
-                a = Result.objects.get(
-                    student=student.student,
-                    semester=current_semester,
-                    session=current_session,
-                    level=student.student.level,
-                )
-                a.gpa = gpa
-                a.cgpa = cgpa
-                a.save()
-            except:
-                Result.objects.get_or_create(
-                    student=student.student,
-                    gpa=gpa,
-                    semester=current_semester,
-                    session=current_session,
-                    level=student.student.level,
+                updated, errors = import_scores(
+                    course, form.cleaned_data["file"], current_semester, current_session
                 )
+            except ValueError as e:
+                form.add_error("file", str(e))
+            else:
+                if updated:
+                    messages.success(
+                        request,
+                        f"Successfully recorded the scores of {updated} student(s).",
+                    )
+                if not errors:
+                    return HttpResponseRedirect(
+                        reverse_lazy("add_score_for", kwargs={"id": id})
+                    )
+                messages.error(request, f"{len(errors)} row(s) could not be imported.")
+    else:
+        form = ScoreImportForm()
 
-            # try:
-            #     a = Result.objects.get(student=student.student,
-            # semester=current_semester, level=student.student.level)
-            #     a.gpa = gpa
-            #     a.cgpa = cgpa
-            #     a.save()
-            # except:
-            #     Result.objects.get_or_create(student=student.student, gpa=gpa,
-            # semester=current_semester, level=student.student.level)
-
-        messages.success(request, "Successfully Recorded! ")
-        return HttpResponseRedirect(reverse_lazy("add_score_for", kwargs={"id": id}))
-    return HttpResponseRedirect(reverse_lazy("add_score_for", kwargs={"id": id}))
+    context = {
+        "title": "Import Scores",
+        "course": course,
+        "form": form,
+        "errors": errors,
+        "current_session": current_session,
+        "current_semester": current_semester,
+    }
+    return render(request, "result/import_scores.html", context)
 
 
 # ########################################################
 
 
+def _student_courses(student):
+    return (
+        TakenCourse.objects.filter(student=student, course__level=student.level)
+        .select_related("course")
+        .order_by("pk")
+    )
+
+
 @login_required
 @student_required
 def grade_result(request):
     student = Student.objects.get(student__pk=request.user.id)
-    courses = TakenCourse.objects.filter(student__student__pk=request.user.id).filter(
-        course__level=student.level
-    )
-    # total_credit_in_semester = 0
-    results = Result.objects.filter(student__student__pk=request.user.id)
+    courses = _student_courses(student)
+    results = list(Result.objects.filter(student=student))
 
-    result_set = set()
+    sorted_result = sorted({result.session for result in results})
 
-    for result in results:
-        result_set.add(result.session)
-
-    sorted_result = sorted(result_set)
+    # Finalized semesters carry their credit totals in the snapshot.
+    snapshot = {
+        result.semester.lower(): result.total_credits
+        for result in results
+        if result.finalization_id and result.level == student.level
+    }
+    if snapshot.keys() >= {"first", "second"}:
+        credits = snapshot
+    else:
+        credits = courses.aggregate(
+            first=Coalesce(
+                Sum("course__credit", filter=Q(course__semester="First")), 0
+            ),
+            second=Coalesce(
+                Sum("course__credit", filter=Q(course__semester="Second")), 0
+            ),
+        )
+    total_first_semester_credit = credits["first"]
+    total_sec_semester_credit = credits["second"]
 
-    total_first_semester_credit = 0
-    total_sec_semester_credit = 0
-    for i in courses:
-        if i.course.semester == "First":
-            total_first_semester_credit += int(i.course.credit)
-        if i.course.semester == "Second":
-            total_sec_semester_credit += int(i.course.credit)
+    periods = {result.pk: (result.semester, str(result.session)) for result in results}
+    ranks = rankings(periods.values())
+    for result in results:
+        result.ranking = ranks[periods[result.pk]].get(student.pk)
 
+    # The CGPA carried over is the one recorded at the end of the second
+    # semester of the level of the first result that has exactly one.
     previousCGPA = 0
-    # previousLEVEL = 0
-    # calculate_cgpa
     for i in results:
-        previousLEVEL = i.level
-        try:
-            a = Result.objects.get(
-                student__student__pk=request.user.id,
-                level=previousLEVEL,
-                semester="Second",
-            )
-            previousCGPA = a.cgpa
+        second_semester = [
+            r for r in results if r.level == i.level and r.semester == "Second"
+        ]
+        if len(second_semester) == 1:
+            previousCGPA = second_semester[0].cgpa
             break
-        except:
-            previousCGPA = 0
 
     context = {
         "courses": courses,
@@ -256,14 +319,38 @@ def grade_result(request):
     return render(request, "result/grade_results.html", context)
 
 
+@require_POST
+@login_required
+@student_required
+def what_if_gpa(request):
+    """
+    Projects the grades, GPA and CGPA a student would get with the
+    hypothetical scores posted as ``{"scores": {taken_course_id: {component:
+    score}}}``. Nothing is saved.
+    """
+    try:
+        scores = json.loads(request.body)["scores"]
+    except (ValueError, KeyError, TypeError):
+        return HttpResponseBadRequest("expected a JSON object with 'scores'")
+    if not isinstance(scores, dict) or not scores:
+        return HttpResponseBadRequest("'scores' must be a non-empty object")
+    student = get_object_or_404(Student, student__pk=request.user.id)
+    current_semester = get_object_or_404(Semester, is_current_semester=True)
+    projection, errors = project_gpa(student, scores, current_semester)
+    if errors:
+        return JsonResponse(
+            {"errors": [{"id": pk, "error": error} for pk, error in errors]},
+            status=400,
+        )
+    return JsonResponse(projection)
+
+
 @login_required
 @student_required
 def assessment_result(request):
     student = Student.objects.get(student__pk=request.user.id)
-    courses = TakenCourse.objects.filter(
-        student__student__pk=request.user.id, course__level=student.level
-    )
-    result = Result.objects.filter(student__student__pk=request.user.id)
+    courses = _student_courses(student)
+    result = Result.objects.filter(student=student)
 
     context = {
         "courses": courses,
@@ -279,10 +366,10 @@ def assessment_result(request):
 def result_sheet_pdf_view(request, id):
     current_semester = Semester.objects.get(is_current_semester=True)
     current_session = Session.objects.get(is_current_session=True)
-    result = TakenCourse.objects.filter(course__pk=id)
     course = get_object_or_404(Course, id=id)
-    no_of_pass = TakenCourse.objects.filter(course__pk=id, comment="PASS").count()
-    no_of_fail = TakenCourse.objects.filter(course__pk=id, comment="FAIL").count()
+    result = list(
+        course.taken_courses.select_related("student__student").order_by("pk")
+    )
     fname = (
         str(current_semester)
         + "_semester_"
@@ -292,15 +379,125 @@ def result_sheet_pdf_view(request, id):
         + "_resultSheet.pdf"
     )
     fname = fname.replace("/", "-")
-    flocation = settings.MEDIA_ROOT + "/result_sheet/" + fname
-
-    doc = SimpleDocTemplate(
-        flocation,
-        rightMargin=0,
-        leftMargin=6.5 * CM,
-        topMargin=0.3 * CM,
-        bottomMargin=0,
+
+    # The sheet only changes when one of the rows it prints changes, so it is
+    # cached under a fingerprint of everything that ends up in the PDF.
+    cache = result_sheet_cache()
+    namespace = result_sheet_namespace(course.pk)
+    key = cache.make_key(
+        course.pk,
+        course,
+        course.level,
+        current_semester,
+        current_session,
+        request.user.get_full_name,
+        *[
+            (
+                row.pk,
+                row.student.student.username,
+                row.student.student.get_full_name,
+                row.total,
+                row.grade,
+                row.point,
+                row.comment,
+            )
+            for row in result
+        ],
     )
+    content = cache.get(namespace, key)
+    if content is None:
+        story = result_sheet_story(
+            course,
+            result,
+            current_semester,
+            current_session,
+            request.user.get_full_name,
+        )
+        content = render_pdf(story, **RESULT_SHEET_LAYOUT).read()
+        cache.set(namespace, key, content)
+    return pdf_response(content, fname)
+
+
+RESULT_SHEET_LAYOUT = dict(
+    rightMargin=0, leftMargin=6.5 * CM, topMargin=0.3 * CM, bottomMargin=0
+)
+
+
+RESULT_SHEET_HEADER = (
+    "S/N",
+    "ID NO.",
+    "FULL NAME",
+    "TOTAL",
+    "GRADE",
+    "POINT",
+    "COMMENT",
+)
+RESULT_SHEET_TABLE_STYLE = (
+    ("BACKGROUND", (0, 0), (-1, 0), colors.black),
+    ("TEXTCOLOR", (1, 0), (-1, 0), colors.white),
+    ("TEXTCOLOR", (0, 0), (0, 0), colors.cyan),
+    ("ALIGN", (0, 0), (-1, 0), "CENTER"),
+    ("VALIGN", (0, 0), (-1, 0), "MIDDLE"),
+    ("BOX", (0, 0), (-1, 0), 1, colors.black),
+    ("INNERGRID", (0, 1), (-1, -1), 0.05, colors.black),
+    ("BOX", (0, 1), (-1, -1), 0.1, colors.black),
+)
+RESULT_SHEET_ROW_HEIGHT = 0.25 * inch
+RESULT_SHEET_NAME_STYLE = ParagraphStyle(
+    name="ResultSheetName", parent=getSampleStyleSheet()["Normal"]
+)
+
+
+def result_sheet_table(result):
+    """
+    Lay out the result rows as one table whose header row is repeated on
+    every page. Failed rows are printed in red.
+
+    Names that fit on one line are drawn as plain strings in a fixed-height
+    row, so ReportLab only has to wrap (and re-measure when the table is
+    split across pages) the few names that need more than one line.
+    """
+    name_width = inch - 12  # column width minus the default cell padding
+    data = [RESULT_SHEET_HEADER]
+    heights = [0.5 * inch]
+    commands = list(RESULT_SHEET_TABLE_STYLE)
+    for count, row in enumerate(result, 1):
+        user = row.student.student
+        name = user.get_full_name.capitalize()
+        if stringWidth(name, "Helvetica", 10) <= name_width:
+            heights.append(RESULT_SHEET_ROW_HEIGHT)
+        else:
+            name = Paragraph(name, RESULT_SHEET_NAME_STYLE)
+            heights.append(None)
+        data.append(
+            (
+                count,
+                user.username.upper(),
+                name,
+                row.total,
+                row.grade,
+                row.point,
+                row.comment,
+            )
+        )
+        if row.grade == F_GRADE:
+            commands.append(("TEXTCOLOR", (0, count), (-1, count), colors.red))
+    table = Table(
+        data,
+        colWidths=len(RESULT_SHEET_HEADER) * [inch],
+        rowHeights=heights,
+        repeatRows=1,
+    )
+    table.setStyle(TableStyle(commands))
+    return table
+
+
+def result_sheet_story(
+    course, result, current_semester, current_session, lecturer_name
+):
+    no_of_pass = sum(1 for row in result if row.comment == "PASS")
+    no_of_fail = sum(1 for row in result if row.comment == "FAIL")
+
     styles = getSampleStyleSheet()
     styles.add(
         ParagraphStyle(name="ParagraphTitle", fontSize=11, fontName="FreeSansBold")
@@ -320,8 +517,6 @@ def result_sheet_pdf_view(request, id):
     # im_logo.__setattr__("_offs_y", -60)
     # Story.append(im_logo)
 
-    print("\nsettings.MEDIA_ROOT", settings.MEDIA_ROOT)
-    print("\nsettings.STATICFILES_DIRS[0]", settings.STATICFILES_DIRS[0])
     logo = settings.STATICFILES_DIRS[0] + "/img/brand.png"
     im = Image(logo, 1 * inch, 1 * inch)
     im.__setattr__("_offs_x", -200)
@@ -351,7 +546,7 @@ def result_sheet_pdf_view(request, id):
     normal.fontName = "Helvetica"
     normal.fontSize = 10
     normal.leading = 15
-    title = "<b>Course lecturer: " + request.user.get_full_name + "</b>"
+    title = "<b>Course lecturer: " + lecturer_name + "</b>"
     title = Paragraph(title.upper(), normal)
     Story.append(title)
     Story.append(Spacer(1, 0.1 * inch))
@@ -361,60 +556,12 @@ def result_sheet_pdf_view(request, id):
     normal.fontName = "Helvetica"
     normal.fontSize = 10
     normal.leading = 15
-    level = result.filter(course_id=id).first()
-    title = "<b>Level: </b>" + str(level.course.level)
+    title = "<b>Level: </b>" + str(course.level)
     title = Paragraph(title.upper(), normal)
     Story.append(title)
     Story.append(Spacer(1, 0.6 * inch))
 
-    elements = []
-    count = 0
-    header = [("S/N", "ID NO.", "FULL NAME", "TOTAL", "GRADE", "POINT", "COMMENT")]
-
-    table_header = Table(header, [inch], [0.5 * inch])
-    table_header.setStyle(
-        TableStyle(
-            [
-                ("BACKGROUND", (0, 0), (-1, -1), colors.black),
-                ("TEXTCOLOR", (1, 0), (-1, -1), colors.white),
-                ("TEXTCOLOR", (0, 0), (0, 0), colors.cyan),
-                ("ALIGN", (0, 0), (-1, -1), "CENTER"),
-                ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
-                ("BOX", (0, 0), (-1, -1), 1, colors.black),
-            ]
-        )
-    )
-    Story.append(table_header)
-
-    for student in result:
-        data = [
-            (
-                count + 1,
-                student.student.student.username.upper(),
-                Paragraph(
-                    student.student.student.get_full_name.capitalize(), styles["Normal"]
-                ),
-                student.total,
-                student.grade,
-                student.point,
-                student.comment,
-            )
-        ]
-        color = colors.black
-        if student.grade == "F":
-            color = colors.red
-        count += 1
-
-        t_body = Table(data, colWidths=[inch])
-        t_body.setStyle(
-            TableStyle(
-                [
-                    ("INNERGRID", (0, 0), (-1, -1), 0.05, colors.black),
-                    ("BOX", (0, 0), (-1, -1), 0.1, colors.black),
-                ]
-            )
-        )
-        Story.append(t_body)
+    Story.append(result_sheet_table(result))
 
     Story.append(Spacer(1, 1 * inch))
     style_right = ParagraphStyle(
@@ -435,30 +582,28 @@ def result_sheet_pdf_view(request, id):
     ]
     tbl = Table(tbl_data)
     Story.append(tbl)
-
-    doc.build(Story)
-
-    fs = FileSystemStorage(settings.MEDIA_ROOT + "/result_sheet")
-    with fs.open(fname) as pdf:
-        response = HttpResponse(pdf, content_type="application/pdf")
-        response["Content-Disposition"] = "inline; filename=" + fname + ""
-        return response
-    return response
+    return Story
 
 
 @login_required
 @student_required
 def course_registration_form(request):
     current_session = Session.objects.get(is_current_session=True)
-    courses = TakenCourse.objects.filter(student__student__id=request.user.id)
+    courses = TakenCourse.objects.filter(
+        student__student__id=request.user.id
+    ).select_related("course")
     fname = request.user.username + ".pdf"
     fname = fname.replace("/", "-")
-    # flocation = '/tmp/' + fname
-    # print(MEDIA_ROOT + "\\" + fname)
-    flocation = settings.MEDIA_ROOT + "/registration_form/" + fname
-    doc = SimpleDocTemplate(
-        flocation, rightMargin=15, leftMargin=15, topMargin=0, bottomMargin=0
-    )
+    story = registration_form_story(request.user, courses, current_session)
+    return pdf_response(render_pdf(story, **REGISTRATION_FORM_LAYOUT), fname)
+
+
+REGISTRATION_FORM_LAYOUT = dict(
+    rightMargin=15, leftMargin=15, topMargin=0, bottomMargin=0
+)
+
+
+def registration_form_story(user, courses, current_session):
     styles = getSampleStyleSheet()
 
     Story = [Spacer(1, 0.5)]
@@ -504,18 +649,18 @@ def course_registration_form(request):
     title = "<b><u>STUDENT COURSE REGISTRATION FORM</u></b>"
     title = Paragraph(title.upper(), normal)
     Story.append(title)
-    student = Student.objects.get(student__pk=request.user.id)
+    student = Student.objects.get(student__pk=user.id)
 
     tbl_data = [
         [
             Paragraph(
-                "<b>Registration Number : " + request.user.username.upper() + "</b>",
+                "<b>Registration Number : " + user.username.upper() + "</b>",
                 styles["Normal"],
             )
         ],
         [
             Paragraph(
-                "<b>Name : " + request.user.get_full_name.upper() + "</b>",
+                "<b>Name : " + user.get_full_name.upper() + "</b>",
                 styles["Normal"],
             )
         ],
@@ -713,10 +858,10 @@ def course_registration_form(request):
     certification.fontName = "Helvetica"
     certification.fontSize = 8
     certification.leading = 18
-    student = Student.objects.get(student__pk=request.user.id)
+    student = Student.objects.get(student__pk=user.id)
     certification_text = (
         "CERTIFICATION OF REGISTRATION: I certify that <b>"
-        + str(request.user.get_full_name.upper())
+        + str(user.get_full_name.upper())
         + "</b>\
     has been duly registered for the <b>"
         + student.level
@@ -735,16 +880,132 @@ def course_registration_form(request):
     setattr(im_logo, "_offs_y", 480)
     Story.append(im_logo)
 
-    picture = settings.BASE_DIR + request.user.get_picture()
+    picture = settings.BASE_DIR + user.get_picture()
     im = Image(picture, 1.0 * inch, 1.0 * inch)
     setattr(im, "_offs_x", 218)
     setattr(im, "_offs_y", 550)
     Story.append(im)
+    return Story
+
 
-    doc.build(Story)
-    fs = FileSystemStorage(settings.MEDIA_ROOT + "/registration_form")
-    with fs.open(fname) as pdf:
-        response = HttpResponse(pdf, content_type="application/pdf")
-        response["Content-Disposition"] = "inline; filename=" + fname + ""
-        return response
+# ########################################################
+# Export
+# ########################################################
+EXPORT_FORMATS = {
+    "csv": (stream_csv, "text/csv"),
+    "ndjson": (stream_ndjson, "application/x-ndjson"),
+}
+
+
+@login_required
+@admin_required
+def export_results(request):
+    """
+    Streams TakenCourse (``dataset=taken_courses``) or Result rows as CSV or
+    NDJSON, optionally filtered by course, program, level, semester and
+    session
+    """
+    dataset = request.GET.get("dataset", "results")
+    export_format = request.GET.get("format", "csv")
+    if dataset not in ("results", "taken_courses"):
+        return HttpResponseBadRequest("dataset must be 'results' or 'taken_courses'")
+    if export_format not in EXPORT_FORMATS:
+        return HttpResponseBadRequest("format must be 'csv' or 'ndjson'")
+
+    filters = {}
+    for name in ("course", "program"):
+        value = request.GET.get(name)
+        if value:
+            if not value.isdigit():
+                return HttpResponseBadRequest(f"{name} must be an id")
+            filters[name] = int(value)
+    for name in ("level", "semester", "session"):
+        if request.GET.get(name):
+            filters[name] = request.GET[name]
+
+    if dataset == "results":
+        header, rows = result_rows(**filters)
+    elif "session" in filters:
+        return HttpResponseBadRequest("taken courses are not recorded per session")
+    else:
+        header, rows = taken_course_rows(**filters)
+
+    stream, content_type = EXPORT_FORMATS[export_format]
+    response = StreamingHttpResponse(stream(header, rows), content_type=content_type)
+    response[
+        "Content-Disposition"
+    ] = f'attachment; filename="{dataset}.{export_format}"'
     return response
+
+
+# ########################################################
+# Background PDF jobs
+# ########################################################
+def _job_status(request, job):
+    data = {
+        "id": job.pk,
+        "kind": job.kind,
+        "status": job.status,
+        "status_url": request.build_absolute_uri(job.get_absolute_url()),
+        "error": job.error,
+        "expires_at": job.expires_at,
+    }
+    if job.status == PDFJob.DONE:
+        data["download_url"] = request.build_absolute_uri(
+            reverse("pdf_job_download", kwargs={"pk": job.pk})
+        )
+    return data
+
+
+@require_POST
+@login_required
+@lecturer_required
+def result_sheet_pdf_job(request, id):
+    course = get_object_or_404(Course, id=id)
+    job = PDFJob.objects.create(
+        kind=PDFJob.RESULT_SHEET,
+        owner=request.user,
+        params={
+            "course": course.pk,
+            "semester": Semester.objects.get(is_current_semester=True).pk,
+            "session": Session.objects.get(is_current_session=True).pk,
+        },
+    )
+    return JsonResponse(_job_status(request, job), status=202)
+
+
+@require_POST
+@login_required
+@student_required
+def course_registration_form_job(request):
+    job = PDFJob.objects.create(
+        kind=PDFJob.REGISTRATION_FORM,
+        owner=request.user,
+        params={"session": Session.objects.get(is_current_session=True).pk},
+    )
+    return JsonResponse(_job_status(request, job), status=202)
+
+
+@login_required
+def pdf_job_status(request, pk):
+    job = get_object_or_404(
+        PDFJob.objects.exclude(expires_at__lte=timezone.now()),
+        pk=pk,
+        owner=request.user,
+    )
+    return JsonResponse(_job_status(request, job))
+
+
+@login_required
+def pdf_job_download(request, pk):
+    job = get_object_or_404(
+        PDFJob.objects.exclude(expires_at__lte=timezone.now()),
+        pk=pk,
+        owner=request.user,
+        status=PDFJob.DONE,
+    )
+    if job.kind == PDFJob.PROGRAM_BUNDLE:
+        return FileResponse(
+            job.file.open("rb"), as_attachment=True, filename=job.filename
+        )
+    return pdf_response(job.file.open("rb"), job.filename)